@@ -11,6 +11,8 @@ DATABASES = {
     "default": {
         "NAME": "db.sqlite3",
         "ENGINE": "django.db.backends.sqlite3",
+        # On disk rather than in memory, so concurrent workers lock it like a real database
+        "TEST": {"NAME": base_dir_join("test_db.sqlite3")},
     }
 }
 
@@ -0,0 +1,44 @@
+import functools
+from dataclasses import dataclass
+from typing import cast
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+
+from vintasend.app_settings import get_config
+
+
+DEFAULT_TEMPLATE_CACHE_SIZE = 256
+
+
+@dataclass(frozen=True)
+class NotificationSettingsSnapshot:
+    """
+    Notification settings resolved once per process, so the send loop doesn't re-read and
+    re-format them for every notification.
+    """
+
+    default_from_email: str
+    default_bcc_emails: tuple[str, ...]
+    base_url: str
+    template_cache_size: int
+
+
+@functools.cache
+def get_settings_snapshot() -> NotificationSettingsSnapshot:
+    protocol = cast(str, get_config("NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL"))
+    domain = cast(str, get_config("NOTIFICATION_DEFAULT_BASE_URL_DOMAIN"))
+    return NotificationSettingsSnapshot(
+        default_from_email=cast(str, get_config("NOTIFICATION_DEFAULT_FROM_EMAIL")),
+        default_bcc_emails=tuple(cast(list[str], get_config("NOTIFICATION_DEFAULT_BCC_EMAILS"))),
+        base_url=f"{protocol}://{domain}",
+        template_cache_size=int(
+            get_config("NOTIFICATION_TEMPLATE_CACHE_SIZE") or DEFAULT_TEMPLATE_CACHE_SIZE
+        ),
+    )
+
+
+@receiver(setting_changed)
+def clear_settings_snapshot(*, setting: str, **kwargs) -> None:
+    if setting.startswith("NOTIFICATION_"):
+        get_settings_snapshot.cache_clear()
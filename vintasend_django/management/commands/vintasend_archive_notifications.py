@@ -0,0 +1,53 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    ARCHIVABLE_STATUSES,
+    DjangoDbNotificationBackend,
+)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Move notifications in a terminal status older than the retention window to the archive "
+        "table, in chunks. Safe to interrupt and run again."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--older-than-days",
+            type=int,
+            required=True,
+            help="Archive notifications last modified more than this many days ago.",
+        )
+        parser.add_argument(
+            "--status",
+            action="append",
+            dest="statuses",
+            choices=ARCHIVABLE_STATUSES,
+            help="Status to archive, can be repeated (default: all terminal statuses).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Notifications moved per transaction (default: 1000).",
+        )
+
+    def handle(self, *args, **options):
+        if options["older_than_days"] < 0:
+            raise CommandError("--older-than-days can't be negative")
+
+        older_than = timezone.now() - datetime.timedelta(days=options["older_than_days"])
+        archived = 0
+        for chunk_archived in DjangoDbNotificationBackend().archive_notifications(
+            older_than,
+            statuses=options["statuses"] or ARCHIVABLE_STATUSES,
+            chunk_size=options["chunk_size"],
+        ):
+            archived += chunk_archived
+            if options["verbosity"] > 1:
+                self.stdout.write(f"Archived {archived} notifications so far")
+        self.stdout.write(f"Archived {archived} notifications")
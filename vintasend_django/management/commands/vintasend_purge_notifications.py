@@ -0,0 +1,95 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    ARCHIVABLE_STATUSES,
+    DjangoDbNotificationBackend,
+)
+
+
+UNUSED_CONTEXT_GRACE_PERIOD = datetime.timedelta(days=1)
+
+
+def parse_retention_rule(value: str) -> tuple[str, datetime.timedelta]:
+    status, _, days = value.partition("=")
+    if status not in ARCHIVABLE_STATUSES or not days.isdigit():
+        raise CommandError(
+            f"Invalid retention rule {value!r}, expected STATUS=DAYS with STATUS one of "
+            f"{', '.join(ARCHIVABLE_STATUSES)}"
+        )
+    return status, datetime.timedelta(days=int(days))
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Delete notifications older than their status' retention period, in primary key ranges "
+        "so the table is never locked for long."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--retention",
+            action="append",
+            required=True,
+            metavar="STATUS=DAYS",
+            help=(
+                "Delete notifications in STATUS last modified more than DAYS days ago. Repeat "
+                "for each status to purge, e.g. --retention READ=90 --retention FAILED=30."
+            ),
+        )
+        parser.add_argument(
+            "--archived",
+            action="store_true",
+            help="Purge the notifications archive instead of the notifications table.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Primary keys covered by each DELETE statement (default: 1000).",
+        )
+        parser.add_argument(
+            "--sleep",
+            type=float,
+            default=0,
+            help="Seconds to wait after each chunk that deleted rows (default: 0).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many notifications would be deleted per status.",
+        )
+
+    def handle(self, *args, **options):
+        retention = dict(parse_retention_rule(rule) for rule in options["retention"])
+        backend = DjangoDbNotificationBackend()
+
+        if options["dry_run"]:
+            counts = backend.count_purgeable_notifications(retention, archived=options["archived"])
+            for status in retention:
+                self.stdout.write(f"{status}: {counts.get(status, 0)} notifications to delete")
+            return
+
+        deleted = 0
+        for chunk_deleted in backend.purge_notifications(
+            retention,
+            chunk_size=options["chunk_size"],
+            sleep_seconds=options["sleep"],
+            archived=options["archived"],
+        ):
+            deleted += chunk_deleted
+            if chunk_deleted and options["verbosity"] > 1:
+                self.stdout.write(f"Deleted {deleted} notifications so far")
+        self.stdout.write(f"Deleted {deleted} notifications")
+
+        # Contexts stored compactly are shared between notifications, so they're only deleted
+        # once nothing references them. Recent ones may be about to be referenced.
+        unused_contexts = sum(
+            backend.purge_unused_contexts(
+                timezone.now() - UNUSED_CONTEXT_GRACE_PERIOD, chunk_size=options["chunk_size"]
+            )
+        )
+        if unused_contexts:
+            self.stdout.write(f"Deleted {unused_contexts} unused notification contexts")
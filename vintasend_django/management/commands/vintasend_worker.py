@@ -0,0 +1,192 @@
+import multiprocessing
+import signal
+import time
+
+import django
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from vintasend_django.services.dataclasses import RetryPolicy
+from vintasend_django.services.notification_worker import NotificationWorker
+
+
+# Crashed worker processes are restarted after a delay that doubles up to this many seconds, and
+# resets once the process stays up for as long
+MAX_RESTART_DELAY = 60
+
+
+def run_worker(worker_options: dict) -> None:
+    # Spawned processes (where fork isn't available) start without Django configured
+    if not apps.ready:
+        django.setup()
+
+    worker = NotificationWorker(**worker_options.get("worker_kwargs", {}))
+
+    def handle_stop_signal(signum, frame):
+        worker.stop()
+
+    previous_handlers = {
+        signum: signal.signal(signum, handle_stop_signal)
+        for signum in (signal.SIGTERM, signal.SIGINT)
+    }
+    try:
+        worker.run(exit_when_empty=worker_options.get("exit_when_empty", False))
+    finally:
+        for signum, previous_handler in previous_handlers.items():
+            signal.signal(signum, previous_handler)
+
+
+class Command(BaseCommand):
+    help = (  # noqa: A003
+        "Send pending notifications continuously from one or more worker processes. "
+        "Workers exit gracefully on SIGTERM/SIGINT after finishing the batch they're sending."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=1, help="Number of worker processes (default: 1)."
+        )
+        parser.add_argument(
+            "--threads",
+            type=int,
+            default=1,
+            help="Notifications sent in parallel by each process (default: 1).",
+        )
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=100,
+            help="Notifications claimed per batch (default: 100).",
+        )
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=5.0,
+            help="Seconds to wait before polling again when the queue is empty (default: 5).",
+        )
+        parser.add_argument(
+            "--lease-seconds",
+            type=int,
+            default=300,
+            help="Seconds a claimed batch stays reserved for its worker (default: 300).",
+        )
+        parser.add_argument(
+            "--schedule-window",
+            type=float,
+            default=None,
+            help=(
+                "Keep the scheduled notifications due in the next SCHEDULE_WINDOW seconds in "
+                "memory and send each one when it's due, instead of scanning for them on every "
+                "poll (default: disabled)."
+            ),
+        )
+        parser.add_argument(
+            "--max-attempts",
+            type=int,
+            default=None,
+            help=(
+                "Retry failed sends with exponential backoff, marking notifications as failed "
+                "after MAX_ATTEMPTS attempts (default: failures aren't retried)."
+            ),
+        )
+        parser.add_argument(
+            "--exit-when-empty",
+            action="store_true",
+            help="Exit once there are no pending notifications left instead of polling.",
+        )
+
+    def handle(self, *args, **options):
+        worker_options = {
+            "exit_when_empty": options["exit_when_empty"],
+            "worker_kwargs": {
+                "batch_size": options["batch_size"],
+                "poll_interval": options["poll_interval"],
+                "lease_seconds": options["lease_seconds"],
+                "max_workers": options["threads"],
+                "schedule_window": options["schedule_window"],
+                "retry_policy": (
+                    RetryPolicy(max_attempts=options["max_attempts"])
+                    if options["max_attempts"]
+                    else None
+                ),
+            },
+        }
+        if options["processes"] <= 1:
+            run_worker(worker_options)
+            return
+
+        self.run_processes(options["processes"], worker_options)
+
+    def run_processes(self, num_processes: int, worker_options: dict) -> None:
+        context = multiprocessing.get_context(
+            "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+        )
+        # Children must open their own database connections
+        connections.close_all()
+
+        stopping = False
+
+        def handle_stop_signal(signum, frame):
+            nonlocal stopping
+            stopping = True
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+
+        def start_process():
+            process = context.Process(target=run_worker, args=(worker_options,), daemon=False)
+            process.start()
+            return process
+
+        processes = [start_process() for _ in range(num_processes)]
+        started_at = [time.monotonic()] * num_processes
+        restart_delays = [0] * num_processes
+        restart_at: list[float | None] = [None] * num_processes
+        self.stdout.write(f"Started {num_processes} notification worker processes")
+
+        previous_handlers = {
+            signum: signal.signal(signum, handle_stop_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            while True:
+                if not any(process.is_alive() for process in processes) and (
+                    stopping or all(process.exitcode == 0 for process in processes)
+                ):
+                    break
+                now = time.monotonic()
+                for index, process in enumerate(processes):
+                    if stopping or process.is_alive() or process.exitcode == 0:
+                        continue
+                    if restart_at[index] is None:
+                        # Back off so a worker that crashes on every claim doesn't restart in a
+                        # tight loop
+                        if now - started_at[index] >= MAX_RESTART_DELAY:
+                            restart_delays[index] = 0
+                        restart_delays[index] = min(
+                            max(restart_delays[index] * 2, 1), MAX_RESTART_DELAY
+                        )
+                        restart_at[index] = now + restart_delays[index]
+                        self.stderr.write(
+                            f"Worker process {process.pid} exited with code {process.exitcode}, "
+                            f"restarting in {restart_delays[index]}s"
+                        )
+                    if now >= restart_at[index]:
+                        processes[index] = start_process()
+                        started_at[index] = now
+                        restart_at[index] = None
+                time.sleep(1)
+
+            for process in processes:
+                process.join()
+        finally:
+            for signum, previous_handler in previous_handlers.items():
+                signal.signal(signum, previous_handler)
+
+        failed_processes = [process for process in processes if process.exitcode != 0]
+        if failed_processes:
+            raise CommandError(
+                f"{len(failed_processes)} notification worker processes exited with errors"
+            )
+        self.stdout.write("Notification workers stopped")
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="claimed_by",
+            field=models.CharField(
+                blank=True,
+                max_length=255,
+                verbose_name="worker that claimed the notification",
+            ),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="claimed_until",
+            field=models.DateTimeField(null=True, verbose_name="claim lease expiration"),
+        ),
+    ]
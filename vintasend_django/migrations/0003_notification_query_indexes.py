@@ -0,0 +1,38 @@
+# Generated by Django 5.2.18 on 2026-10-17 18:48
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0002_notification_claim"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("status", "PENDING_SEND")),
+                fields=["created"],
+                name="notification_pending_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("send_after__isnull", False), ("status", "PENDING_SEND")),
+                fields=["send_after", "created"],
+                name="notification_scheduled_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                fields=["user", "status", "notification_type", "created"],
+                name="notification_user_status_idx",
+            ),
+        ),
+    ]
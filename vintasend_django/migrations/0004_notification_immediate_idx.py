@@ -0,0 +1,21 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0003_notification_query_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("send_after__isnull", True), ("status", "PENDING_SEND")),
+                fields=["created"],
+                name="notification_immediate_idx",
+            ),
+        ),
+    ]
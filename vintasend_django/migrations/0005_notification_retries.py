@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:25
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0004_notification_immediate_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notification",
+            name="failed_attempts",
+            field=models.PositiveIntegerField(default=0, verbose_name="failed send attempts"),
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="next_attempt_at",
+            field=models.DateTimeField(null=True, verbose_name="next send attempt after a failure"),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("next_attempt_at__isnull", False), ("status", "PENDING_SEND")),
+                fields=["next_attempt_at"],
+                name="notification_retry_idx",
+            ),
+        ),
+    ]
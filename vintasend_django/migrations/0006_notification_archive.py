@@ -0,0 +1,104 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:30
+
+import django.db.models.deletion
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0005_notification_retries"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationArchive",
+            fields=[
+                ("id", models.BigIntegerField(primary_key=True, serialize=False)),
+                (
+                    "notification_type",
+                    models.CharField(
+                        choices=[
+                            ("EMAIL", "Email"),
+                            ("IN_APP", "In App"),
+                            ("SMS", "SMS"),
+                            ("PUSH", "Push"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("title", models.CharField(max_length=255)),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("PENDING_SEND", "Pending Send"),
+                            ("SENT", "Sent"),
+                            ("CANCELLED", "Cancelled"),
+                            ("FAILED", "Failed"),
+                            ("READ", "Read"),
+                        ],
+                        max_length=50,
+                    ),
+                ),
+                ("body_template", models.CharField(max_length=255)),
+                ("subject_template", models.CharField(blank=True, max_length=255)),
+                ("preheader_template", models.CharField(blank=True, max_length=255)),
+                ("context_name", models.CharField(blank=True, max_length=255)),
+                ("context_kwargs", models.JSONField(default=dict)),
+                ("send_after", models.DateTimeField(null=True)),
+                ("created", models.DateTimeField(verbose_name="created")),
+                ("modified", models.DateTimeField(verbose_name="modified")),
+                (
+                    "archived",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now, editable=False, verbose_name="archived"
+                    ),
+                ),
+                (
+                    "adapter_extra_parameters",
+                    models.JSONField(
+                        null=True, verbose_name="extra parameters for the notification adapter"
+                    ),
+                ),
+                (
+                    "context_used",
+                    models.JSONField(
+                        null=True, verbose_name="context used when notification was sent"
+                    ),
+                ),
+                (
+                    "adapter_used",
+                    models.CharField(
+                        blank=True,
+                        max_length=255,
+                        verbose_name="adapter used to send the notification",
+                    ),
+                ),
+                (
+                    "failed_attempts",
+                    models.PositiveIntegerField(default=0, verbose_name="failed send attempts"),
+                ),
+                (
+                    "user",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("-created",),
+                "indexes": [
+                    models.Index(
+                        fields=["user", "created", "id"], name="notification_archive_user_idx"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-17 19:35
+
+import django.utils.timezone
+import model_utils.fields
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0006_notification_archive"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="NotificationContext",
+            fields=[
+                (
+                    "digest",
+                    models.CharField(max_length=64, primary_key=True, serialize=False),
+                ),
+                ("data", models.BinaryField()),
+                (
+                    "created",
+                    model_utils.fields.AutoCreatedField(
+                        default=django.utils.timezone.now,
+                        editable=False,
+                        verbose_name="created",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddField(
+            model_name="notification",
+            name="context_used_digest",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="digest of the context used"
+            ),
+        ),
+        migrations.AddField(
+            model_name="notificationarchive",
+            name="context_used_digest",
+            field=models.CharField(
+                blank=True, max_length=64, verbose_name="digest of the context used"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notification",
+            index=models.Index(
+                condition=models.Q(("context_used_digest", ""), _negated=True),
+                fields=["context_used_digest"],
+                name="notification_context_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="notificationarchive",
+            index=models.Index(
+                condition=models.Q(("context_used_digest", ""), _negated=True),
+                fields=["context_used_digest"],
+                name="notification_arch_context_idx",
+            ),
+        ),
+    ]
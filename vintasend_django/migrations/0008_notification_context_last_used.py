@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-17 20:02
+
+import django.utils.timezone
+import model_utils.fields
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("vintasend_django", "0007_notification_context"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="notificationcontext",
+            name="last_used",
+            field=model_utils.fields.AutoLastModifiedField(
+                default=django.utils.timezone.now,
+                editable=False,
+                verbose_name="last used",
+            ),
+        ),
+    ]
@@ -32,12 +32,138 @@ class Notification(models.Model):
     adapter_extra_parameters = models.JSONField(_("extra parameters for the notification adapter"), null=True)
 
     context_used = models.JSONField(_("context used when notification was sent"), null=True)
+    # Set instead of `context_used` when the backend stores contexts in `NotificationContext`
+    context_used_digest = models.CharField(_("digest of the context used"), max_length=64, blank=True)
     adapter_used = models.CharField(_("adapter used to send the notification"), max_length=255, blank=True)
 
+    # Send worker lease
+    claimed_by = models.CharField(_("worker that claimed the notification"), max_length=255, blank=True)
+    claimed_until = models.DateTimeField(_("claim lease expiration"), null=True)
+
+    # Retries
+    failed_attempts = models.PositiveIntegerField(_("failed send attempts"), default=0)
+    next_attempt_at = models.DateTimeField(_("next send attempt after a failure"), null=True)
+
     objects: models.Manager["Notification"]
 
     class Meta:
         ordering = ("-created",)
+        indexes = (
+            # Pending queue, scanned in creation order by the send loop.
+            # Partial indexes are skipped on databases that don't support them (e.g. MySQL).
+            models.Index(
+                fields=["created"],
+                condition=models.Q(status=NotificationStatusChoices.PENDING_SEND),
+                name="notification_pending_idx",
+            ),
+            # Notifications to send right away, claimed by workers that leave scheduled ones to
+            # a `NotificationScheduler`.
+            models.Index(
+                fields=["created"],
+                condition=models.Q(
+                    status=NotificationStatusChoices.PENDING_SEND, send_after__isnull=True
+                ),
+                name="notification_immediate_idx",
+            ),
+            # Scheduled notifications, looked up by `send_after`.
+            models.Index(
+                fields=["send_after", "created"],
+                condition=models.Q(
+                    status=NotificationStatusChoices.PENDING_SEND, send_after__isnull=False
+                ),
+                name="notification_scheduled_idx",
+            ),
+            # Failed notifications waiting for a retry, claimed in `next_attempt_at` order.
+            models.Index(
+                fields=["next_attempt_at"],
+                condition=models.Q(
+                    status=NotificationStatusChoices.PENDING_SEND, next_attempt_at__isnull=False
+                ),
+                name="notification_retry_idx",
+            ),
+            # Per-user listings (in-app inbox, user's future notifications).
+            models.Index(
+                fields=["user", "status", "notification_type", "created"],
+                name="notification_user_status_idx",
+            ),
+            # References to deduplicated contexts, checked when deleting unused ones.
+            models.Index(
+                fields=["context_used_digest"],
+                condition=~models.Q(context_used_digest=""),
+                name="notification_context_idx",
+            ),
+        )
 
     def __str__(self):
         return f"{self.user} - {self.notification_type} - {self.title} - {self.status}{f' (scheduled to {self.send_after})' if self.send_after else ''}"
+
+
+class NotificationArchive(models.Model):
+    """
+    Cold storage for notifications in a terminal status, moved out of `Notification` by the
+    `vintasend_archive_notifications` command so the hot table only holds recent rows. Rows keep
+    their original id.
+    """
+
+    id = models.BigIntegerField(primary_key=True)  # noqa: A003
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="+")
+    notification_type = models.CharField(max_length=50, choices=NotificationTypesChoices)
+    title = models.CharField(max_length=255)
+    status = models.CharField(max_length=50, choices=NotificationStatusChoices)
+    body_template = models.CharField(max_length=255)
+
+    subject_template = models.CharField(max_length=255, blank=True)
+    preheader_template = models.CharField(max_length=255, blank=True)
+    context_name = models.CharField(max_length=255, blank=True)
+    context_kwargs = models.JSONField(default=dict)
+
+    send_after = models.DateTimeField(null=True)
+
+    created = models.DateTimeField(_("created"))
+    modified = models.DateTimeField(_("modified"))
+    archived = AutoCreatedField(_("archived"))
+
+    adapter_extra_parameters = models.JSONField(_("extra parameters for the notification adapter"), null=True)
+
+    context_used = models.JSONField(_("context used when notification was sent"), null=True)
+    context_used_digest = models.CharField(_("digest of the context used"), max_length=64, blank=True)
+    adapter_used = models.CharField(_("adapter used to send the notification"), max_length=255, blank=True)
+
+    failed_attempts = models.PositiveIntegerField(_("failed send attempts"), default=0)
+
+    objects: models.Manager["NotificationArchive"]
+
+    class Meta:
+        ordering = ("-created",)
+        indexes = (
+            # Per-user history, paginated by `(created, id)`.
+            models.Index(fields=["user", "created", "id"], name="notification_archive_user_idx"),
+            models.Index(
+                fields=["context_used_digest"],
+                condition=~models.Q(context_used_digest=""),
+                name="notification_arch_context_idx",
+            ),
+        )
+
+    def __str__(self):
+        return f"{self.user} - {self.notification_type} - {self.title} - {self.status} (archived)"
+
+
+class NotificationContext(models.Model):
+    """
+    A context used to send notifications, stored once per distinct content when the backend
+    stores contexts compactly. Notifications reference it by `digest`, the SHA-256 of its
+    canonical JSON, and `data` holds that JSON compressed with zlib. `last_used` is bumped each
+    time a notification is stored with it, so unused contexts are only purged after a grace
+    period since their last use.
+    """
+
+    digest = models.CharField(max_length=64, primary_key=True)
+    data = models.BinaryField()
+    created = AutoCreatedField(_("created"))
+    last_used = AutoLastModifiedField(_("last used"))
+
+    objects: models.Manager["NotificationContext"]
+
+    def __str__(self):
+        return self.digest
@@ -0,0 +1,117 @@
+import base64
+import datetime
+import json
+import random
+import uuid
+from dataclasses import dataclass, field, fields
+from typing import TypedDict
+
+from vintasend.services.dataclasses import Notification
+
+
+@dataclass(frozen=True)
+class NotificationCursor:
+    """
+    Position of a notification in a listing ordered by `(created, id)`.
+    """
+
+    created: datetime.datetime
+    id: int | str  # noqa: A003
+
+    def encode(self) -> str:
+        payload = json.dumps([self.created.isoformat(), self.id])
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @classmethod
+    def decode(cls, cursor: str) -> "NotificationCursor":
+        try:
+            created, id_ = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            return cls(created=datetime.datetime.fromisoformat(created), id=id_)
+        except (ValueError, TypeError) as e:
+            raise ValueError("Invalid pagination cursor") from e
+
+
+@dataclass
+class NotificationPage:
+    notifications: list[Notification] = field(default_factory=list)
+    next_cursor: str | None = None
+
+
+@dataclass
+class BulkStatusUpdateResult:
+    updated_ids: list[int | str] = field(default_factory=list)
+    not_updated_ids: list[int | str] = field(default_factory=list)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """
+    How failed sends are retried. After its `n`-th failure a notification waits
+    `base_delay * multiplier ** (n - 1)` seconds, capped at `max_delay`, before it's sent again;
+    the second half of that delay is random, so a burst of failures doesn't retry in lockstep.
+    After `max_attempts` failures the notification is marked as failed.
+
+    `retry_batch_share` is the share of each claimed batch reserved for retries, rounded down,
+    so neither retries nor fresh notifications can starve the other. At least one slot is always
+    left for fresh notifications.
+    """
+
+    max_attempts: int = 5
+    base_delay: float = 30
+    multiplier: float = 2
+    max_delay: float = 3600
+    retry_batch_share: float = 0.5
+
+    def get_delay(self, failed_attempts: int) -> datetime.timedelta:
+        # Cap the exponent: the delay is capped anyway, and large float powers overflow
+        exponent = min(max(failed_attempts - 1, 0), 64)
+        delay = min(self.max_delay, self.base_delay * self.multiplier**exponent)
+        return datetime.timedelta(seconds=delay / 2 + random.uniform(0, delay / 2))  # noqa: S311
+
+
+class NotificationSpec(TypedDict, total=False):
+    """
+    Keyword arguments accepted by `persist_notification`, used to create notifications in bulk.
+    """
+
+    user_id: int | str | uuid.UUID
+    notification_type: str
+    title: str
+    body_template: str
+    context_name: str
+    context_kwargs: dict[str, uuid.UUID | str | int]
+    send_after: datetime.datetime | None
+    subject_template: str | None
+    preheader_template: str | None
+    adapter_extra_parameters: dict | None
+
+
+@dataclass
+class NotificationDeliveryResult:
+    notification: Notification
+    error: Exception | None = None
+
+    @property
+    def sent(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class NotificationWithRecipient(Notification):
+    """
+    A notification carrying its recipient's email and active flag, so adapters don't need to look
+    the user up again for every send.
+    """
+
+    recipient_email: str | None = None
+    recipient_is_active: bool = False
+
+    @classmethod
+    def from_notification(
+        cls, notification: Notification, recipient_email: str | None, recipient_is_active: bool
+    ) -> "NotificationWithRecipient":
+        return cls(
+            **{f.name: getattr(notification, f.name) for f in fields(Notification)},
+            recipient_email=recipient_email,
+            recipient_is_active=recipient_is_active,
+        )
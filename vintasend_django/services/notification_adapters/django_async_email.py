@@ -0,0 +1,158 @@
+import asyncio
+import logging
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Generic, TypeVar
+
+from django.core.mail import EmailMessage, get_connection
+
+from asgiref.sync import sync_to_async
+from vintasend.exceptions import NotificationSendError
+from vintasend.services.dataclasses import Notification
+from vintasend.services.notification_backends.base import BaseNotificationBackend
+from vintasend.services.notification_template_renderers.base_templated_email_renderer import (
+    BaseTemplatedEmailRenderer,
+)
+
+from vintasend_django.services.dataclasses import (
+    NotificationDeliveryResult,
+    NotificationWithRecipient,
+)
+from vintasend_django.services.notification_adapters.django_email import (
+    DjangoEmailNotificationAdapter,
+)
+
+
+if TYPE_CHECKING:
+    from django.core.mail.backends.base import BaseEmailBackend
+
+    from vintasend.services.notification_service import NotificationContextDict
+
+
+logger = logging.getLogger(__name__)
+
+
+B = TypeVar("B", bound=BaseNotificationBackend)
+T = TypeVar("T", bound=BaseTemplatedEmailRenderer)
+
+DEFAULT_MAX_CONCURRENCY = 10
+
+
+class DjangoAsyncEmailNotificationAdapter(Generic[B, T], DjangoEmailNotificationAdapter[B, T]):
+    """
+    Email adapter with an asyncio API, for ASGI views and asyncio workers.
+
+    Django's email backends are blocking, so messages are sent from worker threads. `asend_many`
+    sends up to `max_concurrency` messages at once (an adapter kwarg, 10 by default), keeping one
+    email backend connection per concurrent slot so connections are reused across messages.
+    The sync `send`/`send_many` API is inherited unchanged.
+    """
+
+    @property
+    def max_concurrency(self) -> int:
+        return self.adapter_kwargs.get("max_concurrency", DEFAULT_MAX_CONCURRENCY)
+
+    async def aget_recipient_email(self, notification: Notification) -> str:
+        if isinstance(notification, NotificationWithRecipient):
+            return self.get_recipient_email(notification)
+        aget_user_email = getattr(self.backend, "aget_user_email_from_notification", None)
+        if aget_user_email is None:
+            return await sync_to_async(self.backend.get_user_email_from_notification)(
+                notification.id
+            )
+        return await aget_user_email(notification.id)
+
+    async def abuild_email_message(
+        self,
+        notification: Notification,
+        context: "NotificationContextDict",
+        headers: dict[str, str] | None = None,
+    ) -> EmailMessage:
+        recipient_email = await self.aget_recipient_email(notification)
+        # Rendering is CPU bound, keep it off the event loop
+        return await sync_to_async(self._build_email_message, thread_sensitive=False)(
+            notification, context, recipient_email, headers
+        )
+
+    async def asend(
+        self,
+        notification: Notification,
+        context: "NotificationContextDict",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Send the notification to the user through email.
+
+        :param notification: The notification to send.
+        :param context: The context to render the notification templates.
+        """
+        email = await self.abuild_email_message(notification, context, headers)
+        await sync_to_async(email.send, thread_sensitive=False)()
+
+    async def asend_many(
+        self,
+        notifications_with_context: Iterable[tuple[Notification, "NotificationContextDict"]],
+        headers: dict[str, str] | None = None,
+        max_concurrency: int | None = None,
+    ) -> list[NotificationDeliveryResult]:
+        """
+        Send many notifications concurrently, with at most `max_concurrency` messages in flight.
+
+        Like `send_many`, failures don't stop the batch: each notification gets a result carrying
+        its error, if any. A connection that failed to send is discarded and replaced.
+
+        :param notifications_with_context: Pairs of notification and the context to render it.
+        :return: One result per notification, in input order.
+        """
+        semaphore = asyncio.Semaphore(max_concurrency or self.max_concurrency)
+        idle_connections: list["BaseEmailBackend"] = []
+
+        async def send_one(
+            notification: Notification, context: "NotificationContextDict"
+        ) -> NotificationDeliveryResult:
+            async with semaphore:
+                try:
+                    email = await self.abuild_email_message(notification, context, headers)
+                except Exception as e:  # noqa: BLE001
+                    return NotificationDeliveryResult(notification, error=e)
+
+                email_connection = idle_connections.pop() if idle_connections else get_connection()
+                try:
+                    await sync_to_async(self._send_with_connection, thread_sensitive=False)(
+                        email_connection, email
+                    )
+                except Exception as e:  # noqa: BLE001
+                    await sync_to_async(self._close_connection, thread_sensitive=False)(
+                        email_connection
+                    )
+                    return NotificationDeliveryResult(notification, error=e)
+
+                idle_connections.append(email_connection)
+                return NotificationDeliveryResult(notification)
+
+        try:
+            return list(
+                await asyncio.gather(
+                    *(
+                        send_one(notification, context)
+                        for notification, context in notifications_with_context
+                    )
+                )
+            )
+        finally:
+            for email_connection in idle_connections:
+                await sync_to_async(self._close_connection, thread_sensitive=False)(
+                    email_connection
+                )
+
+    def _send_with_connection(
+        self, email_connection: "BaseEmailBackend", email: EmailMessage
+    ) -> None:
+        email_connection.open()
+        if not email_connection.send_messages([email]):
+            raise NotificationSendError("Email backend didn't send the message")
+
+    def _close_connection(self, email_connection: "BaseEmailBackend") -> None:
+        try:
+            email_connection.close()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to close email connection", exc_info=True)
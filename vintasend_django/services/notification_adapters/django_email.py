@@ -1,21 +1,33 @@
+import logging
+from collections.abc import Iterable
 from typing import TYPE_CHECKING, Generic, TypeVar
 
 from django.contrib.auth import get_user_model
-from django.core.mail import EmailMessage
+from django.core.mail import EmailMessage, get_connection
 
 from vintasend.constants import NotificationTypes
 
+from vintasend.exceptions import NotificationSendError, NotificationUserNotFoundError
 from vintasend.services.dataclasses import Notification
 from vintasend.services.notification_backends.base import BaseNotificationBackend
 from vintasend.services.notification_adapters.base import BaseNotificationAdapter
 from vintasend.services.notification_template_renderers.base_templated_email_renderer import BaseTemplatedEmailRenderer
-from vintasend.app_settings import NotificationSettings
+
+from vintasend_django.app_settings import get_settings_snapshot
+from vintasend_django.services.dataclasses import (
+    NotificationDeliveryResult,
+    NotificationWithRecipient,
+)
 
 
 if TYPE_CHECKING:
+    from django.core.mail.backends.base import BaseEmailBackend
+
     from vintasend.services.notification_service import NotificationContextDict
 
 
+logger = logging.getLogger(__name__)
+
 User = get_user_model()
 
 
@@ -25,37 +37,124 @@ T = TypeVar("T", bound=BaseTemplatedEmailRenderer)
 class DjangoEmailNotificationAdapter(Generic[B, T], BaseNotificationAdapter[B, T]):
     notification_type = NotificationTypes.EMAIL
 
-    def send(
+    def get_recipient_email(self, notification: Notification) -> str:
+        """
+        Return the recipient email, using the one attached to the notification when the backend
+        provided it and falling back to a backend lookup otherwise.
+        """
+        if not isinstance(notification, NotificationWithRecipient):
+            return self.backend.get_user_email_from_notification(notification.id)
+        if notification.recipient_email is None or not notification.recipient_is_active:
+            raise NotificationUserNotFoundError("User not found")
+        return notification.recipient_email
+
+    def build_email_message(
         self,
         notification: Notification,
         context: "NotificationContextDict",
         headers: dict[str, str] | None = None,
-    ) -> None:
+    ) -> EmailMessage:
         """
-        Send the notification to the user through email.
+        Render the notification templates and build the email message to send to the user.
 
         :param notification: The notification to send.
         :param context: The context to render the notification templates.
         """
-        notification_settings = NotificationSettings()
+        return self._build_email_message(
+            notification, context, self.get_recipient_email(notification), headers
+        )
+
+    def _build_email_message(
+        self,
+        notification: Notification,
+        context: "NotificationContextDict",
+        recipient_email: str,
+        headers: dict[str, str] | None = None,
+    ) -> EmailMessage:
+        settings_snapshot = get_settings_snapshot()
 
-        user_email = self.backend.get_user_email_from_notification(notification.id)
-        to = [user_email]
-        bcc = [email for email in notification_settings.NOTIFICATION_DEFAULT_BCC_EMAILS] or []
+        to = [recipient_email]
 
         context_with_base_url: "NotificationContextDict" = context.copy()
-        context_with_base_url["base_url"] = f"{notification_settings.NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL}://{notification_settings.NOTIFICATION_DEFAULT_BASE_URL_DOMAIN}"
+        context_with_base_url["base_url"] = settings_snapshot.base_url
 
         template = self.template_renderer.render(notification, context_with_base_url)
 
         email = EmailMessage(
             subject=template.subject.strip(),
             body=template.body,
-            from_email=notification_settings.NOTIFICATION_DEFAULT_FROM_EMAIL,
+            from_email=settings_snapshot.default_from_email,
             to=to,
-            bcc=bcc,
+            bcc=settings_snapshot.default_bcc_emails,
             headers=headers,
         )
         email.content_subtype = "html"
+        return email
+
+    def send(
+        self,
+        notification: Notification,
+        context: "NotificationContextDict",
+        headers: dict[str, str] | None = None,
+    ) -> None:
+        """
+        Send the notification to the user through email.
 
-        email.send()
+        :param notification: The notification to send.
+        :param context: The context to render the notification templates.
+        """
+        self.build_email_message(notification, context, headers).send()
+
+    def send_many(
+        self,
+        notifications_with_context: Iterable[tuple[Notification, "NotificationContextDict"]],
+        headers: dict[str, str] | None = None,
+    ) -> list[NotificationDeliveryResult]:
+        """
+        Send many notifications through a single email backend connection.
+
+        Failures don't stop the batch: a notification that fails to render or send gets a result
+        carrying the error, and the connection is reopened after a send failure in case it was
+        left unusable.
+
+        :param notifications_with_context: Pairs of notification and the context to render it.
+        :return: One result per notification, in input order.
+        """
+        results: list[NotificationDeliveryResult] = []
+        connection = get_connection()
+        self._open_connection(connection)
+        try:
+            for notification, context in notifications_with_context:
+                try:
+                    email = self.build_email_message(notification, context, headers)
+                except Exception as e:  # noqa: BLE001
+                    results.append(NotificationDeliveryResult(notification, error=e))
+                    continue
+
+                try:
+                    if not connection.send_messages([email]):
+                        raise NotificationSendError("Email backend didn't send the message")
+                except Exception as e:  # noqa: BLE001
+                    results.append(NotificationDeliveryResult(notification, error=e))
+                    self._reopen_connection(connection)
+                    continue
+
+                results.append(NotificationDeliveryResult(notification))
+        finally:
+            connection.close()
+        return results
+
+    def _reopen_connection(self, connection: "BaseEmailBackend") -> None:
+        try:
+            connection.close()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to close email connection", exc_info=True)
+        self._open_connection(connection)
+
+    def _open_connection(self, connection: "BaseEmailBackend") -> None:
+        try:
+            connection.open()
+        except Exception:  # noqa: BLE001
+            # The next `send_messages` call retries opening the connection, so each notification
+            # gets its own failed result if the email server stays unreachable
+            logger.warning("Failed to open email connection", exc_info=True)
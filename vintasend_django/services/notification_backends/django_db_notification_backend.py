@@ -1,9 +1,25 @@
+import contextlib
 import datetime
+import hashlib
+import itertools
+import json
+import math
+import operator
+import time
 import uuid
-from collections.abc import Iterable
+import zlib
+from collections.abc import AsyncIterator, Iterable, Iterator, Mapping
 
-from django.db.models import Q, QuerySet
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import BaseCache, caches
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connection, connections, transaction
+from django.db.models import Count, Exists, F, Max, Min, OuterRef, Q, QuerySet
+from django.db.models.sql import UpdateQuery
+from django.utils import timezone
 
+from asgiref.sync import sync_to_async
 from vintasend.constants import NotificationStatus, NotificationTypes
 from vintasend.exceptions import (
     NotificationCancelError,
@@ -18,14 +34,97 @@ from vintasend.services.dataclasses import (
 from vintasend.services.notification_backends.base import BaseNotificationBackend
 
 from vintasend_django.models import Notification as NotificationModel
+from vintasend_django.models import NotificationArchive, NotificationContext
+from vintasend_django.services.dataclasses import (
+    BulkStatusUpdateResult,
+    NotificationCursor,
+    NotificationPage,
+    NotificationSpec,
+    NotificationWithRecipient,
+    RetryPolicy,
+)
+from vintasend_django.services.notification_wakeups import (
+    BaseNotificationWakeup,
+    get_notification_wakeup,
+)
+
+
+User = get_user_model()
+
+ARCHIVABLE_STATUSES = (
+    NotificationStatus.SENT.value,
+    NotificationStatus.READ.value,
+    NotificationStatus.CANCELLED.value,
+    NotificationStatus.FAILED.value,
+)
+
+# Columns backing the `Notification` dataclass, in the order of its positional fields. List
+# queries fetch only these, leaving out `context_used`, `adapter_extra_parameters` and the
+# bookkeeping columns, and pass each row straight to `Notification`
+SERIALIZED_FIELDS = (
+    "id",
+    "user_id",
+    "notification_type",
+    "title",
+    "body_template",
+    "context_name",
+    "context_kwargs",
+    "send_after",
+    "subject_template",
+    "preheader_template",
+    "status",
+)
+# Keyset queries fetch `created` after the serialized columns to build the next cursor
+CREATED_INDEX = len(SERIALIZED_FIELDS)
+
+UNREAD_COUNT_CACHE_KEY = "vintasend_django:in_app_unread_count:{user_id}:{version}"
+UNREAD_COUNT_VERSION_CACHE_KEY = "vintasend_django:in_app_unread_count_version:{user_id}"
 
 
 class DjangoDbNotificationBackend(BaseNotificationBackend):
+    @property
+    def retry_policy(self) -> RetryPolicy | None:
+        """
+        The `retry_policy` backend kwarg, as a `RetryPolicy` or its keyword arguments. Without
+        one, marking a notification as failed is terminal.
+        """
+        retry_policy = self.backend_kwargs.get("retry_policy")
+        if isinstance(retry_policy, dict):
+            return RetryPolicy(**retry_policy)
+        return retry_policy
+
+    @property
+    def compact_context_storage(self) -> bool:
+        """
+        The `compact_context_storage` backend kwarg. When set, contexts used to send
+        notifications are stored compressed in `NotificationContext`, once per distinct content,
+        instead of inline in each notification's `context_used`.
+        """
+        return bool(self.backend_kwargs.get("compact_context_storage", False))
+
+    @property
+    def unread_count_cache(self) -> BaseCache:
+        """
+        The cache holding per-user in-app unread counts, from the `unread_count_cache` backend
+        kwarg (a `CACHES` alias, "default" if not set).
+        """
+        return caches[self.backend_kwargs.get("unread_count_cache", "default")]
+
+    @property
+    def unread_count_cache_timeout(self) -> float | None:
+        """
+        The `unread_count_cache_timeout` backend kwarg, in seconds (default: 300). Counts are
+        invalidated whenever the backend changes them, so the timeout only bounds how long a
+        count stays stale after notifications are changed some other way.
+        """
+        return self.backend_kwargs.get("unread_count_cache_timeout", 300)
+
     def _get_all_future_notifications_queryset(self) -> QuerySet["NotificationModel"]:
+        # Ordered by due date, so `notification_scheduled_idx` serves both the range and the order
         return NotificationModel.objects.filter(
-            Q(send_after__gte=datetime.datetime.now()) | Q(send_after__isnull=False),
             status=NotificationStatus.PENDING_SEND.value,
-        ).order_by("created")
+            send_after__gt=timezone.now(),
+        ).order_by("send_after", "created")
 
     def _get_all_in_app_unread_notifications_queryset(
         self, user_id: int | str | uuid.UUID
@@ -33,12 +132,26 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
         return NotificationModel.objects.filter(
             user_id=str(user_id),
             status=NotificationStatus.SENT.value,
-            notification_type=NotificationTypes.IN_APP,
+            notification_type=NotificationTypes.IN_APP.value,
         ).order_by("created")
 
+    def _get_scheduled_notifications_queryset(
+        self, until: datetime.datetime, after: datetime.datetime | None = None
+    ) -> QuerySet["NotificationModel"]:
+        queryset = NotificationModel.objects.filter(
+            status=NotificationStatus.PENDING_SEND.value,
+            send_after__isnull=False,
+            send_after__lte=until,
+        )
+        if after is not None:
+            queryset = queryset.filter(send_after__gt=after)
+        return queryset.order_by("send_after")
+
     def _get_all_pending_notifications_queryset(self) -> QuerySet["NotificationModel"]:
+        now = timezone.now()
         return NotificationModel.objects.filter(
-            Q(send_after__lte=datetime.datetime.now()) | Q(send_after__isnull=True),
+            Q(send_after__lte=now) | Q(send_after__isnull=True),
+            Q(next_attempt_at__lte=now) | Q(next_attempt_at__isnull=True),
             status=NotificationStatus.PENDING_SEND.value,
         ).order_by("created")
 
@@ -47,15 +160,247 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
     ) -> QuerySet["NotificationModel"]:
         return queryset[((page - 1) * page_size) : ((page - 1) * page_size) + page_size]
 
+    def _keyset_paginate_queryset(
+        self, queryset: "QuerySet[NotificationModel]", page_size: int, cursor: str | None
+    ) -> NotificationPage:
+        """
+        Return the page of `queryset` that follows `cursor`, ordered by `(created, id)`.
+
+        Unlike `_paginate_queryset`, the database seeks straight to the cursor position instead of
+        scanning and discarding all previous rows, so every page costs the same.
+        """
+        return self._build_keyset_page(
+            list(self._seek_cursor(queryset, cursor)[: page_size + 1]), page_size
+        )
+
+    def _seek_cursor(self, queryset: QuerySet, cursor: str | None) -> QuerySet:
+        queryset = queryset.order_by("created", "id").values_list(*SERIALIZED_FIELDS, "created")
+        if cursor is None:
+            return queryset
+        position = NotificationCursor.decode(cursor)
+        return queryset.filter(
+            Q(created__gt=position.created) | Q(created=position.created, id__gt=position.id)
+        )
+
+    def _build_keyset_page(self, rows: list[tuple], page_size: int) -> NotificationPage:
+        """
+        Build a page from up to `page_size + 1` rows following the cursor, as returned by
+        `_seek_cursor` and in `(created, id)` order; the extra row only signals there's a next
+        page.
+        """
+        page_rows = rows[:page_size]
+        next_cursor = None
+        if len(rows) > page_size:
+            last_row = page_rows[-1]
+            next_cursor = NotificationCursor(
+                created=last_row[CREATED_INDEX], id=last_row[0]
+            ).encode()
+        return NotificationPage(
+            notifications=[
+                self.serialize_notification_row(row[:CREATED_INDEX]) for row in page_rows
+            ],
+            next_cursor=next_cursor,
+        )
+
+    def _supports_update_returning(self, using: str) -> bool:
+        # PostgreSQL and SQLite 3.35+ share the `UPDATE ... RETURNING` syntax. MariaDB can only
+        # return columns from INSERT, so it's not enough to check `can_return_columns_from_insert`.
+        db_connection = connections[using]
+        return (
+            db_connection.vendor in ("postgresql", "sqlite")
+            and db_connection.features.can_return_columns_from_insert
+        )
+
+    def _execute_update_returning(
+        self, queryset: "QuerySet[NotificationModel]", fields: list, values: dict
+    ) -> list[list]:
+        """
+        Run `queryset.update(**values)` as `UPDATE ... RETURNING fields` and return the converted
+        values of `fields` for every updated row. Callers must check `_supports_update_returning`.
+        """
+        using = queryset.db
+        db_connection = connections[using]
+        query = queryset.query.chain(UpdateQuery)
+        query.add_update_values(values)
+        sql, params = query.get_compiler(using).as_sql()
+        returning_columns = ", ".join(db_connection.ops.quote_name(f.column) for f in fields)
+        with db_connection.cursor() as cursor:
+            cursor.execute(f"{sql} RETURNING {returning_columns}", params)
+            rows = cursor.fetchall()
+
+        columns = [field.get_col(NotificationModel._meta.db_table) for field in fields]
+        column_converters = [
+            db_connection.ops.get_db_converters(column) + column.get_db_converters(db_connection)
+            for column in columns
+        ]
+        converted_rows = []
+        for row in rows:
+            converted_row = []
+            for column, converters, value in zip(columns, column_converters, row, strict=True):
+                for converter in converters:
+                    value = converter(value, column, db_connection)
+                converted_row.append(value)
+            converted_rows.append(converted_row)
+        return converted_rows
+
+    def _update_returning(
+        self, notification_id: int | str | uuid.UUID, from_status: str, **values
+    ) -> NotificationModel | None:
+        """
+        Apply `values` to the notification if it's still in `from_status` and return the updated
+        instance, or None if the guard didn't match. `modified` is bumped along, since
+        `QuerySet.update` doesn't touch it and retention is measured from it.
+
+        Uses one `UPDATE ... RETURNING` round trip where the database supports it, and falls back
+        to an `UPDATE` followed by a `SELECT` elsewhere.
+        """
+        values = {"modified": timezone.now(), **values}
+        queryset = NotificationModel.objects.filter(id=str(notification_id), status=from_status)
+        using = queryset.db
+        if not self._supports_update_returning(using):
+            if queryset.update(**values) == 0:
+                return None
+            return NotificationModel.objects.using(using).get(id=str(notification_id))
+
+        fields = NotificationModel._meta.concrete_fields
+        rows = self._execute_update_returning(queryset, fields, values)
+        if not rows:
+            return None
+        return NotificationModel.from_db(using, [f.attname for f in fields], rows[0])
+
+    def _bulk_update_status(
+        self,
+        notification_ids: Iterable[int | str | uuid.UUID],
+        from_status: str,
+        to_status: str,
+        **values,
+    ) -> BulkStatusUpdateResult:
+        """
+        Move every notification in `notification_ids` that is still in `from_status` to
+        `to_status` with a single conditional UPDATE, also applying `values` and bumping
+        `modified`, and report which ids didn't transition.
+        """
+        values = {"modified": timezone.now(), **values}
+        pk_field = NotificationModel._meta.pk
+        requested_ids = list(dict.fromkeys(pk_field.to_python(i) for i in notification_ids))
+        if not requested_ids:
+            return BulkStatusUpdateResult()
+
+        queryset = NotificationModel.objects.filter(id__in=requested_ids, status=from_status)
+        returning_fields = [
+            pk_field,
+            NotificationModel._meta.get_field("user"),
+            NotificationModel._meta.get_field("notification_type"),
+        ]
+        if self._supports_update_returning(queryset.db):
+            updated_rows = self._execute_update_returning(
+                queryset, returning_fields, {"status": to_status, **values}
+            )
+        else:
+            with transaction.atomic(using=queryset.db):
+                updated_rows = list(
+                    queryset.select_for_update().values_list(*(f.attname for f in returning_fields))
+                )
+                NotificationModel.objects.filter(id__in=[row[0] for row in updated_rows]).update(
+                    status=to_status, **values
+                )
+
+        updated_ids = {row[0] for row in updated_rows}
+        if NotificationStatus.SENT.value in (from_status, to_status):
+            self._invalidate_unread_counts(
+                user_id
+                for _, user_id, notification_type in updated_rows
+                if notification_type == NotificationTypes.IN_APP.value
+            )
+        return BulkStatusUpdateResult(
+            updated_ids=[i for i in requested_ids if i in updated_ids],
+            not_updated_ids=[i for i in requested_ids if i not in updated_ids],
+        )
+
+    def _bulk_fail_or_retry(
+        self, notification_ids: Iterable[int | str | uuid.UUID], retry_policy: RetryPolicy
+    ) -> BulkStatusUpdateResult:
+        """
+        Record a failed attempt for every pending notification in `notification_ids`: the ones
+        with attempts left are scheduled for a retry following `retry_policy`, the others are
+        marked as failed.
+        """
+        pk_field = NotificationModel._meta.pk
+        requested_ids = list(dict.fromkeys(pk_field.to_python(i) for i in notification_ids))
+        if not requested_ids:
+            return BulkStatusUpdateResult()
+
+        now = timezone.now()
+        with transaction.atomic():
+            failed_attempts_by_id = dict(
+                NotificationModel.objects.filter(
+                    id__in=requested_ids, status=NotificationStatus.PENDING_SEND.value
+                )
+                .select_for_update()
+                .values_list("id", "failed_attempts")
+            )
+            retries = []
+            exhausted_ids = []
+            for notification_id, failed_attempts in failed_attempts_by_id.items():
+                if failed_attempts + 1 >= retry_policy.max_attempts:
+                    exhausted_ids.append(notification_id)
+                    continue
+                retries.append(
+                    NotificationModel(
+                        id=notification_id,
+                        failed_attempts=failed_attempts + 1,
+                        next_attempt_at=now + retry_policy.get_delay(failed_attempts + 1),
+                        claimed_by="",
+                        claimed_until=None,
+                        modified=now,
+                    )
+                )
+            NotificationModel.objects.bulk_update(
+                retries,
+                ["failed_attempts", "next_attempt_at", "claimed_by", "claimed_until", "modified"],
+            )
+            if exhausted_ids:
+                NotificationModel.objects.filter(id__in=exhausted_ids).update(
+                    modified=now,
+                    status=NotificationStatus.FAILED.value,
+                    failed_attempts=F("failed_attempts") + 1,
+                    next_attempt_at=None,
+                )
+
+        return BulkStatusUpdateResult(
+            updated_ids=[i for i in requested_ids if i in failed_attempts_by_id],
+            not_updated_ids=[i for i in requested_ids if i not in failed_attempts_by_id],
+        )
+
+    def _user_id_to_python(self, user_id: int | str | uuid.UUID) -> int | str | uuid.UUID:
+        # Coerce to the user PK type so serialized instances never need to touch `.user`
+        return NotificationModel._meta.get_field("user").to_python(user_id)
+
     def _serialize_notification_queryset(
         self, queryset: "QuerySet[NotificationModel]"
     ) -> Iterable[Notification]:
-        return (self.serialize_notification(n) for n in queryset.iterator())
+        return map(
+            self.serialize_notification_row,
+            queryset.values_list(*SERIALIZED_FIELDS).iterator(),
+        )
+
+    async def _aserialize_notification_queryset(
+        self, queryset: "QuerySet[NotificationModel]"
+    ) -> AsyncIterator[Notification]:
+        async for row in queryset.values_list(*SERIALIZED_FIELDS):
+            yield self.serialize_notification_row(row)
 
-    def serialize_notification(self, notification: NotificationModel) -> Notification:
+    async def _aserialize_notification_list(
+        self, queryset: "QuerySet[NotificationModel]"
+    ) -> list[Notification]:
+        return [n async for n in self._aserialize_notification_queryset(queryset)]
+
+    def serialize_notification(
+        self, notification: "NotificationModel | NotificationArchive"
+    ) -> Notification:
         return Notification(
             id=notification.pk,
-            user_id=notification.user.id,
+            user_id=notification.user_id,
             notification_type=notification.notification_type,
             title=notification.title,
             body_template=notification.body_template,
@@ -67,7 +412,15 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             status=notification.status,
         )
 
-    def persist_notification(
+    def serialize_notification_row(self, row: tuple) -> Notification:
+        """
+        Serialize a row fetched with `values_list(*SERIALIZED_FIELDS)`. Bulk reads use this
+        instead of `serialize_notification`, so each row goes straight from the database tuple to
+        a `Notification` without instantiating a model or looking columns up by name.
+        """
+        return Notification(*row)
+
+    def _build_notification_instance(
         self,
         user_id: int | str | uuid.UUID,
         notification_type: str,
@@ -79,9 +432,9 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
         subject_template: str | None = None,
         preheader_template: str | None = None,
         adapter_extra_parameters: dict | None = None,
-    ) -> Notification:
-        notification_instance = NotificationModel.objects.create(
-            user_id=str(user_id),
+    ) -> NotificationModel:
+        return NotificationModel(
+            user_id=self._user_id_to_python(user_id),
             notification_type=notification_type,
             title=title,
             body_template=body_template,
@@ -92,53 +445,228 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             preheader_template=preheader_template or "",
             adapter_extra_parameters=adapter_extra_parameters,
         )
+
+    def _as_db_datetime(self, value: datetime.datetime) -> datetime.datetime:
+        # The ORM reads naive datetimes in the default timezone when USE_TZ is on
+        if settings.USE_TZ and timezone.is_naive(value):
+            return timezone.make_aware(value, timezone.get_default_timezone())
+        return value
+
+    def _get_unread_count_versions(
+        self, user_ids: list[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, int]:
+        cache = self.unread_count_cache
+        keys = {
+            user_id: UNREAD_COUNT_VERSION_CACHE_KEY.format(user_id=user_id) for user_id in user_ids
+        }
+        versions = cache.get_many(keys.values())
+        for key in keys.values():
+            if key not in versions:
+                # A new version never matches counts cached before the previous one was evicted
+                cache.add(key, time.time_ns(), timeout=None)
+                versions[key] = cache.get(key)
+        return {user_id: versions[key] for user_id, key in keys.items()}
+
+    def _invalidate_unread_counts(self, user_ids: Iterable[int | str | uuid.UUID]) -> None:
+        """
+        Invalidate the cached unread counts of `user_ids` once the current transaction commits,
+        by bumping their version. A count computed from rows read before the commit is cached
+        under the previous version, so it's never served.
+        """
+        keys = {UNREAD_COUNT_VERSION_CACHE_KEY.format(user_id=user_id) for user_id in user_ids}
+        if keys:
+            transaction.on_commit(lambda: self._bump_unread_count_versions(keys))
+
+    def _bump_unread_count_versions(self, version_keys: Iterable[str]) -> None:
+        for key in version_keys:
+            try:
+                self.unread_count_cache.incr(key)
+            except ValueError:
+                # No version means no reachable count, the next read starts a new version
+                pass
+
+    def _invalidate_unread_count_of(self, notification_instance: NotificationModel) -> None:
+        if notification_instance.notification_type == NotificationTypes.IN_APP.value:
+            self._invalidate_unread_counts([notification_instance.user_id])
+
+    def _wake_workers_if_sendable(
+        self, send_after_values: Iterable[datetime.datetime | None]
+    ) -> None:
+        """
+        Wake workers once the current transaction commits, so they never claim before the rows
+        are visible. Scheduled notifications don't wake anyone, they're picked up when due.
+        """
+        now = timezone.now()
+        if any(
+            send_after is None or self._as_db_datetime(send_after) <= now
+            for send_after in send_after_values
+        ):
+            transaction.on_commit(self.get_wakeup().notify)
+
+    def get_wakeup(self) -> BaseNotificationWakeup:
+        """
+        Return the wakeup workers block on while the pending queue is empty.
+        """
+        return get_notification_wakeup(NotificationModel.objects.db)
+
+    def persist_notification(
+        self,
+        user_id: int | str | uuid.UUID,
+        notification_type: str,
+        title: str,
+        body_template: str,
+        context_name: str,
+        context_kwargs: dict[str, uuid.UUID | str | int],
+        send_after: datetime.datetime | None,
+        subject_template: str | None = None,
+        preheader_template: str | None = None,
+        adapter_extra_parameters: dict | None = None,
+    ) -> Notification:
+        notification_instance = self._build_notification_instance(
+            user_id=user_id,
+            notification_type=notification_type,
+            title=title,
+            body_template=body_template,
+            context_name=context_name,
+            context_kwargs=context_kwargs,
+            send_after=send_after,
+            subject_template=subject_template,
+            preheader_template=preheader_template,
+            adapter_extra_parameters=adapter_extra_parameters,
+        )
+        notification_instance.save(force_insert=True)
+        self._wake_workers_if_sendable([send_after])
         return self.serialize_notification(notification_instance)
 
+    def persist_notifications_bulk(
+        self, notifications: Iterable[NotificationSpec], chunk_size: int = 1000
+    ) -> Iterator[Notification]:
+        """
+        Create notifications from an iterable of `persist_notification` keyword arguments, inserting
+        `chunk_size` rows per query and yielding each created notification.
+
+        The input is consumed lazily, one chunk at a time, so it can be a generator over a large
+        audience. Each chunk is inserted in its own transaction; wrap the call in
+        `transaction.atomic()` to make the whole fan-out all-or-nothing.
+        """
+        can_return_pks = connection.features.can_return_rows_from_bulk_insert
+        specs = iter(notifications)
+        while chunk := [
+            self._build_notification_instance(**spec)
+            for spec in itertools.islice(specs, chunk_size)
+        ]:
+            with transaction.atomic():
+                if can_return_pks:
+                    NotificationModel.objects.bulk_create(chunk)
+                else:
+                    # Without RETURNING support, bulk_create can't set primary keys
+                    for notification_instance in chunk:
+                        notification_instance.save(force_insert=True)
+                self._wake_workers_if_sendable(n.send_after for n in chunk)
+            yield from (self.serialize_notification(n) for n in chunk)
+
     def persist_notification_update(
         self, notification_id: int | str | uuid.UUID, updated_data: UpdateNotificationKwargs
     ) -> Notification:
-        records_updated = NotificationModel.objects.filter(
-            id=str(notification_id), status=NotificationStatus.PENDING_SEND.value
-        ).update(**updated_data)
-
-        if records_updated == 0:
+        notification_instance = self._update_returning(
+            notification_id, NotificationStatus.PENDING_SEND.value, **updated_data
+        )
+        if notification_instance is None:
             raise NotificationUpdateError(
                 "Failed to update notification, it may have already been sent"
             )
-        return self.serialize_notification(NotificationModel.objects.get(id=str(notification_id)))
+        return self.serialize_notification(notification_instance)
 
     def mark_pending_as_sent(self, notification_id: int | str | uuid.UUID) -> Notification:
-        records_updated = NotificationModel.objects.filter(
-            id=str(notification_id), status=NotificationStatus.PENDING_SEND.value
-        ).update(status=NotificationStatus.SENT.value)
-        if records_updated == 0:
+        notification_instance = self._update_returning(
+            notification_id,
+            NotificationStatus.PENDING_SEND.value,
+            status=NotificationStatus.SENT.value,
+        )
+        if notification_instance is None:
             raise NotificationUpdateError("Failed to update notification status")
-        return self.serialize_notification(NotificationModel.objects.get(id=str(notification_id)))
+        self._invalidate_unread_count_of(notification_instance)
+        return self.serialize_notification(notification_instance)
 
     def mark_pending_as_failed(self, notification_id: int | str | uuid.UUID) -> Notification:
-        records_updated = NotificationModel.objects.filter(
-            id=str(notification_id), status=NotificationStatus.PENDING_SEND.value
-        ).update(status=NotificationStatus.FAILED.value)
-        if records_updated == 0:
+        """
+        Record a failed send. With a `retry_policy`, the notification stays pending and is
+        retried later until it runs out of attempts.
+        """
+        retry_policy = self.retry_policy
+        if retry_policy is not None:
+            if not self._bulk_fail_or_retry([notification_id], retry_policy).updated_ids:
+                raise NotificationUpdateError("Failed to update notification status")
+            return self.get_notification(notification_id)
+
+        notification_instance = self._update_returning(
+            notification_id,
+            NotificationStatus.PENDING_SEND.value,
+            status=NotificationStatus.FAILED.value,
+            failed_attempts=F("failed_attempts") + 1,
+        )
+        if notification_instance is None:
             raise NotificationUpdateError("Failed to update notification status")
-        return self.serialize_notification(NotificationModel.objects.get(id=str(notification_id)))
+        return self.serialize_notification(notification_instance)
 
     def mark_sent_as_read(self, notification_id: int | str | uuid.UUID) -> Notification:
-        records_updated = NotificationModel.objects.filter(
-            id=str(notification_id), status=NotificationStatus.SENT.value
-        ).update(status=NotificationStatus.READ.value)
-        if records_updated == 0:
+        notification_instance = self._update_returning(
+            notification_id,
+            NotificationStatus.SENT.value,
+            status=NotificationStatus.READ.value,
+        )
+        if notification_instance is None:
             raise NotificationUpdateError("Failed to update notification status")
-        return self.serialize_notification(NotificationModel.objects.get(id=str(notification_id)))
+        self._invalidate_unread_count_of(notification_instance)
+        return self.serialize_notification(notification_instance)
 
     def cancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
         records_updated = NotificationModel.objects.filter(
             id=str(notification_id), status=NotificationStatus.PENDING_SEND.value
-        ).update(status=NotificationStatus.CANCELLED.value)
+        ).update(status=NotificationStatus.CANCELLED.value, modified=timezone.now())
 
         if records_updated == 0:
             raise NotificationCancelError("Failed to delete notification")
 
+    def bulk_mark_pending_as_sent(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> BulkStatusUpdateResult:
+        return self._bulk_update_status(
+            notification_ids, NotificationStatus.PENDING_SEND.value, NotificationStatus.SENT.value
+        )
+
+    def bulk_mark_pending_as_failed(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> BulkStatusUpdateResult:
+        """
+        Record a failed send for each notification, retrying them like `mark_pending_as_failed`.
+        """
+        retry_policy = self.retry_policy
+        if retry_policy is not None:
+            return self._bulk_fail_or_retry(notification_ids, retry_policy)
+        return self._bulk_update_status(
+            notification_ids,
+            NotificationStatus.PENDING_SEND.value,
+            NotificationStatus.FAILED.value,
+            failed_attempts=F("failed_attempts") + 1,
+        )
+
+    def bulk_mark_sent_as_read(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> BulkStatusUpdateResult:
+        return self._bulk_update_status(
+            notification_ids, NotificationStatus.SENT.value, NotificationStatus.READ.value
+        )
+
+    def bulk_cancel_notifications(
+        self, notification_ids: Iterable[int | str | uuid.UUID]
+    ) -> BulkStatusUpdateResult:
+        return self._bulk_update_status(
+            notification_ids,
+            NotificationStatus.PENDING_SEND.value,
+            NotificationStatus.CANCELLED.value,
+        )
+
     def get_notification(
         self, notification_id: int | str | uuid.UUID, for_update=False
     ) -> Notification:
@@ -152,6 +680,35 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             raise NotificationNotFoundError("Notification not found") from e
         return self.serialize_notification(notification_instance)
 
+    def get_notification_from_history(self, notification_id: int | str | uuid.UUID) -> Notification:
+        """
+        Get a notification in any status, looking it up in the archive if it was moved there.
+        """
+        for model in (NotificationModel, NotificationArchive):
+            notification_instance = model.objects.filter(id=str(notification_id)).first()
+            if notification_instance is not None:
+                return self.serialize_notification(notification_instance)
+        raise NotificationNotFoundError("Notification not found")
+
+    def get_user_notification_history_by_cursor(
+        self, user_id: int | str | uuid.UUID, page_size: int = 10, cursor: str | None = None
+    ) -> NotificationPage:
+        """
+        Page through every notification of the user, archived ones included, ordered by
+        `(created, id)`. Each page reads at most `page_size + 1` rows from each table.
+        """
+        user_id = self._user_id_to_python(user_id)
+        rows = [
+            *self._seek_cursor(NotificationModel.objects.filter(user_id=user_id), cursor)[
+                : page_size + 1
+            ],
+            *self._seek_cursor(NotificationArchive.objects.filter(user_id=user_id), cursor)[
+                : page_size + 1
+            ],
+        ]
+        rows.sort(key=operator.itemgetter(CREATED_INDEX, 0))
+        return self._build_keyset_page(rows[: page_size + 1], page_size)
+
     def get_all_pending_notifications(self) -> Iterable[Notification]:
         return self._serialize_notification_queryset(self._get_all_pending_notifications_queryset())
 
@@ -164,6 +721,13 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             )
         )
 
+    def get_pending_notifications_by_cursor(
+        self, page_size: int, cursor: str | None = None
+    ) -> NotificationPage:
+        return self._keyset_paginate_queryset(
+            self._get_all_pending_notifications_queryset(), page_size, cursor
+        )
+
     def filter_all_in_app_unread_notifications(
         self,
         user_id: int | str | uuid.UUID,
@@ -186,6 +750,66 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             )
         )
 
+    def filter_in_app_unread_notifications_by_cursor(
+        self,
+        user_id: int | str | uuid.UUID,
+        page_size: int = 10,
+        cursor: str | None = None,
+    ) -> NotificationPage:
+        return self._keyset_paginate_queryset(
+            self._get_all_in_app_unread_notifications_queryset(user_id), page_size, cursor
+        )
+
+    def count_in_app_unread_notifications(self, user_id: int | str | uuid.UUID) -> int:
+        """
+        Count the user's unread in-app notifications, e.g. for a badge. See
+        `count_in_app_unread_for_users`.
+        """
+        user_id = self._user_id_to_python(user_id)
+        return self.count_in_app_unread_for_users([user_id])[user_id]
+
+    def count_in_app_unread_for_users(
+        self, user_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, int]:
+        """
+        Count the unread in-app notifications of each user, keyed by user id.
+
+        Counts are served from `unread_count_cache` and invalidated whenever the backend marks
+        an in-app notification as sent or read, so rendering a badge doesn't hit the database
+        until a count changes. Users missing from the cache are counted with one grouped query.
+        Each count is cached under a per-user version read before counting, so a count that
+        raced with an invalidation is never served.
+        """
+        user_ids = list(dict.fromkeys(self._user_id_to_python(i) for i in user_ids))
+        versions = self._get_unread_count_versions(user_ids)
+        keys = {
+            user_id: UNREAD_COUNT_CACHE_KEY.format(user_id=user_id, version=versions[user_id])
+            for user_id in user_ids
+        }
+        cached = self.unread_count_cache.get_many(keys.values())
+        counts = {user_id: cached[key] for user_id, key in keys.items() if key in cached}
+
+        missing_ids = [user_id for user_id in user_ids if user_id not in counts]
+        if missing_ids:
+            missing_counts = dict.fromkeys(missing_ids, 0)
+            missing_counts.update(
+                NotificationModel.objects.filter(
+                    user_id__in=missing_ids,
+                    status=NotificationStatus.SENT.value,
+                    notification_type=NotificationTypes.IN_APP.value,
+                )
+                .order_by()
+                .values("user_id")
+                .annotate(count=Count("id"))
+                .values_list("user_id", "count")
+            )
+            self.unread_count_cache.set_many(
+                {keys[user_id]: count for user_id, count in missing_counts.items()},
+                timeout=self.unread_count_cache_timeout,
+            )
+            counts.update(missing_counts)
+        return counts
+
     def get_all_future_notifications(self) -> Iterable["Notification"]:
         return self._serialize_notification_queryset(self._get_all_future_notifications_queryset())
 
@@ -194,6 +818,13 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             self._paginate_queryset(self._get_all_future_notifications_queryset(), page, page_size)
         )
 
+    def get_future_notifications_by_cursor(
+        self, page_size: int, cursor: str | None = None
+    ) -> NotificationPage:
+        return self._keyset_paginate_queryset(
+            self._get_all_future_notifications_queryset(), page_size, cursor
+        )
+
     def get_all_future_notifications_from_user(
         self, user_id: int | str | uuid.UUID
     ) -> Iterable["Notification"]:
@@ -212,6 +843,237 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             )
         )
 
+    def get_future_notifications_from_user_by_cursor(
+        self, user_id: int | str | uuid.UUID, page_size: int, cursor: str | None = None
+    ) -> NotificationPage:
+        return self._keyset_paginate_queryset(
+            self._get_all_future_notifications_queryset().filter(user_id=str(user_id)),
+            page_size,
+            cursor,
+        )
+
+    def claim_pending_notifications(
+        self,
+        batch_size: int,
+        worker_id: str,
+        lease_seconds: int = 300,
+        notification_ids: Iterable[int | str | uuid.UUID] | None = None,
+        include_scheduled: bool = True,
+    ) -> list[Notification]:
+        """
+        Lease up to `batch_size` pending notifications to `worker_id` for `lease_seconds`.
+
+        `notification_ids` restricts the claim to the given notifications, e.g. the ones a
+        `NotificationScheduler` released. With `include_scheduled=False` only notifications
+        without `send_after` are claimed, which skips scanning scheduled rows entirely; retries
+        that are due are claimed either way.
+
+        Retries come from their own queue, ordered by `next_attempt_at`, and are limited to the
+        retry policy's `retry_batch_share` of the batch, rounded down, while fresh notifications
+        are waiting.
+
+        Rows claimed by other workers are skipped until their lease expires, so several workers
+        can drain the queue concurrently without sending the same notification twice. On databases
+        that support it, candidate rows are locked with SELECT ... FOR UPDATE SKIP LOCKED; elsewhere
+        (e.g. SQLite, which serializes writers) the lease is taken by a conditional UPDATE.
+        """
+        now = timezone.now()
+        claimed_until = now + datetime.timedelta(seconds=lease_seconds)
+        lease_available = Q(claimed_until__isnull=True) | Q(claimed_until__lte=now)
+
+        retry_policy = self.retry_policy or RetryPolicy()
+        # Rounded down and capped so at least one slot is left for fresh notifications, which
+        # would otherwise never be claimed with a batch size of 1
+        retry_quota = min(
+            math.floor(batch_size * retry_policy.retry_batch_share), max(batch_size - 1, 0)
+        )
+
+        queryset = self._get_all_pending_notifications_queryset().filter(lease_available)
+        if notification_ids is not None:
+            queryset = queryset.filter(id__in=list(notification_ids))
+        skip_locked = connections[queryset.db].features.has_select_for_update_skip_locked
+        if skip_locked:
+            queryset = queryset.select_for_update(skip_locked=True)
+        fresh_queryset = queryset.filter(next_attempt_at__isnull=True)
+        if not include_scheduled:
+            fresh_queryset = fresh_queryset.filter(send_after__isnull=True)
+        retry_queryset = queryset.filter(next_attempt_at__isnull=False).order_by("next_attempt_at")
+
+        # Without SKIP LOCKED the candidates are read outside a transaction: on SQLite a deferred
+        # transaction that reads before writing fails with "database is locked" when another
+        # worker writes in between, instead of waiting for the lock. The conditional UPDATE
+        # re-checks the lease, so rows another worker claimed in the meantime are left out.
+        with transaction.atomic(using=queryset.db) if skip_locked else contextlib.nullcontext():
+            # Retries get up to their share of the batch first, fresh notifications fill the
+            # rest, and retries take whatever fresh notifications left over
+            retry_ids = list(retry_queryset.values_list("id", flat=True)[:retry_quota])
+            fresh_ids = list(
+                fresh_queryset.values_list("id", flat=True)[: batch_size - len(retry_ids)]
+            )
+            room_left = batch_size - len(retry_ids) - len(fresh_ids)
+            if room_left > 0 and len(retry_ids) == retry_quota:
+                extra_retry_ids = retry_queryset.exclude(id__in=retry_ids).values_list(
+                    "id", flat=True
+                )
+                retry_ids += extra_retry_ids[:room_left]
+            candidate_ids = retry_ids + fresh_ids
+            if not candidate_ids:
+                return []
+
+            NotificationModel.objects.filter(
+                lease_available,
+                id__in=candidate_ids,
+                status=NotificationStatus.PENDING_SEND.value,
+            ).update(claimed_by=worker_id, claimed_until=claimed_until)
+
+            return list(
+                self._serialize_notification_queryset(
+                    NotificationModel.objects.filter(
+                        id__in=candidate_ids,
+                        claimed_by=worker_id,
+                        claimed_until=claimed_until,
+                    ).order_by("created")
+                )
+            )
+
+    def get_scheduled_notification_keys(
+        self,
+        until: datetime.datetime,
+        after: datetime.datetime | None = None,
+        created_since: datetime.datetime | None = None,
+        limit: int | None = None,
+    ) -> list[tuple[datetime.datetime, int | str | uuid.UUID]]:
+        """
+        Return `(send_after, id)` of pending scheduled notifications due in `(after, until]`,
+        ordered by `send_after`. `created_since` restricts them to recently created rows.
+        """
+        queryset = self._get_scheduled_notifications_queryset(until, after)
+        if created_since is not None:
+            queryset = queryset.filter(created__gte=created_since)
+        return list(queryset.values_list("send_after", "id")[:limit])
+
+    def archive_notifications(
+        self,
+        older_than: datetime.datetime,
+        statuses: Iterable[str] = ARCHIVABLE_STATUSES,
+        chunk_size: int = 1000,
+    ) -> Iterator[int]:
+        """
+        Move notifications in one of `statuses` last modified before `older_than` to
+        `NotificationArchive`, yielding the number of rows moved per chunk.
+
+        Each chunk is copied and deleted in its own transaction, in primary key order, so the
+        hot table is never locked for long and an interrupted run can simply be restarted.
+        Unread in-app notifications are kept, since they're still listed in the user's inbox.
+        """
+        statuses = list(statuses)
+        if NotificationStatus.PENDING_SEND.value in statuses:
+            raise ValueError("Pending notifications can't be archived")
+
+        archived_fields = [
+            field.attname
+            for field in NotificationArchive._meta.concrete_fields
+            if field.name != "archived"
+        ]
+        archivable = NotificationModel.objects.filter(
+            status__in=statuses, modified__lt=older_than
+        ).exclude(
+            status=NotificationStatus.SENT.value,
+            notification_type=NotificationTypes.IN_APP.value,
+        )
+        last_id = None
+        while True:
+            with transaction.atomic():
+                queryset = archivable if last_id is None else archivable.filter(id__gt=last_id)
+                rows = list(
+                    queryset.select_for_update()
+                    .order_by("id")
+                    .values(*archived_fields)[:chunk_size]
+                )
+                if not rows:
+                    return
+                ids = [row["id"] for row in rows]
+                NotificationArchive.objects.bulk_create(
+                    [NotificationArchive(**row) for row in rows]
+                )
+                NotificationModel.objects.filter(id__in=ids).delete()
+            last_id = ids[-1]
+            yield len(rows)
+
+    def _get_purgeable_queryset(
+        self, retention: Mapping[str, datetime.timedelta], archived: bool
+    ) -> "QuerySet[NotificationModel | NotificationArchive]":
+        if NotificationStatus.PENDING_SEND.value in retention:
+            raise ValueError("Pending notifications can't be purged")
+        model = NotificationArchive if archived else NotificationModel
+        if not retention:
+            return model.objects.none()
+
+        now = timezone.now()
+        condition = Q()
+        for status, max_age in retention.items():
+            condition |= Q(status=status, modified__lt=now - max_age)
+        return model.objects.filter(condition)
+
+    def count_purgeable_notifications(
+        self, retention: Mapping[str, datetime.timedelta], archived: bool = False
+    ) -> dict[str, int]:
+        """
+        Count, per status, the notifications `purge_notifications` would delete.
+        """
+        return dict(
+            self._get_purgeable_queryset(retention, archived)
+            .order_by()
+            .values("status")
+            .annotate(count=Count("id"))
+            .values_list("status", "count")
+        )
+
+    def purge_notifications(
+        self,
+        retention: Mapping[str, datetime.timedelta],
+        chunk_size: int = 1000,
+        sleep_seconds: float = 0,
+        archived: bool = False,
+    ) -> Iterator[int]:
+        """
+        Delete notifications whose status is a key of `retention` and that were last modified
+        longer ago than its value, from the archive if `archived`. Yields the number of rows
+        deleted per chunk.
+
+        The table is walked in ranges of `chunk_size` primary keys, each deleted by a single
+        `DELETE` statement in its own transaction, so rows are never loaded into Python and
+        locks are held briefly. `sleep_seconds` throttles the purge between chunks that deleted
+        rows. Deletion skips signals and cascades, which notifications don't have.
+        """
+        queryset = self._get_purgeable_queryset(retention, archived)
+        bounds = queryset.aggregate(min_id=Min("id"), max_id=Max("id"))
+        if not retention or bounds["min_id"] is None:
+            return
+
+        # The archive never holds unread in-app notifications
+        purges_unread = not archived and NotificationStatus.SENT.value in retention
+        for start_id in range(bounds["min_id"], bounds["max_id"] + 1, chunk_size):
+            chunk = queryset.filter(id__gte=start_id, id__lt=start_id + chunk_size)
+            unread_user_ids = (
+                list(
+                    chunk.filter(
+                        status=NotificationStatus.SENT.value,
+                        notification_type=NotificationTypes.IN_APP.value,
+                    )
+                    .values_list("user_id", flat=True)
+                    .distinct()
+                )
+                if purges_unread
+                else []
+            )
+            deleted = chunk._raw_delete(queryset.db)
+            # Only invalidated once the rows are gone, so no count can be cached from them again
+            self._invalidate_unread_counts(unread_user_ids)
+            yield deleted
+            if deleted and sleep_seconds:
+                time.sleep(sleep_seconds)
+
     def get_user_email_from_notification(self, notification_id: int | str | uuid.UUID) -> str:
         notification_user = (
             NotificationModel.objects.select_related("user").get(id=str(notification_id)).user
@@ -220,6 +1082,68 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
             raise NotificationUserNotFoundError("User not found")
         return notification_user.email
 
+    def get_pending_notification_templates(self) -> set[str]:
+        """
+        Return the names of every template referenced by pending notifications, so workers can
+        compile them on startup.
+        """
+        template_rows = (
+            NotificationModel.objects.filter(status=NotificationStatus.PENDING_SEND.value)
+            .order_by()
+            .values_list("body_template", "subject_template", "preheader_template")
+            .distinct()
+        )
+        return {name for row in template_rows for name in row if name}
+
+    def attach_recipients(
+        self, notifications: Iterable[Notification]
+    ) -> list[NotificationWithRecipient]:
+        """
+        Attach each notification's recipient email and active flag, looking up all of the batch's
+        users with a single query. Adapters use the attached email instead of calling
+        `get_user_email_from_notification` for every send.
+        """
+        notifications = list(notifications)
+        email_field_name = User.get_email_field_name()
+        only_fields = [email_field_name]
+        try:
+            User._meta.get_field("is_active")
+            only_fields.append("is_active")
+        except FieldDoesNotExist:
+            pass
+        users = User.objects.only(*only_fields).in_bulk(
+            {self._user_id_to_python(n.user_id) for n in notifications}
+        )
+
+        notifications_with_recipient = []
+        for notification in notifications:
+            user = users.get(self._user_id_to_python(notification.user_id))
+            notifications_with_recipient.append(
+                NotificationWithRecipient.from_notification(
+                    notification,
+                    recipient_email=getattr(user, email_field_name, None),
+                    recipient_is_active=bool(user and user.is_active),
+                )
+            )
+        return notifications_with_recipient
+
+    def _get_context_used_values(self, context: dict) -> dict:
+        if not self.compact_context_storage:
+            return {"context_used": context, "context_used_digest": ""}
+
+        payload = json.dumps(context, sort_keys=True, separators=(",", ":")).encode()
+        digest = hashlib.sha256(payload).hexdigest()
+        # Reusing an existing context only bumps its `last_used`, which keeps it out of
+        # `purge_unused_contexts` until the notification referencing it is stored
+        db_features = connections[NotificationContext.objects.db].features
+        NotificationContext.objects.bulk_create(
+            [NotificationContext(digest=digest, data=zlib.compress(payload))],
+            update_conflicts=True,
+            update_fields=["last_used"],
+            unique_fields=["digest"] if db_features.supports_update_conflicts_with_target else None,
+        )
+        return {"context_used": None, "context_used_digest": digest}
+
     def store_context_used(
         self,
         notification_id: int | str | uuid.UUID,
@@ -227,5 +1151,226 @@ class DjangoDbNotificationBackend(BaseNotificationBackend):
         adapter_import_str: str,
     ) -> None:
         NotificationModel.objects.filter(id=str(notification_id)).update(
-            context_used=context, adapter_used=adapter_import_str
+            **self._get_context_used_values(context), adapter_used=adapter_import_str
+        )
+
+    def get_context_used(self, notification_id: int | str | uuid.UUID) -> dict | None:
+        """
+        Return the context the notification was sent with, wherever it's stored: inline,
+        deduplicated in `NotificationContext` or in the archive. Returns None if the
+        deduplicated context was purged.
+        """
+        for model in (NotificationModel, NotificationArchive):
+            row = (
+                model.objects.filter(id=str(notification_id))
+                .values_list("context_used", "context_used_digest")
+                .first()
+            )
+            if row is None:
+                continue
+            context_used, digest = row
+            if not digest:
+                return context_used
+            data = (
+                NotificationContext.objects.filter(digest=digest)
+                .values_list("data", flat=True)
+                .first()
+            )
+            return None if data is None else json.loads(zlib.decompress(data))
+        raise NotificationNotFoundError("Notification not found")
+
+    def purge_unused_contexts(
+        self, older_than: datetime.datetime, chunk_size: int = 1000
+    ) -> Iterator[int]:
+        """
+        Delete deduplicated contexts last used before `older_than` that no notification
+        references anymore, yielding the number deleted per chunk. Recently used contexts are
+        kept, since a notification may be about to reference them.
+        """
+        unused = (
+            NotificationContext.objects.filter(last_used__lt=older_than)
+            .exclude(
+                Exists(NotificationModel.objects.filter(context_used_digest=OuterRef("digest")))
+            )
+            .exclude(
+                Exists(NotificationArchive.objects.filter(context_used_digest=OuterRef("digest")))
+            )
         )
+        while digests := list(unused.values_list("digest", flat=True)[:chunk_size]):
+            # The DELETE repeats the checks, so contexts used since they were selected are kept
+            yield unused.filter(digest__in=digests)._raw_delete(unused.db)
+
+    # Async API
+    #
+    # Reads go through Django's async ORM (`aget`, `acreate`, `async for`). Methods that rely on
+    # raw SQL or transactions, which the async ORM doesn't cover, run their sync counterpart in
+    # the thread Django uses for async ORM calls, which costs the same single thread hop.
+
+    async def apersist_notification(
+        self,
+        user_id: int | str | uuid.UUID,
+        notification_type: str,
+        title: str,
+        body_template: str,
+        context_name: str,
+        context_kwargs: dict[str, uuid.UUID | str | int],
+        send_after: datetime.datetime | None,
+        subject_template: str | None = None,
+        preheader_template: str | None = None,
+        adapter_extra_parameters: dict | None = None,
+    ) -> Notification:
+        notification_instance = self._build_notification_instance(
+            user_id=user_id,
+            notification_type=notification_type,
+            title=title,
+            body_template=body_template,
+            context_name=context_name,
+            context_kwargs=context_kwargs,
+            send_after=send_after,
+            subject_template=subject_template,
+            preheader_template=preheader_template,
+            adapter_extra_parameters=adapter_extra_parameters,
+        )
+        await notification_instance.asave(force_insert=True)
+        await sync_to_async(self._wake_workers_if_sendable)([send_after])
+        return self.serialize_notification(notification_instance)
+
+    async def apersist_notification_update(
+        self, notification_id: int | str | uuid.UUID, updated_data: UpdateNotificationKwargs
+    ) -> Notification:
+        return await sync_to_async(self.persist_notification_update)(notification_id, updated_data)
+
+    async def amark_pending_as_sent(self, notification_id: int | str | uuid.UUID) -> Notification:
+        return await sync_to_async(self.mark_pending_as_sent)(notification_id)
+
+    async def amark_pending_as_failed(self, notification_id: int | str | uuid.UUID) -> Notification:
+        return await sync_to_async(self.mark_pending_as_failed)(notification_id)
+
+    async def amark_sent_as_read(self, notification_id: int | str | uuid.UUID) -> Notification:
+        return await sync_to_async(self.mark_sent_as_read)(notification_id)
+
+    async def acancel_notification(self, notification_id: int | str | uuid.UUID) -> None:
+        records_updated = await NotificationModel.objects.filter(
+            id=str(notification_id), status=NotificationStatus.PENDING_SEND.value
+        ).aupdate(status=NotificationStatus.CANCELLED.value, modified=timezone.now())
+
+        if records_updated == 0:
+            raise NotificationCancelError("Failed to delete notification")
+
+    async def aget_notification(
+        self, notification_id: int | str | uuid.UUID, for_update=False
+    ) -> Notification:
+        queryset = NotificationModel.objects.exclude(status=NotificationStatus.CANCELLED.value)
+
+        if for_update:
+            queryset = queryset.select_for_update()
+        try:
+            notification_instance = await queryset.aget(id=str(notification_id))
+        except NotificationModel.DoesNotExist as e:
+            raise NotificationNotFoundError("Notification not found") from e
+        return self.serialize_notification(notification_instance)
+
+    def aget_all_pending_notifications(self) -> AsyncIterator[Notification]:
+        return self._aserialize_notification_queryset(
+            self._get_all_pending_notifications_queryset()
+        )
+
+    async def aget_pending_notifications(self, page: int, page_size: int) -> list[Notification]:
+        return await self._aserialize_notification_list(
+            self._paginate_queryset(self._get_all_pending_notifications_queryset(), page, page_size)
+        )
+
+    def afilter_all_in_app_unread_notifications(
+        self, user_id: int | str | uuid.UUID
+    ) -> AsyncIterator[Notification]:
+        return self._aserialize_notification_queryset(
+            self._get_all_in_app_unread_notifications_queryset(user_id)
+        )
+
+    async def afilter_in_app_unread_notifications(
+        self,
+        user_id: int | str | uuid.UUID,
+        page: int = 1,
+        page_size: int = 10,
+    ) -> list[Notification]:
+        return await self._aserialize_notification_list(
+            self._paginate_queryset(
+                self._get_all_in_app_unread_notifications_queryset(user_id), page, page_size
+            )
+        )
+
+    async def acount_in_app_unread_notifications(self, user_id: int | str | uuid.UUID) -> int:
+        return await sync_to_async(self.count_in_app_unread_notifications)(user_id)
+
+    async def acount_in_app_unread_for_users(
+        self, user_ids: Iterable[int | str | uuid.UUID]
+    ) -> dict[int | str | uuid.UUID, int]:
+        return await sync_to_async(self.count_in_app_unread_for_users)(user_ids)
+
+    def aget_all_future_notifications(self) -> AsyncIterator[Notification]:
+        return self._aserialize_notification_queryset(self._get_all_future_notifications_queryset())
+
+    async def aget_future_notifications(self, page: int, page_size: int) -> list[Notification]:
+        return await self._aserialize_notification_list(
+            self._paginate_queryset(self._get_all_future_notifications_queryset(), page, page_size)
+        )
+
+    def aget_all_future_notifications_from_user(
+        self, user_id: int | str | uuid.UUID
+    ) -> AsyncIterator[Notification]:
+        return self._aserialize_notification_queryset(
+            self._get_all_future_notifications_queryset().filter(user_id=str(user_id))
+        )
+
+    async def aget_future_notifications_from_user(
+        self, user_id: int | str | uuid.UUID, page: int, page_size: int
+    ) -> list[Notification]:
+        return await self._aserialize_notification_list(
+            self._paginate_queryset(
+                self._get_all_future_notifications_queryset().filter(user_id=str(user_id)),
+                page,
+                page_size,
+            )
+        )
+
+    async def aclaim_pending_notifications(
+        self,
+        batch_size: int,
+        worker_id: str,
+        lease_seconds: int = 300,
+        notification_ids: Iterable[int | str | uuid.UUID] | None = None,
+        include_scheduled: bool = True,
+    ) -> list[Notification]:
+        return await sync_to_async(self.claim_pending_notifications)(
+            batch_size, worker_id, lease_seconds, notification_ids, include_scheduled
+        )
+
+    async def aattach_recipients(
+        self, notifications: Iterable[Notification]
+    ) -> list[NotificationWithRecipient]:
+        return await sync_to_async(self.attach_recipients)(notifications)
+
+    async def aget_user_email_from_notification(
+        self, notification_id: int | str | uuid.UUID
+    ) -> str:
+        notification = await NotificationModel.objects.select_related("user").aget(
+            id=str(notification_id)
+        )
+        notification_user = notification.user
+        if not notification_user or not notification_user.is_active:
+            raise NotificationUserNotFoundError("User not found")
+        return notification_user.email
+
+    async def astore_context_used(
+        self,
+        notification_id: int | str | uuid.UUID,
+        context: dict,
+        adapter_import_str: str,
+    ) -> None:
+        context_used_values = await sync_to_async(self._get_context_used_values)(context)
+        await NotificationModel.objects.filter(id=str(notification_id)).aupdate(
+            **context_used_values, adapter_used=adapter_import_str
+        )
+
+    async def aget_context_used(self, notification_id: int | str | uuid.UUID) -> dict | None:
+        return await sync_to_async(self.get_context_used)(notification_id)
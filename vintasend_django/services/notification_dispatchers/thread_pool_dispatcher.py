@@ -0,0 +1,221 @@
+import logging
+import threading
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Any
+
+from django.core.mail import get_connection
+from django.db import close_old_connections
+
+from vintasend.exceptions import NotificationSendError
+from vintasend.services.dataclasses import Notification
+from vintasend.services.notification_adapters.async_base import AsyncBaseNotificationAdapter
+
+from vintasend_django.services.dataclasses import NotificationDeliveryResult
+from vintasend_django.services.notification_adapters.django_email import (
+    DjangoEmailNotificationAdapter,
+)
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+
+
+if TYPE_CHECKING:
+    from django.core.mail.backends.base import BaseEmailBackend
+
+    from vintasend.services.notification_adapters.base import BaseNotificationAdapter
+    from vintasend.services.notification_service import NotificationContextDict, NotificationService
+
+
+logger = logging.getLogger(__name__)
+
+
+class ThreadPoolNotificationDispatcher:
+    """
+    Sends batches of notifications in parallel across a thread pool.
+
+    Worker threads only generate contexts, render and send; each reuses its own email backend
+    connection for `DjangoEmailNotificationAdapter` and recycles its database connection with
+    `close_old_connections` around every notification. Status changes and context storage happen
+    afterwards on the calling thread, with one bulk UPDATE per outcome. Like `NotificationService`,
+    notifications handed to an `AsyncBaseNotificationAdapter` are left alone once queued, since
+    the adapter's task marks them itself.
+
+    At most `max_in_flight` notifications (twice `max_workers` by default) are queued at once, so
+    the input iterable is consumed only as fast as notifications are sent.
+    """
+
+    def __init__(
+        self,
+        notification_service: "NotificationService",
+        max_workers: int = 8,
+        max_in_flight: int | None = None,
+        worker_id: str | None = None,
+    ):
+        if not isinstance(notification_service.notification_backend, DjangoDbNotificationBackend):
+            raise ValueError(
+                "ThreadPoolNotificationDispatcher requires DjangoDbNotificationBackend"
+            )
+        self.notification_service = notification_service
+        self.backend: DjangoDbNotificationBackend = notification_service.notification_backend
+        self.max_workers = max_workers
+        self.max_in_flight = max_in_flight or max_workers * 2
+        self.worker_id = worker_id or f"dispatcher-{uuid.uuid4()}"
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="vintasend-dispatcher"
+        )
+        self._thread_local = threading.local()
+        self._email_connections: list["BaseEmailBackend"] = []
+        self._email_connections_lock = threading.Lock()
+
+    def __enter__(self) -> "ThreadPoolNotificationDispatcher":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.shutdown()
+
+    def shutdown(self, wait: bool = True) -> None:
+        self._executor.shutdown(wait=wait)
+        with self._email_connections_lock:
+            email_connections, self._email_connections = self._email_connections, []
+        for email_connection in email_connections:
+            try:
+                email_connection.close()
+            except Exception:  # noqa: BLE001
+                logger.warning("Failed to close email connection", exc_info=True)
+
+    def dispatch_pending_batch(
+        self,
+        batch_size: int,
+        lease_seconds: int = 300,
+        notification_ids: Iterable[int | str | uuid.UUID] | None = None,
+        include_scheduled: bool = True,
+    ) -> list[NotificationDeliveryResult]:
+        """
+        Claim up to `batch_size` pending notifications for this dispatcher and send them. See
+        `DjangoDbNotificationBackend.claim_pending_notifications` for the filters.
+        """
+        notifications = self.backend.claim_pending_notifications(
+            batch_size=batch_size,
+            worker_id=self.worker_id,
+            lease_seconds=lease_seconds,
+            notification_ids=notification_ids,
+            include_scheduled=include_scheduled,
+        )
+        if not notifications:
+            return []
+        return self.dispatch(self.backend.attach_recipients(notifications))
+
+    def dispatch(self, notifications: Iterable[Notification]) -> list[NotificationDeliveryResult]:
+        """
+        Send the notifications in parallel, then mark them as sent or failed. Notifications
+        queued by an `AsyncBaseNotificationAdapter` are reported as sent but stay pending.
+
+        :return: One result per notification, in input order.
+        """
+        results: dict[int, NotificationDeliveryResult] = {}
+        sent_contexts: dict[int, tuple["NotificationContextDict", "BaseNotificationAdapter"]] = {}
+        in_flight: dict[Future, int] = {}
+
+        def collect(done: Iterable[Future]) -> None:
+            for future in done:
+                index = in_flight.pop(future)
+                result, context, adapter = future.result()
+                results[index] = result
+                if result.sent and not isinstance(adapter, AsyncBaseNotificationAdapter):
+                    sent_contexts[index] = (context, adapter)
+
+        for index, notification in enumerate(notifications):
+            if len(in_flight) >= self.max_in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight[self._executor.submit(self._send_one, notification)] = index
+        collect(wait(in_flight).done)
+
+        ordered_results = [results[index] for index in sorted(results)]
+        self._persist_outcomes(ordered_results, sent_contexts)
+        return ordered_results
+
+    def _persist_outcomes(
+        self,
+        results: list[NotificationDeliveryResult],
+        sent_contexts: dict[int, tuple["NotificationContextDict", "BaseNotificationAdapter"]],
+    ) -> None:
+        sent_ids = [results[index].notification.id for index in sorted(sent_contexts)]
+        failed_ids = [r.notification.id for r in results if not r.sent]
+
+        for result in results:
+            if not result.sent:
+                logger.error(
+                    "Failed to send notification %s",
+                    result.notification.id,
+                    exc_info=result.error,
+                )
+
+        not_updated_ids = []
+        if sent_ids:
+            not_updated_ids += self.backend.bulk_mark_pending_as_sent(sent_ids).not_updated_ids
+        if failed_ids:
+            not_updated_ids += self.backend.bulk_mark_pending_as_failed(failed_ids).not_updated_ids
+        for notification_id in not_updated_ids:
+            logger.warning("Notification %s was no longer pending", notification_id)
+
+        for index, (context, adapter) in sent_contexts.items():
+            self.backend.store_context_used(
+                results[index].notification.id, context, adapter.adapter_import_str
+            )
+
+    def _get_adapter(self, notification: Notification) -> "BaseNotificationAdapter":
+        for adapter in self.notification_service.notification_adapters:
+            if adapter.notification_type.value == notification.notification_type:
+                return adapter
+        raise NotificationSendError(
+            f"No adapter for notification type {notification.notification_type}"
+        )
+
+    def _get_email_connection(self) -> "BaseEmailBackend":
+        email_connection = getattr(self._thread_local, "email_connection", None)
+        if email_connection is None:
+            email_connection = get_connection()
+            self._thread_local.email_connection = email_connection
+            with self._email_connections_lock:
+                self._email_connections.append(email_connection)
+        return email_connection
+
+    def _discard_email_connection(self) -> None:
+        email_connection = getattr(self._thread_local, "email_connection", None)
+        if email_connection is None:
+            return
+        self._thread_local.email_connection = None
+        with self._email_connections_lock:
+            self._email_connections.remove(email_connection)
+        try:
+            email_connection.close()
+        except Exception:  # noqa: BLE001
+            logger.warning("Failed to close email connection", exc_info=True)
+
+    def _send_one(
+        self, notification: Notification
+    ) -> tuple[NotificationDeliveryResult, "NotificationContextDict | None", Any]:
+        close_old_connections()
+        try:
+            context = self.notification_service.get_notification_context(notification)
+            adapter = self._get_adapter(notification)
+            if isinstance(adapter, DjangoEmailNotificationAdapter):
+                email = adapter.build_email_message(notification, context)
+                email_connection = self._get_email_connection()
+                try:
+                    email_connection.open()
+                    if not email_connection.send_messages([email]):
+                        raise NotificationSendError("Email backend didn't send the message")
+                except Exception:
+                    self._discard_email_connection()
+                    raise
+            else:
+                adapter.send(notification, context)
+        except Exception as e:  # noqa: BLE001
+            return NotificationDeliveryResult(notification, error=e), None, None
+        finally:
+            close_old_connections()
+        return NotificationDeliveryResult(notification), context, adapter
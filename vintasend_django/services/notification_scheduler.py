@@ -0,0 +1,129 @@
+import datetime
+import heapq
+import uuid
+
+from django.utils import timezone
+
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+
+
+class NotificationScheduler:
+    """
+    Keeps the scheduled notifications due in the next `window_seconds` in an in-memory heap
+    ordered by `send_after`, and releases each one when it becomes due.
+
+    The heap is refilled incrementally: each refill only queries the slice of time that entered
+    the window since the previous one, plus rows created since then that are due inside the
+    loaded slice, so the cost of a poll doesn't grow with the number of future-dated rows.
+    Every `resync_seconds` the heap is rebuilt from the database, which picks up notifications
+    that were released but never sent (e.g. the worker holding their lease crashed).
+
+    Released notifications still have to be claimed, so several schedulers can run against the
+    same database.
+    """
+
+    def __init__(
+        self,
+        backend: DjangoDbNotificationBackend,
+        window_seconds: float = 300,
+        max_queued: int = 10_000,
+        resync_seconds: float | None = None,
+        created_overlap_seconds: float = 60,
+    ):
+        self.backend = backend
+        self.window = datetime.timedelta(seconds=window_seconds)
+        self.max_queued = max_queued
+        self.resync_interval = datetime.timedelta(
+            seconds=window_seconds if resync_seconds is None else resync_seconds
+        )
+        # `created` is set before the row commits, so late inserts are looked up with some slack
+        self.created_overlap = datetime.timedelta(seconds=created_overlap_seconds)
+        self.reset()
+
+    def reset(self) -> None:
+        """
+        Drop the in-memory schedule, so the next refill rebuilds it from the database.
+        """
+        self._heap: list[tuple[datetime.datetime, int | str | uuid.UUID]] = []
+        self._queued_ids: set[int | str | uuid.UUID] = set()
+        # Released notifications stay pending until sent, so they're remembered until the next
+        # resync to avoid releasing them again
+        self._released_ids: set[int | str | uuid.UUID] = set()
+        # Every scheduled notification with `send_after <= _loaded_until` was loaded
+        self._loaded_until: datetime.datetime | None = None
+        self._refilled_at: datetime.datetime | None = None
+        self._resync_at: datetime.datetime | None = None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+    def _push(self, keys: list[tuple[datetime.datetime, int | str | uuid.UUID]]) -> None:
+        for send_after, notification_id in keys:
+            if notification_id in self._queued_ids or notification_id in self._released_ids:
+                continue
+            self._queued_ids.add(notification_id)
+            heapq.heappush(self._heap, (send_after, notification_id))
+
+    def refill(self, now: datetime.datetime | None = None) -> None:
+        now = now or timezone.now()
+        if self._resync_at is None or now >= self._resync_at:
+            self.reset()
+            self._resync_at = now + self.resync_interval
+
+        if self._loaded_until is not None and self._refilled_at is not None:
+            self._push(
+                self.backend.get_scheduled_notification_keys(
+                    until=self._loaded_until,
+                    created_since=self._refilled_at - self.created_overlap,
+                )
+            )
+        self._refilled_at = now
+
+        horizon = now + self.window
+        free_slots = self.max_queued - len(self._heap)
+        if free_slots <= 0 or (self._loaded_until is not None and self._loaded_until >= horizon):
+            return
+        keys = self.backend.get_scheduled_notification_keys(
+            until=horizon, after=self._loaded_until, limit=free_slots + 1
+        )
+        if len(keys) <= free_slots:
+            self._push(keys)
+            self._loaded_until = horizon
+            return
+
+        # The window doesn't fit: load up to the last complete `send_after` value, so rows
+        # sharing a timestamp are never split between refills
+        last_send_after = keys[-1][0]
+        keys = [key for key in keys if key[0] < last_send_after]
+        if not keys:
+            keys = self.backend.get_scheduled_notification_keys(
+                until=last_send_after, after=self._loaded_until
+            )
+        self._push(keys)
+        self._loaded_until = keys[-1][0]
+
+    def pop_due(
+        self, limit: int, now: datetime.datetime | None = None
+    ) -> list[int | str | uuid.UUID]:
+        """
+        Remove and return the ids of up to `limit` notifications whose `send_after` has passed.
+        """
+        now = now or timezone.now()
+        due_ids = []
+        while self._heap and len(due_ids) < limit and self._heap[0][0] <= now:
+            _, notification_id = heapq.heappop(self._heap)
+            self._queued_ids.discard(notification_id)
+            self._released_ids.add(notification_id)
+            due_ids.append(notification_id)
+        return due_ids
+
+    def seconds_until_next_due(self, now: datetime.datetime | None = None) -> float | None:
+        """
+        Seconds until the next queued notification is due, or None if nothing is queued.
+        """
+        if not self._heap:
+            return None
+        now = now or timezone.now()
+        return max((self._heap[0][0] - now).total_seconds(), 0.0)
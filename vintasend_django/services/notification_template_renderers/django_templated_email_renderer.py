@@ -1,6 +1,18 @@
+import functools
+import hashlib
+import json
+import logging
+import threading
+import weakref
+from collections import OrderedDict
+from collections.abc import Iterable
+from pathlib import Path
 from typing import TYPE_CHECKING
 
-from django.template.loader import render_to_string
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.template.loader import get_template
+from django.utils.autoreload import file_changed
 
 from vintasend.exceptions import (
     NotificationBodyTemplateRenderingError,
@@ -13,39 +25,183 @@ from vintasend.services.notification_template_renderers.base_templated_email_ren
     TemplatedEmail,
 )
 
+from vintasend_django.app_settings import get_settings_snapshot
+
 
 if TYPE_CHECKING:
     from vintasend.services.notification_service import NotificationContextDict
 
 
+logger = logging.getLogger(__name__)
+
+# Templates containing this marker (e.g. in a `{# vintasend:render-once #}` comment) declare that
+# their output only depends on the render context, never on the recipient.
+RENDER_ONCE_MARKER = "vintasend:render-once"
+
+
 class DjangoTemplatedEmailRenderer(BaseTemplatedEmailRenderer):
+    """
+    Renders email notifications with Django templates.
+
+    Compiled templates are kept in a bounded per-renderer LRU cache keyed by template path, so
+    templates are parsed once per process regardless of the loaders the project configured.
+    The cache size defaults to the `NOTIFICATION_TEMPLATE_CACHE_SIZE` setting.
+
+    With `render_once_per_group=True`, notifications whose preheader, subject and body templates
+    all carry the `RENDER_ONCE_MARKER` are rendered once per distinct (templates, context) pair and
+    the resulting email is reused, which turns a broadcast to many users with a shared context
+    into one render.
+    """
+
+    _instances: "weakref.WeakSet[DjangoTemplatedEmailRenderer]" = weakref.WeakSet()
+
+    def __init__(
+        self,
+        template_cache_size: int | None = None,
+        render_once_per_group: bool = False,
+        group_render_cache_size: int = 128,
+        **kwargs,
+    ):
+        # Kept in `template_renderer_kwargs`, so copies built from them have the same config
+        super().__init__(
+            template_cache_size=template_cache_size,
+            render_once_per_group=render_once_per_group,
+            group_render_cache_size=group_render_cache_size,
+            **kwargs,
+        )
+        if template_cache_size is None:
+            template_cache_size = get_settings_snapshot().template_cache_size
+        self.get_template = functools.lru_cache(maxsize=template_cache_size)(get_template)
+        self.render_once_per_group = render_once_per_group
+        self.group_render_cache_size = group_render_cache_size
+        # Maps group render keys to the rendered preheader and email
+        self._group_renders: OrderedDict[str, tuple[str, TemplatedEmail]] = OrderedDict()
+        self._group_renders_lock = threading.Lock()
+        self._instances.add(self)
+
+    def clear_template_cache(self) -> None:
+        self.get_template.cache_clear()
+        with self._group_renders_lock:
+            self._group_renders.clear()
+
+    def is_render_once_template(self, template_name: str) -> bool:
+        template = self.get_template(template_name)
+        # Only Django engine templates expose their source
+        source = getattr(getattr(template, "template", None), "source", "")
+        return RENDER_ONCE_MARKER in source
+
+    def get_group_render_key(
+        self, notification: Notification, context: "NotificationContextDict"
+    ) -> str | None:
+        """
+        Return the key shared by every notification that renders to the same email, or None if
+        the notification can't be rendered once per group.
+        """
+        if not self.render_once_per_group:
+            return None
+        try:
+            # Every rendered part is reused, so none of them may depend on the recipient
+            if not all(
+                self.is_render_once_template(template_name)
+                for template_name in (
+                    notification.preheader_template,
+                    notification.subject_template,
+                    notification.body_template,
+                )
+            ):
+                return None
+            serialized_context = json.dumps(context, sort_keys=True)
+        except Exception:  # noqa: BLE001
+            # Let the regular render path report template and context errors
+            return None
+        key_parts = [
+            notification.preheader_template,
+            notification.subject_template,
+            notification.body_template,
+            serialized_context,
+        ]
+        return hashlib.sha256("\0".join(key_parts).encode()).hexdigest()
+
+    def warm_templates(self, template_names: Iterable[str]) -> None:
+        """
+        Compile and cache the given templates, e.g. the ones referenced by pending notifications
+        when a worker starts. Templates that fail to compile are logged and skipped; rendering
+        them later raises the usual rendering errors.
+        """
+        for template_name in template_names:
+            if not template_name:
+                continue
+            try:
+                self.get_template(template_name)
+            except Exception:  # noqa: BLE001
+                logger.exception("Failed to compile template %s", template_name)
+
     def render(
         self, notification: Notification, context: "NotificationContextDict"
+    ) -> TemplatedEmail:
+        group_render_key = self.get_group_render_key(notification, context)
+        if group_render_key is None:
+            return self._render(notification, context)
+
+        with self._group_renders_lock:
+            group_render = self._group_renders.get(group_render_key)
+            if group_render is not None:
+                self._group_renders.move_to_end(group_render_key)
+        if group_render is not None:
+            preheader, templated_email = group_render
+            context["private_preheader"] = preheader
+            return templated_email
+
+        templated_email = self._render(notification, context)
+        with self._group_renders_lock:
+            self._group_renders[group_render_key] = (context["private_preheader"], templated_email)
+            while len(self._group_renders) > self.group_render_cache_size:
+                self._group_renders.popitem(last=False)
+        return templated_email
+
+    def _render(
+        self, notification: Notification, context: "NotificationContextDict"
     ) -> TemplatedEmail:
         subject_template = notification.subject_template
         body_template = notification.body_template
         preheader_template = notification.preheader_template
 
         try:
-            context["private_preheader"] = render_to_string(
-                preheader_template,
-                context,
-            )
+            context["private_preheader"] = self.get_template(preheader_template).render(context)
         except Exception as e:  # noqa: BLE001
             raise NotificationPreheaderTemplateRenderingError(
                 "Failed to render preheader template"
             ) from e
 
         try:
-            subject = render_to_string(subject_template, context)
+            subject = self.get_template(subject_template).render(context)
         except Exception as e:  # noqa: BLE001
             raise NotificationSubjectTemplateRenderingError(
                 "Failed to render subject template"
             ) from e
 
         try:
-            body = render_to_string(body_template, context)
+            body = self.get_template(body_template).render(context)
         except Exception as e:  # noqa: BLE001
             raise NotificationBodyTemplateRenderingError("Failed to render body template") from e
 
         return TemplatedEmail(subject=subject, body=body)
+
+
+def _clear_template_caches() -> None:
+    for renderer in list(DjangoTemplatedEmailRenderer._instances):
+        renderer.clear_template_cache()
+
+
+@receiver(setting_changed)
+def clear_template_caches_on_setting_changed(*, setting: str, **kwargs) -> None:
+    if setting == "TEMPLATES":
+        _clear_template_caches()
+
+
+@receiver(file_changed)
+def clear_template_caches_on_file_changed(*, file_path: Path, **kwargs) -> None:
+    # Let the dev server pick up edited templates. Don't return a value, so Django's own handler
+    # still decides whether to reload the process.
+    if file_path.suffix != ".py":
+        _clear_template_caches()
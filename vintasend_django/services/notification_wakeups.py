@@ -0,0 +1,156 @@
+import functools
+import select
+import threading
+from abc import ABC, abstractmethod
+
+from django.core.signals import setting_changed
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.dispatch import receiver
+
+
+WAKEUP_CHANNEL = "vintasend_notifications"
+
+
+class BaseNotificationWakeup(ABC):
+    """
+    Signals workers that a notification became sendable, so they can block until there's work
+    instead of polling the database on a fixed interval. A wakeup is only a hint: workers still
+    claim from the database, and keep a poll interval as a safety net for missed signals.
+    """
+
+    @abstractmethod
+    def notify(self) -> None:
+        ...
+
+    @abstractmethod
+    def listen(self) -> None:
+        """
+        Start receiving wakeups on the calling thread. Signals sent before the first call may be
+        missed, so workers call this before checking the queue for the first time.
+        """
+
+    @abstractmethod
+    def wait(self, timeout: float) -> bool:
+        """
+        Block until a wakeup arrives or `timeout` seconds pass, returning whether one arrived.
+        Wakeups sent since the last `wait` on this thread return immediately.
+        """
+
+
+class LocalNotificationWakeup(BaseNotificationWakeup):
+    """
+    In-process wakeup based on a condition variable. It only reaches workers running in the
+    process that persisted the notification, which covers threaded workers and tests.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._generation = 0
+        self._seen = threading.local()
+
+    def notify(self) -> None:
+        with self._condition:
+            self._generation += 1
+            self._condition.notify_all()
+
+    def listen(self) -> None:
+        if not hasattr(self._seen, "generation"):
+            with self._condition:
+                self._seen.generation = self._generation
+
+    def wait(self, timeout: float) -> bool:
+        self.listen()
+        with self._condition:
+            woken = self._condition.wait_for(
+                lambda: self._generation != self._seen.generation, timeout
+            )
+            self._seen.generation = self._generation
+        return woken
+
+
+class PostgresNotificationWakeup(BaseNotificationWakeup):
+    """
+    Cross-process wakeup based on PostgreSQL `LISTEN`/`NOTIFY`. Each worker thread listens on
+    its own Django connection; notifications that arrive while the worker is busy sending, even
+    while it runs other queries on that connection, make its next `wait` return immediately.
+    """
+
+    def __init__(self, using: str = DEFAULT_DB_ALIAS, channel: str = WAKEUP_CHANNEL):
+        self.using = using
+        self.channel = channel
+        # The database connection each thread issued LISTEN on
+        self._listening = threading.local()
+
+    def notify(self) -> None:
+        with connections[self.using].cursor() as cursor:
+            cursor.execute("SELECT pg_notify(%s, '')", [self.channel])
+
+    def listen(self) -> None:
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        # LISTEN only lasts as long as the database connection, so it's issued again when Django
+        # reopened it (CONN_MAX_AGE, close_old_connections) since the last wait
+        connection = connections[self.using]
+        connection.ensure_connection()
+        if getattr(self._listening, "connection", None) is connection.connection:
+            return
+        with connection.cursor() as cursor:
+            cursor.execute(f"LISTEN {connection.ops.quote_name(self.channel)}")
+        if is_psycopg3:
+            # psycopg 3 hands notifications read while running other queries to its handlers
+            # only, so they're recorded here for the next wait
+            connection.connection.add_notify_handler(self._handle_notify)
+        self._listening.connection = connection.connection
+        self._listening.notified = False
+
+    def _handle_notify(self, notify) -> None:
+        self._listening.notified = True
+
+    def wait(self, timeout: float) -> bool:
+        from django.db.backends.postgresql.psycopg_any import is_psycopg3
+
+        self.listen()
+        raw_connection = connections[self.using].connection
+        if is_psycopg3:
+            return self._wait_psycopg3(raw_connection, timeout)
+
+        raw_connection.poll()
+        if not raw_connection.notifies:
+            if select.select([raw_connection], [], [], timeout) == ([], [], []):
+                return False
+            raw_connection.poll()
+        woken = bool(raw_connection.notifies)
+        raw_connection.notifies.clear()
+        return woken
+
+    def _wait_psycopg3(self, raw_connection, timeout: float) -> bool:
+        if self._listening.notified:
+            self._listening.notified = False
+            return True
+        if select.select([raw_connection], [], [], timeout) == ([], [], []):
+            return False
+        # Read straight from libpq: `Connection.notifies()` only accepts a timeout since
+        # psycopg 3.2, and blocks until a notification arrives before that
+        pgconn = raw_connection.pgconn
+        pgconn.consume_input()
+        woken = False
+        while pgconn.notifies() is not None:
+            woken = True
+        return woken
+
+
+@functools.cache
+def get_notification_wakeup(using: str = DEFAULT_DB_ALIAS) -> BaseNotificationWakeup:
+    """
+    Return the process-wide wakeup for the `using` database: `LISTEN`/`NOTIFY` on PostgreSQL,
+    an in-process condition variable elsewhere.
+    """
+    if connections[using].vendor == "postgresql":
+        return PostgresNotificationWakeup(using=using)
+    return LocalNotificationWakeup()
+
+
+@receiver(setting_changed)
+def clear_notification_wakeup(*, setting: str, **kwargs) -> None:
+    if setting == "DATABASES":
+        get_notification_wakeup.cache_clear()
@@ -0,0 +1,149 @@
+import logging
+import os
+import socket
+import threading
+import time
+
+from vintasend.services.notification_service import NotificationService
+
+from vintasend_django.services.dataclasses import RetryPolicy
+from vintasend_django.services.notification_dispatchers.thread_pool_dispatcher import (
+    ThreadPoolNotificationDispatcher,
+)
+from vintasend_django.services.notification_scheduler import NotificationScheduler
+from vintasend_django.services.notification_wakeups import BaseNotificationWakeup
+
+
+logger = logging.getLogger(__name__)
+
+# How often a worker blocked on a wakeup checks whether it was asked to stop
+STOP_CHECK_INTERVAL = 0.5
+
+
+class NotificationWorker:
+    """
+    Drains the pending notifications queue: claims a batch, sends it through a
+    `ThreadPoolNotificationDispatcher` and repeats. When the queue is empty it blocks on a
+    wakeup sent by the backend when a sendable notification is persisted, polling again after
+    `poll_interval` seconds at most in case a wakeup was missed. Several workers, in one or many
+    processes, can run against the same database since batches are leased to a single worker.
+
+    With `schedule_window` set, scheduled notifications are released by a
+    `NotificationScheduler` holding the next `schedule_window` seconds of them, and the worker
+    sleeps until the next one is due; the queue scan then only covers unscheduled rows.
+
+    `retry_policy` configures retries for the default notification service's backend; when a
+    `notification_service` is given, configure it through its `notification_backend_kwargs`.
+    """
+
+    def __init__(
+        self,
+        notification_service: NotificationService | None = None,
+        batch_size: int = 100,
+        poll_interval: float = 5.0,
+        lease_seconds: int = 300,
+        max_workers: int = 1,
+        worker_id: str | None = None,
+        wakeup: BaseNotificationWakeup | None = None,
+        schedule_window: float | None = None,
+        retry_policy: RetryPolicy | None = None,
+    ):
+        self.notification_service = notification_service or NotificationService(
+            notification_backend_kwargs={"retry_policy": retry_policy} if retry_policy else None
+        )
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.lease_seconds = lease_seconds
+        self.worker_id = worker_id or f"{socket.gethostname()}-{os.getpid()}"
+        self.dispatcher = ThreadPoolNotificationDispatcher(
+            self.notification_service, max_workers=max_workers, worker_id=self.worker_id
+        )
+        self.wakeup = wakeup or self.dispatcher.backend.get_wakeup()
+        self.scheduler = (
+            NotificationScheduler(self.dispatcher.backend, window_seconds=schedule_window)
+            if schedule_window
+            else None
+        )
+        self.stop_event = threading.Event()
+
+    def stop(self) -> None:
+        """
+        Ask the worker to exit once the batch it's sending is done.
+        """
+        self.stop_event.set()
+
+    def warm_templates(self) -> None:
+        template_names = self.dispatcher.backend.get_pending_notification_templates()
+        for adapter in self.notification_service.notification_adapters:
+            warm_templates = getattr(adapter.template_renderer, "warm_templates", None)
+            if warm_templates is not None:
+                warm_templates(template_names)
+
+    def run_once(self) -> int:
+        """
+        Claim and send one batch, returning the number of notifications processed.
+        """
+        if self.scheduler is None:
+            results = self.dispatcher.dispatch_pending_batch(
+                batch_size=self.batch_size, lease_seconds=self.lease_seconds
+            )
+        else:
+            self.scheduler.refill()
+            results = []
+            if due_ids := self.scheduler.pop_due(self.batch_size):
+                results += self.dispatcher.dispatch_pending_batch(
+                    batch_size=len(due_ids),
+                    lease_seconds=self.lease_seconds,
+                    notification_ids=due_ids,
+                )
+            results += self.dispatcher.dispatch_pending_batch(
+                batch_size=self.batch_size,
+                lease_seconds=self.lease_seconds,
+                include_scheduled=False,
+            )
+        sent = sum(1 for r in results if r.sent)
+        if results:
+            logger.info(
+                "Worker %s sent %s notifications, %s failed",
+                self.worker_id,
+                sent,
+                len(results) - sent,
+            )
+        return len(results)
+
+    def wait_for_work(self) -> bool:
+        """
+        Block until a wakeup arrives, `poll_interval` seconds pass, the next scheduled
+        notification is due or the worker is stopped, returning whether a wakeup arrived.
+        """
+        timeout = self.poll_interval
+        if self.scheduler is not None:
+            next_due = self.scheduler.seconds_until_next_due()
+            if next_due is not None:
+                timeout = min(timeout, next_due)
+        deadline = time.monotonic() + timeout
+        while not self.stop_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            if self.wakeup.wait(min(remaining, STOP_CHECK_INTERVAL)):
+                return True
+        return False
+
+    def run(self, exit_when_empty: bool = False) -> None:
+        """
+        Send batches until `stop` is called, or until the queue is empty if `exit_when_empty`.
+        """
+        logger.info("Worker %s started", self.worker_id)
+        self.warm_templates()
+        self.wakeup.listen()
+        try:
+            while not self.stop_event.is_set():
+                if self.run_once():
+                    continue
+                if exit_when_empty:
+                    break
+                self.wait_for_work()
+        finally:
+            self.dispatcher.shutdown()
+            logger.info("Worker %s stopped", self.worker_id)
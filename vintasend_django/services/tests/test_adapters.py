@@ -1,14 +1,27 @@
+import time
+import timeit
 import uuid
+from unittest import mock
+
 import pytest
 
 from django.core import mail
+from django.test import override_settings
+from django.core.mail.backends.locmem import EmailBackend as LocmemEmailBackend
 
 from vintasend.constants import NotificationStatus, NotificationTypes
 from vintasend.exceptions import (
     NotificationTemplateRenderingError,
+    NotificationUserNotFoundError,
 )
+from vintasend.app_settings import NotificationSettings
 from vintasend.services.dataclasses import Notification
 from vintasend.services.notification_backends.stubs.fake_backend import FakeFileBackend
+from vintasend_django.app_settings import get_settings_snapshot
+from vintasend_django.services.dataclasses import NotificationWithRecipient
+from vintasend_django.services.notification_adapters.django_async_email import (
+    DjangoAsyncEmailNotificationAdapter,
+)
 from vintasend_django.services.notification_adapters.django_email import (
     DjangoEmailNotificationAdapter,
 )
@@ -80,3 +93,270 @@ class DjangoEmailNotificationAdapterTestCase(VintaSendDjangoTestCase):
             adapter.send(notification, context)
 
         assert len(mail.outbox) == 0
+
+    def create_adapter(self, notifications, template_renderer="FakeTemplateRenderer"):
+        backend = FakeFileBackend(database_file_name="django-email-adapter-test-notifications.json")
+        backend.notifications.extend(notifications)
+        backend._store_notifications()
+        return DjangoEmailNotificationAdapter(
+            f"vintasend.services.notification_template_renderers.stubs.fake_templated_email_renderer.{template_renderer}",
+            backend,
+        )
+
+    def test_send_many(self):
+        user = self.create_user(email="testadapter@example.com")
+        notifications = [self.create_notification(user) for _ in range(3)]
+        adapter = self.create_adapter(notifications)
+
+        with mock.patch(
+            "vintasend_django.services.notification_adapters.django_email.get_connection",
+            wraps=mail.get_connection,
+        ) as get_connection:
+            results = adapter.send_many(
+                [(n, self.create_notification_context()) for n in notifications]
+            )
+
+        get_connection.assert_called_once()
+        assert [r.notification for r in results] == notifications
+        assert all(r.sent for r in results)
+        assert len(mail.outbox) == 3
+
+    def test_send_many_reports_failures_and_reconnects(self):
+        user = self.create_user(email="testadapter@example.com")
+        notifications = [self.create_notification(user) for _ in range(3)]
+        adapter = self.create_adapter(notifications)
+        send_error = ConnectionError("connection reset")
+        original_send_messages = LocmemEmailBackend.send_messages
+        calls = []
+
+        def flaky_send_messages(backend, messages):
+            calls.append(messages)
+            if len(calls) == 2:
+                raise send_error
+            return original_send_messages(backend, messages)
+
+        with (
+            mock.patch.object(LocmemEmailBackend, "send_messages", flaky_send_messages),
+            mock.patch.object(LocmemEmailBackend, "open") as open_connection,
+        ):
+            results = adapter.send_many(
+                [(n, self.create_notification_context()) for n in notifications]
+            )
+
+        assert [r.sent for r in results] == [True, False, True]
+        assert results[1].error is send_error
+        assert open_connection.call_count == 2
+        assert len(mail.outbox) == 2
+
+    def test_send_many_reports_failures_when_connection_cannot_open(self):
+        user = self.create_user(email="testadapter@example.com")
+        notifications = [self.create_notification(user) for _ in range(2)]
+        adapter = self.create_adapter(notifications)
+        open_error = ConnectionRefusedError("connection refused")
+
+        with (
+            mock.patch.object(LocmemEmailBackend, "open", side_effect=open_error),
+            mock.patch.object(LocmemEmailBackend, "send_messages", side_effect=open_error),
+        ):
+            results = adapter.send_many(
+                [(n, self.create_notification_context()) for n in notifications]
+            )
+
+        assert [r.notification for r in results] == notifications
+        assert [r.error for r in results] == [open_error, open_error]
+        assert len(mail.outbox) == 0
+
+    def test_send_many_with_render_error(self):
+        user = self.create_user(email="testadapter@example.com")
+        notification = self.create_notification(user)
+        adapter = self.create_adapter(
+            [notification], template_renderer="FakeTemplateRendererWithException"
+        )
+
+        results = adapter.send_many([(notification, self.create_notification_context())])
+
+        assert len(results) == 1
+        assert isinstance(results[0].error, NotificationTemplateRenderingError)
+        assert len(mail.outbox) == 0
+
+    @override_settings(
+        NOTIFICATION_DEFAULT_FROM_EMAIL="from@example.com",
+        NOTIFICATION_DEFAULT_BCC_EMAILS=["bcc@example.com"],
+        NOTIFICATION_DEFAULT_BASE_URL_DOMAIN="app.example.com",
+    )
+    def test_send_notification_uses_current_settings(self):
+        user = self.create_user(email="testadapter@example.com")
+        notification = self.create_notification(user)
+        adapter = self.create_adapter([notification])
+
+        email = adapter.build_email_message(notification, self.create_notification_context())
+
+        assert email.from_email == "from@example.com"
+        assert email.bcc == ["bcc@example.com"]
+        assert get_settings_snapshot().base_url == "http://app.example.com"
+
+    def test_settings_snapshot_is_invalidated_on_setting_changed(self):
+        snapshot = get_settings_snapshot()
+        assert get_settings_snapshot() is snapshot
+
+        with override_settings(NOTIFICATION_DEFAULT_FROM_EMAIL="changed@example.com"):
+            assert get_settings_snapshot().default_from_email == "changed@example.com"
+
+        assert get_settings_snapshot() == snapshot
+
+    @override_settings(
+        NOTIFICATION_DEFAULT_FROM_EMAIL="from@example.com",
+        NOTIFICATION_DEFAULT_BCC_EMAILS=["bcc@example.com"],
+        NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL="https",
+        NOTIFICATION_DEFAULT_BASE_URL_DOMAIN="app.example.com",
+    )
+    def test_settings_snapshot_matches_settings(self):
+        snapshot = get_settings_snapshot()
+
+        assert snapshot.default_from_email == "from@example.com"
+        assert snapshot.default_bcc_emails == ("bcc@example.com",)
+        assert snapshot.base_url == "https://app.example.com"
+
+    @pytest.mark.benchmark
+    def test_settings_snapshot_per_send_overhead(self):
+        """
+        Microbenchmark: reading the snapshot must be cheaper than resolving the settings,
+        copying the BCC list and formatting the base URL on every send, as `send` used to do.
+        """
+
+        def resolve_settings_per_send():
+            notification_settings = NotificationSettings()
+            bcc = [email for email in notification_settings.NOTIFICATION_DEFAULT_BCC_EMAILS] or []
+            base_url = f"{notification_settings.NOTIFICATION_DEFAULT_BASE_URL_PROTOCOL}://{notification_settings.NOTIFICATION_DEFAULT_BASE_URL_DOMAIN}"
+            return notification_settings.NOTIFICATION_DEFAULT_FROM_EMAIL, bcc, base_url
+
+        def read_snapshot():
+            snapshot = get_settings_snapshot()
+            return snapshot.default_from_email, snapshot.default_bcc_emails, snapshot.base_url
+
+        per_send = min(timeit.repeat(resolve_settings_per_send, number=10_000, repeat=5))
+        snapshot = min(timeit.repeat(read_snapshot, number=10_000, repeat=5))
+
+        assert snapshot < per_send
+
+    def test_send_notification_with_attached_recipient(self):
+        user = self.create_user(email="testadapter@example.com")
+        notification = NotificationWithRecipient.from_notification(
+            self.create_notification(user),
+            recipient_email="attached@example.com",
+            recipient_is_active=True,
+        )
+        adapter = self.create_adapter([notification])
+
+        with mock.patch.object(adapter.backend, "get_user_email_from_notification") as lookup:
+            adapter.send(notification, self.create_notification_context())
+
+        lookup.assert_not_called()
+        assert mail.outbox[0].to == ["attached@example.com"]
+
+    def test_send_notification_with_attached_inactive_recipient(self):
+        user = self.create_user(email="testadapter@example.com")
+        notification = NotificationWithRecipient.from_notification(
+            self.create_notification(user),
+            recipient_email="attached@example.com",
+            recipient_is_active=False,
+        )
+        adapter = self.create_adapter([notification])
+
+        with pytest.raises(NotificationUserNotFoundError):
+            adapter.send(notification, self.create_notification_context())
+
+        assert len(mail.outbox) == 0
+
+
+class DjangoAsyncEmailNotificationAdapterTestCase(VintaSendDjangoTestCase):
+    def tearDown(self) -> None:
+        mail.outbox = []
+        FakeFileBackend(database_file_name="django-async-email-adapter-test-notifications.json").clear()
+        return super().tearDown()
+
+    def create_notification(self):
+        return Notification(
+            id=uuid.uuid4(),
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="Test Notification",
+            body_template="Test Body",
+            context_name="test_context",
+            context_kwargs={"test": "test"},
+            send_after=None,
+            subject_template="Test Subject",
+            preheader_template="Test Preheader",
+            status=NotificationStatus.PENDING_SEND.value,
+        )
+
+    def create_adapter(self, notifications, **kwargs):
+        backend = FakeFileBackend(
+            database_file_name="django-async-email-adapter-test-notifications.json"
+        )
+        backend.notifications.extend(notifications)
+        backend._store_notifications()
+        return DjangoAsyncEmailNotificationAdapter(
+            "vintasend.services.notification_template_renderers.stubs.fake_templated_email_renderer.FakeTemplateRenderer",
+            backend,
+            **kwargs,
+        )
+
+    async def test_asend(self):
+        notification = self.create_notification()
+        adapter = self.create_adapter([notification])
+
+        await adapter.asend(notification, {"foo": "bar"})
+
+        assert len(mail.outbox) == 1
+        assert mail.outbox[0].to == ["testemail@example.com"]
+
+    async def test_asend_many_bounds_concurrency(self):
+        notifications = [self.create_notification() for _ in range(6)]
+        adapter = self.create_adapter(notifications, max_concurrency=2)
+        in_flight = 0
+        max_in_flight = 0
+        opened_connections = []
+        original_send_with_connection = adapter._send_with_connection
+
+        def tracking_send_with_connection(email_connection, email):
+            nonlocal in_flight, max_in_flight
+            if email_connection not in opened_connections:
+                opened_connections.append(email_connection)
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            try:
+                time.sleep(0.02)
+                return original_send_with_connection(email_connection, email)
+            finally:
+                in_flight -= 1
+
+        with mock.patch.object(adapter, "_send_with_connection", tracking_send_with_connection):
+            results = await adapter.asend_many([(n, {"foo": "bar"}) for n in notifications])
+
+        assert [r.notification for r in results] == notifications
+        assert all(r.sent for r in results)
+        assert len(mail.outbox) == 6
+        assert max_in_flight <= 2
+        assert len(opened_connections) <= 2
+
+    async def test_asend_many_reports_failures(self):
+        notifications = [self.create_notification() for _ in range(3)]
+        adapter = self.create_adapter(notifications)
+        send_error = ConnectionError("connection reset")
+        original_send_with_connection = adapter._send_with_connection
+
+        calls = []
+
+        def flaky_send_with_connection(email_connection, email):
+            calls.append(email)
+            if len(calls) == 1:
+                raise send_error
+            return original_send_with_connection(email_connection, email)
+
+        with mock.patch.object(adapter, "_send_with_connection", flaky_send_with_connection):
+            results = await adapter.asend_many([(n, {"foo": "bar"}) for n in notifications])
+
+        assert [r.sent for r in results].count(False) == 1
+        assert [r.error for r in results if not r.sent] == [send_error]
+        assert len(mail.outbox) == 2
@@ -1,10 +1,29 @@
+import dataclasses
 import random
+import threading
+import time
+import timeit
+import tracemalloc
+import unittest
+from io import StringIO
+from unittest import mock
+
 import pytest
 from datetime import timedelta
 
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models import QuerySet
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
-from vintasend_django.test_helpers import VintaSendDjangoTestCase
+from freezegun import freeze_time
+
+from vintasend_django.test_helpers import (
+    VintaSendDjangoTestCase,
+    VintaSendDjangoTransactionTestCase,
+)
 from vintasend.constants import NotificationStatus, NotificationTypes
 from vintasend.exceptions import (
     NotificationCancelError,
@@ -13,7 +32,10 @@ from vintasend.exceptions import (
 )
 from vintasend.services.dataclasses import Notification
 from vintasend_django.models import Notification as NotificationModel
+from vintasend_django.models import NotificationArchive, NotificationContext
+from vintasend_django.services.dataclasses import RetryPolicy
 from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    SERIALIZED_FIELDS,
     DjangoDbNotificationBackend,
 )
 
@@ -373,3 +395,1647 @@ class DjangoDBNotificationBackendTestCase(VintaSendDjangoTestCase):
         DjangoDbNotificationBackend().cancel_notification(notification.id)
         with pytest.raises(NotificationNotFoundError):
             DjangoDbNotificationBackend().get_notification(notification.id)
+
+    def test_claim_pending_notifications(self):
+        notifications = self.create_notifications(3)
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=2, worker_id="worker-1"
+        )
+
+        assert [n.id for n in claimed] == [notifications[0].id, notifications[1].id]
+        assert all(isinstance(n, Notification) for n in claimed)
+        assert set(
+            NotificationModel.objects.filter(claimed_by="worker-1").values_list("id", flat=True)
+        ) == {notifications[0].id, notifications[1].id}
+
+    def test_claim_pending_notifications_skips_rows_claimed_by_other_workers(self):
+        notifications = self.create_notifications(3)
+        backend = DjangoDbNotificationBackend()
+
+        first_batch = backend.claim_pending_notifications(batch_size=2, worker_id="worker-1")
+        second_batch = backend.claim_pending_notifications(batch_size=2, worker_id="worker-2")
+        third_batch = backend.claim_pending_notifications(batch_size=2, worker_id="worker-3")
+
+        assert [n.id for n in first_batch] == [notifications[0].id, notifications[1].id]
+        assert [n.id for n in second_batch] == [notifications[2].id]
+        assert third_batch == []
+
+    def test_claim_pending_notifications_reclaims_expired_leases(self):
+        notifications = self.create_notifications(1)
+        backend = DjangoDbNotificationBackend()
+        backend.claim_pending_notifications(batch_size=1, worker_id="worker-1", lease_seconds=60)
+
+        with freeze_time(timezone.now() + timedelta(seconds=61)):
+            claimed = backend.claim_pending_notifications(batch_size=1, worker_id="worker-2")
+
+        assert [n.id for n in claimed] == [notifications[0].id]
+        assert NotificationModel.objects.get(id=notifications[0].id).claimed_by == "worker-2"
+
+    def test_claim_pending_notifications_ignores_sent_notifications(self):
+        notifications = self.create_notifications(2)
+        DjangoDbNotificationBackend().mark_pending_as_sent(notifications[0].id)
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=10, worker_id="worker-1"
+        )
+
+        assert [n.id for n in claimed] == [notifications[1].id]
+
+    def test_get_all_future_notifications_excludes_due_notifications(self):
+        now = timezone.now()
+        self.create_notifications(1, send_after=now - timedelta(minutes=1))
+        self.create_notifications(1)
+        later = self.create_notifications(1, send_after=now + timedelta(days=2))
+        sooner = self.create_notifications(1, send_after=now + timedelta(days=1))
+
+        future = list(DjangoDbNotificationBackend().get_all_future_notifications())
+
+        assert [n.id for n in future] == [sooner[0].id, later[0].id]
+
+    def test_mark_pending_as_failed_counts_attempts(self):
+        notification = self.create_notifications(1)[0]
+
+        DjangoDbNotificationBackend().mark_pending_as_failed(notification.id)
+
+        notification_db_record = NotificationModel.objects.get(id=notification.id)
+        assert notification_db_record.status == NotificationStatus.FAILED.value
+        assert notification_db_record.failed_attempts == 1
+
+    def test_mark_pending_as_failed_with_retry_policy_schedules_retry(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend(
+            retry_policy=RetryPolicy(max_attempts=3, base_delay=60)
+        )
+        backend.claim_pending_notifications(batch_size=1, worker_id="worker-1")
+
+        with freeze_time(timezone.now()) as frozen_time:
+            updated = backend.mark_pending_as_failed(notification.id)
+            notification_db_record = NotificationModel.objects.get(id=notification.id)
+
+            assert updated.status == NotificationStatus.PENDING_SEND.value
+            assert notification_db_record.failed_attempts == 1
+            assert notification_db_record.claimed_until is None
+            assert (
+                timezone.now() + timedelta(seconds=30)
+                <= notification_db_record.next_attempt_at
+                <= timezone.now() + timedelta(seconds=60)
+            )
+            assert list(backend.get_all_pending_notifications()) == []
+
+            frozen_time.tick(timedelta(seconds=61))
+            assert [n.id for n in backend.get_all_pending_notifications()] == [notification.id]
+
+    def test_mark_pending_as_failed_with_retry_policy_fails_after_max_attempts(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend(retry_policy={"max_attempts": 2})
+
+        backend.mark_pending_as_failed(notification.id)
+        updated = backend.mark_pending_as_failed(notification.id)
+
+        notification_db_record = NotificationModel.objects.get(id=notification.id)
+        assert updated.status == NotificationStatus.FAILED.value
+        assert notification_db_record.failed_attempts == 2
+        assert notification_db_record.next_attempt_at is None
+        with pytest.raises(NotificationUpdateError):
+            backend.mark_pending_as_failed(notification.id)
+
+    def test_bulk_mark_pending_as_failed_with_retry_policy(self):
+        notifications = self.create_notifications(3)
+        NotificationModel.objects.filter(id=notifications[0].id).update(failed_attempts=2)
+        DjangoDbNotificationBackend().mark_pending_as_sent(notifications[2].id)
+        backend = DjangoDbNotificationBackend(retry_policy=RetryPolicy(max_attempts=3))
+
+        result = backend.bulk_mark_pending_as_failed([n.id for n in notifications])
+
+        assert result.updated_ids == [notifications[0].id, notifications[1].id]
+        assert result.not_updated_ids == [notifications[2].id]
+        assert dict(
+            NotificationModel.objects.values_list("id", "status").filter(id__in=result.updated_ids)
+        ) == {
+            notifications[0].id: NotificationStatus.FAILED.value,
+            notifications[1].id: NotificationStatus.PENDING_SEND.value,
+        }
+        assert NotificationModel.objects.get(id=notifications[1].id).failed_attempts == 1
+
+    def create_due_retries(self, count: int) -> list[Notification]:
+        notifications = self.create_notifications(count)
+        NotificationModel.objects.filter(id__in=[n.id for n in notifications]).update(
+            failed_attempts=1, next_attempt_at=timezone.now() - timedelta(seconds=1)
+        )
+        return notifications
+
+    def test_claim_pending_notifications_shares_batch_between_retries_and_fresh(self):
+        retries = self.create_due_retries(4)
+        fresh = self.create_notifications(4)
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=4, worker_id="worker-1"
+        )
+
+        claimed_ids = {n.id for n in claimed}
+        assert claimed_ids == {retries[0].id, retries[1].id, fresh[0].id, fresh[1].id}
+
+    def test_claim_pending_notifications_fills_batch_with_retries(self):
+        retries = self.create_due_retries(4)
+        fresh = self.create_notifications(1)
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=4, worker_id="worker-1"
+        )
+
+        assert {n.id for n in claimed} == {retries[0].id, retries[1].id, retries[2].id, fresh[0].id}
+
+    def test_claim_pending_notifications_leaves_room_for_fresh_in_single_batches(self):
+        retries = self.create_due_retries(2)
+        fresh = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend()
+
+        claimed = backend.claim_pending_notifications(batch_size=1, worker_id="worker-1")
+        assert [n.id for n in claimed] == [fresh[0].id]
+
+        claimed = backend.claim_pending_notifications(batch_size=1, worker_id="worker-1")
+        assert [n.id for n in claimed] == [fresh[1].id]
+
+        claimed = backend.claim_pending_notifications(batch_size=1, worker_id="worker-1")
+        assert [n.id for n in claimed] == [retries[0].id]
+
+    def test_claim_pending_notifications_skips_retries_not_due(self):
+        retries = self.create_due_retries(1)
+        NotificationModel.objects.filter(id=retries[0].id).update(
+            next_attempt_at=timezone.now() + timedelta(minutes=1)
+        )
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=4, worker_id="worker-1"
+        )
+
+        assert claimed == []
+
+    def age_notifications(self, notifications, status, days=60):
+        NotificationModel.objects.filter(id__in=[n.id for n in notifications]).update(
+            status=status, modified=timezone.now() - timedelta(days=days)
+        )
+
+    def test_archive_notifications(self):
+        sent, read, failed, recent, pending = self.create_notifications(5)
+        self.age_notifications([sent], NotificationStatus.SENT.value)
+        self.age_notifications([read], NotificationStatus.READ.value)
+        self.age_notifications([failed], NotificationStatus.FAILED.value)
+        self.age_notifications([recent], NotificationStatus.SENT.value, days=1)
+        self.age_notifications([pending], NotificationStatus.PENDING_SEND.value)
+        read_created = NotificationModel.objects.get(id=read.id).created
+
+        archived_per_chunk = list(
+            DjangoDbNotificationBackend().archive_notifications(
+                timezone.now() - timedelta(days=30), chunk_size=2
+            )
+        )
+
+        assert archived_per_chunk == [2, 1]
+        assert set(NotificationModel.objects.values_list("id", flat=True)) == {
+            recent.id,
+            pending.id,
+        }
+        archived = NotificationArchive.objects.get(id=read.id)
+        assert archived.status == NotificationStatus.READ.value
+        assert archived.title == read.title
+        assert archived.user_id == self.user.pk
+        assert archived.created == read_created
+
+    def test_archive_notifications_skips_recent_status_changes(self):
+        backend = DjangoDbNotificationBackend()
+        sent, failed, cancelled, bulk_sent, read = self.create_notifications(5)
+        self.age_notifications(
+            [sent, failed, cancelled, bulk_sent], NotificationStatus.PENDING_SEND.value
+        )
+        self.age_notifications([read], NotificationStatus.SENT.value)
+
+        backend.mark_pending_as_sent(sent.id)
+        backend.mark_pending_as_failed(failed.id)
+        backend.cancel_notification(cancelled.id)
+        backend.bulk_mark_pending_as_sent([bulk_sent.id])
+        backend.mark_sent_as_read(read.id)
+
+        assert list(backend.archive_notifications(timezone.now() - timedelta(days=30))) == []
+        assert NotificationModel.objects.count() == 5
+
+    def test_archive_notifications_keeps_unread_in_app_notifications(self):
+        notification = self.create_notifications(1)[0]
+        NotificationModel.objects.filter(id=notification.id).update(
+            notification_type=NotificationTypes.IN_APP.value
+        )
+        self.age_notifications([notification], NotificationStatus.SENT.value)
+
+        assert list(DjangoDbNotificationBackend().archive_notifications(timezone.now())) == []
+
+    def test_archive_notifications_rejects_pending_status(self):
+        with pytest.raises(ValueError):
+            list(
+                DjangoDbNotificationBackend().archive_notifications(
+                    timezone.now(), statuses=[NotificationStatus.PENDING_SEND.value]
+                )
+            )
+
+    def test_archive_notifications_command(self):
+        notifications = self.create_notifications(2)
+        self.age_notifications(notifications, NotificationStatus.CANCELLED.value)
+        out = StringIO()
+
+        call_command(
+            "vintasend_archive_notifications",
+            "--older-than-days",
+            "30",
+            "--status",
+            NotificationStatus.CANCELLED.value,
+            stdout=out,
+        )
+
+        assert "Archived 2 notifications" in out.getvalue()
+        assert NotificationArchive.objects.count() == 2
+
+    def test_get_notification_from_history(self):
+        notifications = self.create_notifications(2)
+        self.age_notifications(notifications[:1], NotificationStatus.READ.value)
+        backend = DjangoDbNotificationBackend()
+        list(backend.archive_notifications(timezone.now()))
+
+        archived = backend.get_notification_from_history(notifications[0].id)
+        hot = backend.get_notification_from_history(notifications[1].id)
+
+        assert archived.id == notifications[0].id
+        assert archived.status == NotificationStatus.READ.value
+        assert hot.id == notifications[1].id
+        with pytest.raises(NotificationNotFoundError):
+            backend.get_notification_from_history(notifications[1].id + 1000)
+
+    def test_get_user_notification_history_by_cursor(self):
+        notifications = self.create_notifications(5)
+        self.age_notifications(notifications[::2], NotificationStatus.SENT.value)
+        backend = DjangoDbNotificationBackend()
+        list(backend.archive_notifications(timezone.now()))
+        assert NotificationArchive.objects.count() == 3
+
+        first_page = backend.get_user_notification_history_by_cursor(self.user.pk, page_size=2)
+        second_page = backend.get_user_notification_history_by_cursor(
+            self.user.pk, page_size=2, cursor=first_page.next_cursor
+        )
+        third_page = backend.get_user_notification_history_by_cursor(
+            self.user.pk, page_size=2, cursor=second_page.next_cursor
+        )
+
+        assert [
+            n.id for page in (first_page, second_page, third_page) for n in page.notifications
+        ] == [n.id for n in notifications]
+        assert third_page.next_cursor is None
+
+    def test_purge_notifications_applies_retention_per_status(self):
+        read, old_failed, recent_failed, sent, pending = self.create_notifications(5)
+        self.age_notifications([read], NotificationStatus.READ.value, days=100)
+        self.age_notifications([old_failed], NotificationStatus.FAILED.value, days=40)
+        self.age_notifications([recent_failed], NotificationStatus.FAILED.value, days=20)
+        self.age_notifications([sent], NotificationStatus.SENT.value, days=100)
+        self.age_notifications([pending], NotificationStatus.PENDING_SEND.value, days=100)
+        retention = {
+            NotificationStatus.READ.value: timedelta(days=90),
+            NotificationStatus.FAILED.value: timedelta(days=30),
+        }
+        backend = DjangoDbNotificationBackend()
+
+        assert backend.count_purgeable_notifications(retention) == {
+            NotificationStatus.READ.value: 1,
+            NotificationStatus.FAILED.value: 1,
+        }
+        assert sum(backend.purge_notifications(retention, chunk_size=2)) == 2
+        assert set(NotificationModel.objects.values_list("id", flat=True)) == {
+            recent_failed.id,
+            sent.id,
+            pending.id,
+        }
+
+    def test_purge_notifications_deletes_by_primary_key_range(self):
+        notifications = self.create_notifications(5)
+        self.age_notifications(notifications, NotificationStatus.CANCELLED.value)
+        retention = {NotificationStatus.CANCELLED.value: timedelta(days=30)}
+
+        with self.assertNumQueries(4):
+            assert list(
+                DjangoDbNotificationBackend().purge_notifications(retention, chunk_size=2)
+            ) == [2, 2, 1]
+
+    def test_purge_notifications_only_walks_the_purgeable_range(self):
+        notifications = self.create_notifications(10)
+        self.age_notifications(notifications[-1:], NotificationStatus.READ.value)
+        retention = {NotificationStatus.READ.value: timedelta(days=30)}
+
+        # One query for the bounds, one DELETE for the single chunk they cover
+        with self.assertNumQueries(2):
+            assert list(
+                DjangoDbNotificationBackend().purge_notifications(retention, chunk_size=2)
+            ) == [1]
+
+    def test_purge_notifications_measures_retention_from_status_change(self):
+        backend = DjangoDbNotificationBackend()
+        notification = self.create_notifications(1)[0]
+        self.age_notifications([notification], NotificationStatus.SENT.value, days=100)
+
+        backend.mark_sent_as_read(notification.id)
+
+        assert sum(backend.purge_notifications({NotificationStatus.READ.value: timedelta(30)})) == 0
+        assert NotificationModel.objects.filter(id=notification.id).exists()
+
+    def test_purge_notifications_sleeps_between_chunks(self):
+        notifications = self.create_notifications(3)
+        self.age_notifications(notifications, NotificationStatus.READ.value)
+
+        with mock.patch(
+            "vintasend_django.services.notification_backends.django_db_notification_backend.time.sleep"
+        ) as sleep:
+            list(
+                DjangoDbNotificationBackend().purge_notifications(
+                    {NotificationStatus.READ.value: timedelta(days=30)},
+                    chunk_size=2,
+                    sleep_seconds=0.5,
+                )
+            )
+
+        assert sleep.call_args_list == [mock.call(0.5), mock.call(0.5)]
+
+    def test_purge_notifications_archived(self):
+        notifications = self.create_notifications(2)
+        self.age_notifications(notifications, NotificationStatus.READ.value)
+        backend = DjangoDbNotificationBackend()
+        list(backend.archive_notifications(timezone.now()))
+        NotificationArchive.objects.update(modified=timezone.now() - timedelta(days=400))
+
+        deleted = sum(
+            backend.purge_notifications(
+                {NotificationStatus.READ.value: timedelta(days=365)}, archived=True
+            )
+        )
+
+        assert deleted == 2
+        assert not NotificationArchive.objects.exists()
+
+    def test_purge_notifications_rejects_pending_status(self):
+        with pytest.raises(ValueError):
+            list(
+                DjangoDbNotificationBackend().purge_notifications(
+                    {NotificationStatus.PENDING_SEND.value: timedelta(days=30)}
+                )
+            )
+
+    def test_purge_notifications_command(self):
+        notifications = self.create_notifications(3)
+        self.age_notifications(notifications[:2], NotificationStatus.READ.value, days=100)
+        out = StringIO()
+
+        call_command(
+            "vintasend_purge_notifications", "--retention", "READ=90", "--dry-run", stdout=out
+        )
+        assert "READ: 2 notifications to delete" in out.getvalue()
+        assert NotificationModel.objects.count() == 3
+
+        call_command("vintasend_purge_notifications", "--retention", "READ=90", stdout=out)
+        assert "Deleted 2 notifications" in out.getvalue()
+        assert NotificationModel.objects.count() == 1
+
+    def test_purge_notifications_command_rejects_invalid_rules(self):
+        with pytest.raises(CommandError):
+            call_command("vintasend_purge_notifications", "--retention", "PENDING_SEND=1")
+
+    def test_store_context_used_inline(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend()
+
+        backend.store_context_used(notification.id, {"name": "test"}, "adapter")
+
+        notification_db_record = NotificationModel.objects.get(id=notification.id)
+        assert notification_db_record.context_used == {"name": "test"}
+        assert notification_db_record.context_used_digest == ""
+        assert backend.get_context_used(notification.id) == {"name": "test"}
+
+    def test_store_context_used_compact_deduplicates_contexts(self):
+        notifications = self.create_notifications(3)
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        body = "<p>" + "lorem ipsum " * 200 + "</p>"
+
+        backend.store_context_used(notifications[0].id, {"body": body, "name": "a"}, "adapter")
+        backend.store_context_used(notifications[1].id, {"name": "a", "body": body}, "adapter")
+        backend.store_context_used(notifications[2].id, {"body": body, "name": "b"}, "adapter")
+
+        assert NotificationContext.objects.count() == 2
+        assert len(NotificationContext.objects.first().data) < len(body) / 10
+        notification_db_record = NotificationModel.objects.get(id=notifications[0].id)
+        assert notification_db_record.context_used is None
+        assert notification_db_record.adapter_used == "adapter"
+        assert backend.get_context_used(notifications[1].id) == {"body": body, "name": "a"}
+        assert backend.get_context_used(notifications[2].id) == {"body": body, "name": "b"}
+
+    def test_get_context_used_from_archive(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        backend.store_context_used(notification.id, {"name": "test"}, "adapter")
+        self.age_notifications([notification], NotificationStatus.SENT.value)
+        list(backend.archive_notifications(timezone.now()))
+
+        assert backend.get_context_used(notification.id) == {"name": "test"}
+        with pytest.raises(NotificationNotFoundError):
+            backend.get_context_used(notification.id + 1000)
+
+    def test_purge_unused_contexts(self):
+        notifications = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        backend.store_context_used(notifications[0].id, {"name": "used"}, "adapter")
+        backend.store_context_used(notifications[1].id, {"name": "unused"}, "adapter")
+        unused_digest = NotificationModel.objects.get(id=notifications[1].id).context_used_digest
+        NotificationContext.objects.update(last_used=timezone.now() - timedelta(days=2))
+        backend.store_context_used(notifications[1].id, {"name": "recent"}, "adapter")
+
+        deleted = sum(backend.purge_unused_contexts(timezone.now() - timedelta(days=1)))
+
+        assert deleted == 1
+        assert not NotificationContext.objects.filter(digest=unused_digest).exists()
+        assert backend.get_context_used(notifications[0].id) == {"name": "used"}
+        assert backend.get_context_used(notifications[1].id) == {"name": "recent"}
+
+    def test_purge_unused_contexts_keeps_reused_contexts(self):
+        notifications = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        backend.store_context_used(notifications[0].id, {"name": "reused"}, "adapter")
+        NotificationContext.objects.update(last_used=timezone.now() - timedelta(days=2))
+        NotificationModel.objects.filter(id=notifications[0].id).update(context_used_digest="")
+
+        backend.store_context_used(notifications[1].id, {"name": "reused"}, "adapter")
+        NotificationModel.objects.filter(id=notifications[1].id).update(context_used_digest="")
+
+        assert sum(backend.purge_unused_contexts(timezone.now() - timedelta(days=1))) == 0
+        assert NotificationContext.objects.count() == 1
+
+    def test_purge_unused_contexts_rechecks_references_on_delete(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        backend.store_context_used(notification.id, {"name": "test"}, "adapter")
+        digest = NotificationModel.objects.get(id=notification.id).context_used_digest
+        NotificationModel.objects.update(context_used_digest="")
+        NotificationContext.objects.update(last_used=timezone.now() - timedelta(days=2))
+        raw_delete = QuerySet._raw_delete
+
+        def reference_then_delete(queryset, using):
+            # A notification starts referencing the context between the SELECT and the DELETE
+            NotificationModel.objects.update(context_used_digest=digest)
+            return raw_delete(queryset, using)
+
+        with mock.patch.object(
+            QuerySet, "_raw_delete", autospec=True, side_effect=reference_then_delete
+        ):
+            deleted = sum(backend.purge_unused_contexts(timezone.now() - timedelta(days=1)))
+
+        assert deleted == 0
+        assert backend.get_context_used(notification.id) == {"name": "test"}
+
+    def test_get_context_used_with_purged_context(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        backend.store_context_used(notification.id, {"name": "test"}, "adapter")
+        NotificationContext.objects.all().delete()
+
+        assert backend.get_context_used(notification.id) is None
+
+    async def test_astore_context_used_compact(self):
+        backend = DjangoDbNotificationBackend(compact_context_storage=True)
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+
+        await backend.astore_context_used(notification.id, {"name": "test"}, "adapter")
+
+        assert await backend.aget_context_used(notification.id) == {"name": "test"}
+        assert await NotificationContext.objects.acount() == 1
+
+    def test_claim_pending_notifications_by_id(self):
+        notifications = self.create_notifications(3)
+
+        claimed = DjangoDbNotificationBackend().claim_pending_notifications(
+            batch_size=10,
+            worker_id="worker-1",
+            notification_ids=[notifications[0].id, notifications[2].id],
+        )
+
+        assert [n.id for n in claimed] == [notifications[0].id, notifications[2].id]
+
+    def test_claim_pending_notifications_without_scheduled(self):
+        scheduled = self.create_notifications(1, send_after=timezone.now())
+        immediate = self.create_notifications(1)
+        backend = DjangoDbNotificationBackend()
+
+        claimed = backend.claim_pending_notifications(
+            batch_size=10, worker_id="worker-1", include_scheduled=False
+        )
+
+        assert [n.id for n in claimed] == [immediate[0].id]
+        assert [
+            n.id for n in backend.claim_pending_notifications(batch_size=10, worker_id="worker-1")
+        ] == [scheduled[0].id]
+
+    def test_get_scheduled_notification_keys(self):
+        now = timezone.now()
+        past = self.create_notifications(1, send_after=now - timedelta(hours=1))
+        soon = self.create_notifications(2, send_after=now + timedelta(minutes=1))
+        self.create_notifications(1, send_after=now + timedelta(days=1))
+        self.create_notifications(1)
+        backend = DjangoDbNotificationBackend()
+
+        keys = backend.get_scheduled_notification_keys(until=now + timedelta(minutes=5))
+        later_keys = backend.get_scheduled_notification_keys(
+            until=now + timedelta(minutes=5), after=now
+        )
+
+        assert keys[0] == (now - timedelta(hours=1), past[0].id)
+        assert {notification_id for _, notification_id in keys[1:]} == {
+            soon[0].id,
+            soon[1].id,
+        }
+        assert {notification_id for _, notification_id in later_keys} == {
+            soon[0].id,
+            soon[1].id,
+        }
+
+    def test_get_pending_notifications_by_cursor(self):
+        notifications = self.create_notifications(5)
+        backend = DjangoDbNotificationBackend()
+
+        first_page = backend.get_pending_notifications_by_cursor(page_size=2)
+        second_page = backend.get_pending_notifications_by_cursor(
+            page_size=2, cursor=first_page.next_cursor
+        )
+        last_page = backend.get_pending_notifications_by_cursor(
+            page_size=2, cursor=second_page.next_cursor
+        )
+
+        assert [n.id for n in first_page.notifications] == [n.id for n in notifications[:2]]
+        assert [n.id for n in second_page.notifications] == [n.id for n in notifications[2:4]]
+        assert [n.id for n in last_page.notifications] == [notifications[4].id]
+        assert last_page.next_cursor is None
+
+    def test_get_pending_notifications_by_cursor_with_same_created(self):
+        with freeze_time(timezone.now()):
+            notifications = self.create_notifications(3)
+        backend = DjangoDbNotificationBackend()
+
+        first_page = backend.get_pending_notifications_by_cursor(page_size=2)
+        second_page = backend.get_pending_notifications_by_cursor(
+            page_size=2, cursor=first_page.next_cursor
+        )
+
+        assert [n.id for n in first_page.notifications + second_page.notifications] == [
+            n.id for n in notifications
+        ]
+        assert second_page.next_cursor is None
+
+    def test_get_pending_notifications_by_cursor_invalid_cursor(self):
+        with pytest.raises(ValueError):
+            DjangoDbNotificationBackend().get_pending_notifications_by_cursor(
+                page_size=2, cursor="not-a-cursor"
+            )
+
+    def test_filter_in_app_unread_notifications_by_cursor(self):
+        notifications = self.create_notifications(3)
+        NotificationModel.objects.update(
+            status=NotificationStatus.SENT.value, notification_type=NotificationTypes.IN_APP.value
+        )
+        backend = DjangoDbNotificationBackend()
+
+        first_page = backend.filter_in_app_unread_notifications_by_cursor(self.user.pk, page_size=2)
+        second_page = backend.filter_in_app_unread_notifications_by_cursor(
+            self.user.pk, page_size=2, cursor=first_page.next_cursor
+        )
+
+        assert [n.id for n in first_page.notifications] == [n.id for n in notifications[:2]]
+        assert [n.id for n in second_page.notifications] == [notifications[2].id]
+        assert second_page.next_cursor is None
+
+    def test_update_notification_returns_converted_fields(self):
+        notification = self.create_notifications(1)[0]
+        send_after = timezone.now() + timedelta(days=1)
+
+        updated_notification = DjangoDbNotificationBackend().persist_notification_update(
+            notification_id=notification.id,
+            updated_data={"context_kwargs": {"foo": "bar"}, "send_after": send_after},
+        )
+
+        assert updated_notification.id == notification.id
+        assert updated_notification.user_id == self.user.pk
+        assert updated_notification.context_kwargs == {"foo": "bar"}
+        assert updated_notification.send_after == send_after
+
+    def test_update_notification_already_sent(self):
+        notification = self.create_notifications(1)[0]
+        DjangoDbNotificationBackend().mark_pending_as_sent(notification.id)
+
+        with pytest.raises(NotificationUpdateError):
+            DjangoDbNotificationBackend().persist_notification_update(
+                notification_id=notification.id,
+                updated_data={"subject_template": "updated test subject"},
+            )
+
+    @unittest.skipUnless(
+        DjangoDbNotificationBackend()._supports_update_returning("default"),
+        "Database doesn't support UPDATE ... RETURNING",
+    )
+    def test_status_transitions_use_a_single_query(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend()
+
+        with self.assertNumQueries(1):
+            backend.mark_pending_as_sent(notification.id)
+        with self.assertNumQueries(1):
+            notification = backend.mark_sent_as_read(notification.id)
+
+        assert notification.status == NotificationStatus.READ.value
+
+    def test_status_transitions_without_update_returning(self):
+        notification = self.create_notifications(1)[0]
+        backend = DjangoDbNotificationBackend()
+
+        with mock.patch.object(backend, "_supports_update_returning", return_value=False):
+            with self.assertNumQueries(2):
+                notification = backend.mark_pending_as_sent(notification.id)
+            with pytest.raises(NotificationUpdateError):
+                backend.mark_pending_as_failed(notification.id)
+
+        assert notification.status == NotificationStatus.SENT.value
+
+    def test_bulk_mark_pending_as_sent(self):
+        notifications = self.create_notifications(3)
+        backend = DjangoDbNotificationBackend()
+        backend.mark_pending_as_failed(notifications[2].id)
+
+        result = backend.bulk_mark_pending_as_sent([n.id for n in notifications])
+
+        assert result.updated_ids == [notifications[0].id, notifications[1].id]
+        assert result.not_updated_ids == [notifications[2].id]
+        assert list(
+            NotificationModel.objects.order_by("created").values_list("status", flat=True)
+        ) == [
+            NotificationStatus.SENT.value,
+            NotificationStatus.SENT.value,
+            NotificationStatus.FAILED.value,
+        ]
+
+    def test_bulk_mark_pending_as_failed(self):
+        notifications = self.create_notifications(2)
+
+        result = DjangoDbNotificationBackend().bulk_mark_pending_as_failed(
+            [str(n.id) for n in notifications]
+        )
+
+        assert result.updated_ids == [n.id for n in notifications]
+        assert result.not_updated_ids == []
+        assert set(NotificationModel.objects.values_list("status", flat=True)) == {
+            NotificationStatus.FAILED.value
+        }
+
+    def test_bulk_mark_sent_as_read(self):
+        notifications = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend()
+        backend.mark_pending_as_sent(notifications[0].id)
+
+        result = backend.bulk_mark_sent_as_read([n.id for n in notifications])
+
+        assert result.updated_ids == [notifications[0].id]
+        assert result.not_updated_ids == [notifications[1].id]
+        assert NotificationModel.objects.get(id=notifications[0].id).status == (
+            NotificationStatus.READ.value
+        )
+
+    def test_bulk_cancel_notifications(self):
+        notifications = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend()
+        backend.mark_pending_as_sent(notifications[1].id)
+
+        result = backend.bulk_cancel_notifications([n.id for n in notifications] + [0])
+
+        assert result.updated_ids == [notifications[0].id]
+        assert result.not_updated_ids == [notifications[1].id, 0]
+        assert NotificationModel.objects.get(id=notifications[1].id).status == (
+            NotificationStatus.SENT.value
+        )
+
+    def test_bulk_mark_pending_as_sent_without_update_returning(self):
+        notifications = self.create_notifications(2)
+        backend = DjangoDbNotificationBackend()
+        backend.mark_pending_as_sent(notifications[1].id)
+
+        with mock.patch.object(backend, "_supports_update_returning", return_value=False):
+            result = backend.bulk_mark_pending_as_sent([n.id for n in notifications])
+
+        assert result.updated_ids == [notifications[0].id]
+        assert result.not_updated_ids == [notifications[1].id]
+
+    @unittest.skipUnless(
+        DjangoDbNotificationBackend()._supports_update_returning("default"),
+        "Database doesn't support UPDATE ... RETURNING",
+    )
+    def test_bulk_status_transitions_use_a_single_query(self):
+        notifications = self.create_notifications(20)
+
+        with self.assertNumQueries(1):
+            DjangoDbNotificationBackend().bulk_mark_pending_as_sent([n.id for n in notifications])
+
+    def test_persist_notifications_bulk(self):
+        other_user = self.create_user()
+        specs = (
+            {
+                "user_id": user.pk,
+                "notification_type": NotificationTypes.EMAIL.value,
+                "title": f"test {i}",
+                "body_template": "test",
+                "context_name": "test",
+                "context_kwargs": {"index": i},
+                "send_after": None,
+                "subject_template": "test",
+            }
+            for i, user in enumerate([self.user, other_user, self.user])
+        )
+
+        notifications = list(
+            DjangoDbNotificationBackend().persist_notifications_bulk(specs, chunk_size=2)
+        )
+
+        assert [n.title for n in notifications] == ["test 0", "test 1", "test 2"]
+        assert [n.user_id for n in notifications] == [self.user.pk, other_user.pk, self.user.pk]
+        assert all(n.id is not None for n in notifications)
+        assert all(n.status == NotificationStatus.PENDING_SEND.value for n in notifications)
+        assert notifications[1].preheader_template == ""
+        notification_db_record = NotificationModel.objects.get(id=notifications[2].id)
+        assert notification_db_record.context_kwargs == {"index": 2}
+
+    def test_serialized_fields_follow_notification_positional_fields(self):
+        positional_fields = [
+            field.name
+            for field in dataclasses.fields(Notification)
+            if field.default is dataclasses.MISSING
+        ]
+
+        assert list(SERIALIZED_FIELDS) == positional_fields
+
+    def test_serialize_notification_row_matches_serialize_notification(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(2, send_after=timezone.now())
+
+        assert list(backend.get_all_pending_notifications()) == [
+            backend.serialize_notification(n) for n in NotificationModel.objects.order_by("created")
+        ]
+
+    def test_keyset_pages_match_serialize_notification(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(3)
+
+        first_page = backend.get_pending_notifications_by_cursor(page_size=2)
+        second_page = backend.get_pending_notifications_by_cursor(
+            page_size=2, cursor=first_page.next_cursor
+        )
+
+        assert [*first_page.notifications, *second_page.notifications] == [
+            backend.serialize_notification(n) for n in NotificationModel.objects.order_by("created")
+        ]
+
+    @pytest.mark.benchmark
+    def test_serialize_notification_queryset_overhead(self):
+        """
+        Benchmark over 10k rows carrying a sent context: fetching only the serialized columns
+        with `values_list()` must be faster and allocate less than instantiating the models and
+        serializing them, as list queries used to do.
+        """
+        backend = DjangoDbNotificationBackend()
+        specs = (
+            {
+                "user_id": self.user.pk,
+                "notification_type": NotificationTypes.EMAIL.value,
+                "title": f"test {i}",
+                "body_template": "test",
+                "context_name": "test",
+                "context_kwargs": {"index": i},
+                "send_after": None,
+                "adapter_extra_parameters": {"headers": {"X-Index": str(i)}},
+            }
+            for i in range(10_000)
+        )
+        for _ in backend.persist_notifications_bulk(specs):
+            pass
+        NotificationModel.objects.update(context_used={"items": [{"name": "x" * 40}] * 20})
+        queryset = NotificationModel.objects.order_by("created")
+
+        def serialize_instances():
+            return [backend.serialize_notification(n) for n in queryset.iterator()]
+
+        def serialize_values():
+            return list(backend._serialize_notification_queryset(queryset))
+
+        def measure(serialize):
+            tracemalloc.start()
+            try:
+                started = time.perf_counter()
+                notifications = serialize()
+                elapsed = time.perf_counter() - started
+                peak = tracemalloc.get_traced_memory()[1]
+            finally:
+                tracemalloc.stop()
+            assert len(notifications) == 10_000
+            return elapsed, peak
+
+        instances_times, instances_peaks = zip(
+            *(measure(serialize_instances) for _ in range(3)), strict=True
+        )
+        values_times, values_peaks = zip(
+            *(measure(serialize_values) for _ in range(3)), strict=True
+        )
+        instances_time, instances_peak = min(instances_times), min(instances_peaks)
+        values_time, values_peak = min(values_times), min(values_peaks)
+
+        assert values_time < instances_time, (values_time, instances_time)
+        assert values_peak < instances_peak, (values_peak, instances_peak)
+
+    @pytest.mark.benchmark
+    def test_serialize_notification_row_throughput(self):
+        """
+        Benchmark over 10k rows: reading `values_list()` tuples straight into `Notification`
+        objects must serialize more rows per second than model instances end to end, and than
+        `values()` dicts looked up by column name once the rows are fetched.
+        """
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(10_000)
+        queryset = NotificationModel.objects.order_by("created")
+        tuples = list(queryset.values_list(*SERIALIZED_FIELDS))
+        dicts = list(queryset.values(*SERIALIZED_FIELDS))
+
+        def rows_per_second(serialize):
+            return 10_000 / min(timeit.repeat(serialize, number=1, repeat=5))
+
+        instances_rate = rows_per_second(
+            lambda: [backend.serialize_notification(n) for n in queryset.iterator()]
+        )
+        queryset_rate = rows_per_second(
+            lambda: list(backend._serialize_notification_queryset(queryset))
+        )
+        dicts_rate = rows_per_second(
+            lambda: [
+                Notification(**{field: row[field] for field in SERIALIZED_FIELDS}) for row in dicts
+            ]
+        )
+        tuples_rate = rows_per_second(
+            lambda: [backend.serialize_notification_row(row) for row in tuples]
+        )
+
+        assert queryset_rate > instances_rate, (queryset_rate, instances_rate)
+        assert tuples_rate > dicts_rate, (tuples_rate, dicts_rate)
+
+    def test_persist_notifications_bulk_consumes_input_lazily(self):
+        consumed = []
+
+        def specs():
+            for i in range(4):
+                consumed.append(i)
+                yield {
+                    "user_id": self.user.pk,
+                    "notification_type": NotificationTypes.EMAIL.value,
+                    "title": f"test {i}",
+                    "body_template": "test",
+                    "context_name": "test",
+                    "context_kwargs": {},
+                    "send_after": None,
+                }
+
+        notifications = DjangoDbNotificationBackend().persist_notifications_bulk(
+            specs(), chunk_size=2
+        )
+        next(notifications)
+
+        assert consumed == [0, 1]
+        assert NotificationModel.objects.count() == 2
+        assert len(list(notifications)) == 3
+        assert NotificationModel.objects.count() == 4
+
+    def test_attach_recipients(self):
+        inactive_user = self.create_user(email="inactive@example.com", is_active=False)
+        backend = DjangoDbNotificationBackend()
+        notifications = [
+            *self.create_notifications(2),
+            backend.persist_notification(
+                user_id=inactive_user.pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title="test",
+                body_template="test",
+                context_name="test",
+                context_kwargs={},
+                send_after=None,
+            ),
+        ]
+
+        with self.assertNumQueries(1):
+            notifications_with_recipient = backend.attach_recipients(notifications)
+
+        assert [n.id for n in notifications_with_recipient] == [n.id for n in notifications]
+        assert [n.recipient_email for n in notifications_with_recipient] == [
+            "user@example.com",
+            "user@example.com",
+            "inactive@example.com",
+        ]
+        assert [n.recipient_is_active for n in notifications_with_recipient] == [
+            True,
+            True,
+            False,
+        ]
+
+    def test_get_pending_notification_templates(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(2)
+        sent = backend.persist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="sent_body.html",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+        backend.mark_pending_as_sent(sent.id)
+        backend.persist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="other_body.html",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+
+        assert backend.get_pending_notification_templates() == {"test", "other_body.html"}
+
+    async def test_apersist_notification(self):
+        backend = DjangoDbNotificationBackend()
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+            subject_template="test",
+            preheader_template="test",
+        )
+
+        assert isinstance(notification, Notification)
+        assert notification.user_id == self.user.pk
+        assert notification.status == NotificationStatus.PENDING_SEND.value
+        notification_db_record = await NotificationModel.objects.aget(id=notification.id)
+        assert notification_db_record.title == "test"
+
+    async def test_async_status_transitions(self):
+        backend = DjangoDbNotificationBackend()
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+
+        notification = await backend.apersist_notification_update(
+            notification.id, {"title": "updated"}
+        )
+        assert notification.title == "updated"
+        notification = await backend.amark_pending_as_sent(notification.id)
+        assert notification.status == NotificationStatus.SENT.value
+        notification = await backend.amark_sent_as_read(notification.id)
+        assert notification.status == NotificationStatus.READ.value
+        with pytest.raises(NotificationUpdateError):
+            await backend.amark_pending_as_failed(notification.id)
+        with pytest.raises(NotificationCancelError):
+            await backend.acancel_notification(notification.id)
+
+    async def test_aget_notification(self):
+        backend = DjangoDbNotificationBackend()
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+
+        notification_retrieved = await backend.aget_notification(notification.id)
+        assert notification_retrieved == notification
+
+        await backend.acancel_notification(notification.id)
+        with pytest.raises(NotificationNotFoundError):
+            await backend.aget_notification(notification.id)
+
+    async def test_async_listings(self):
+        backend = DjangoDbNotificationBackend()
+        pending = [
+            await backend.apersist_notification(
+                user_id=self.user.pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title=f"test {i}",
+                body_template="test",
+                context_name="test",
+                context_kwargs={},
+                send_after=None,
+            )
+            for i in range(2)
+        ]
+        future = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="future",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=timezone.now() + timedelta(days=1),
+        )
+
+        assert [n.id async for n in backend.aget_all_pending_notifications()] == [
+            n.id for n in pending
+        ]
+        assert [n.id for n in await backend.aget_pending_notifications(page=2, page_size=1)] == [
+            pending[1].id
+        ]
+        assert [n.id async for n in backend.aget_all_future_notifications()] == [future.id]
+        assert [n.id for n in await backend.aget_future_notifications(page=1, page_size=10)] == [
+            future.id
+        ]
+        assert [
+            n.id async for n in backend.aget_all_future_notifications_from_user(self.user.pk)
+        ] == [future.id]
+        assert [
+            n.id
+            for n in await backend.aget_future_notifications_from_user(
+                self.user.pk, page=1, page_size=10
+            )
+        ] == [future.id]
+
+    async def test_async_in_app_unread_listings(self):
+        backend = DjangoDbNotificationBackend()
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.IN_APP.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+        await backend.amark_pending_as_sent(notification.id)
+
+        assert [
+            n.id async for n in backend.afilter_all_in_app_unread_notifications(self.user.pk)
+        ] == [notification.id]
+        assert [n.id for n in await backend.afilter_in_app_unread_notifications(self.user.pk)] == [
+            notification.id
+        ]
+
+    async def test_async_claim_and_recipients(self):
+        backend = DjangoDbNotificationBackend()
+        notification = await backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+
+        claimed = await backend.aclaim_pending_notifications(batch_size=10, worker_id="worker-1")
+        notifications_with_recipient = await backend.aattach_recipients(claimed)
+
+        assert [n.id for n in claimed] == [notification.id]
+        assert notifications_with_recipient[0].recipient_email == "user@example.com"
+        assert await backend.aget_user_email_from_notification(notification.id) == (
+            "user@example.com"
+        )
+
+        await backend.astore_context_used(notification.id, {"foo": "bar"}, "adapter")
+        notification_db_record = await NotificationModel.objects.aget(id=notification.id)
+        assert notification_db_record.context_used == {"foo": "bar"}
+        assert notification_db_record.adapter_used == "adapter"
+
+    async def test_async_claim_by_id_without_scheduled(self):
+        backend = DjangoDbNotificationBackend()
+        notifications = [
+            await backend.apersist_notification(
+                user_id=self.user.pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title="test",
+                body_template="test",
+                context_name="test",
+                context_kwargs={},
+                send_after=send_after,
+            )
+            for send_after in (None, None, timezone.now() - timedelta(minutes=1))
+        ]
+
+        claimed = await backend.aclaim_pending_notifications(
+            batch_size=10,
+            worker_id="worker-1",
+            notification_ids=[notifications[1].id, notifications[2].id],
+            include_scheduled=False,
+        )
+
+        assert [n.id for n in claimed] == [notifications[1].id]
+
+
+class DjangoDBNotificationBackendQueryCountTestCase(VintaSendDjangoTestCase):
+    """
+    Every read method must run a constant number of queries, no matter how many rows it returns.
+    Each notification belongs to a different user, so any per-row user lookup shows up here.
+    """
+
+    def assert_constant_queries(self, num_queries: int, method, *args, **kwargs) -> None:
+        with self.assertNumQueries(num_queries):
+            list(method(*args, **kwargs))
+
+    def test_get_all_pending_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(1, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_all_pending_notifications)
+        self.create_notifications(20, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_all_pending_notifications)
+
+    def test_get_pending_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(1, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_pending_notifications, page=1, page_size=50)
+        self.create_notifications(20, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_pending_notifications, page=1, page_size=50)
+
+    def test_get_all_future_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        send_after = timezone.now() + timedelta(days=1)
+        self.create_notifications(1, send_after=send_after, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_all_future_notifications)
+        self.create_notifications(20, send_after=send_after, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_all_future_notifications)
+
+    def test_get_future_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        send_after = timezone.now() + timedelta(days=1)
+        self.create_notifications(1, send_after=send_after, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_future_notifications, page=1, page_size=50)
+        self.create_notifications(20, send_after=send_after, user=self.create_user)
+        self.assert_constant_queries(1, backend.get_future_notifications, page=1, page_size=50)
+
+    def test_get_all_future_notifications_from_user(self):
+        backend = DjangoDbNotificationBackend()
+        send_after = timezone.now() + timedelta(days=1)
+        self.create_notifications(1, send_after=send_after)
+        self.assert_constant_queries(
+            1, backend.get_all_future_notifications_from_user, self.user.pk
+        )
+        self.create_notifications(20, send_after=send_after)
+        self.assert_constant_queries(
+            1, backend.get_all_future_notifications_from_user, self.user.pk
+        )
+
+    def test_get_future_notifications_from_user(self):
+        backend = DjangoDbNotificationBackend()
+        send_after = timezone.now() + timedelta(days=1)
+        self.create_notifications(1, send_after=send_after)
+        self.assert_constant_queries(
+            1, backend.get_future_notifications_from_user, self.user.pk, page=1, page_size=50
+        )
+        self.create_notifications(20, send_after=send_after)
+        self.assert_constant_queries(
+            1, backend.get_future_notifications_from_user, self.user.pk, page=1, page_size=50
+        )
+
+    def test_filter_all_in_app_unread_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        kwargs = {
+            "notification_type": NotificationTypes.IN_APP.value,
+            "status": NotificationStatus.SENT.value,
+        }
+        self.create_notifications(1, **kwargs)
+        self.assert_constant_queries(
+            1, backend.filter_all_in_app_unread_notifications, self.user.pk
+        )
+        self.create_notifications(20, **kwargs)
+        self.assert_constant_queries(
+            1, backend.filter_all_in_app_unread_notifications, self.user.pk
+        )
+
+    def test_filter_in_app_unread_notifications(self):
+        backend = DjangoDbNotificationBackend()
+        kwargs = {
+            "notification_type": NotificationTypes.IN_APP.value,
+            "status": NotificationStatus.SENT.value,
+        }
+        self.create_notifications(1, **kwargs)
+        self.assert_constant_queries(
+            1, backend.filter_in_app_unread_notifications, self.user.pk, page=1, page_size=50
+        )
+        self.create_notifications(20, **kwargs)
+        self.assert_constant_queries(
+            1, backend.filter_in_app_unread_notifications, self.user.pk, page=1, page_size=50
+        )
+
+    def assert_constant_queries_by_cursor(self, method, *args, **kwargs) -> None:
+        page = method(*args, page_size=5, **kwargs)
+        assert page.next_cursor is not None
+        with self.assertNumQueries(1):
+            method(*args, page_size=5, cursor=page.next_cursor, **kwargs)
+
+    def test_get_pending_notifications_by_cursor(self):
+        self.create_notifications(20, user=self.create_user)
+        self.assert_constant_queries_by_cursor(
+            DjangoDbNotificationBackend().get_pending_notifications_by_cursor
+        )
+
+    def test_get_future_notifications_by_cursor(self):
+        self.create_notifications(
+            20, send_after=timezone.now() + timedelta(days=1), user=self.create_user
+        )
+        self.assert_constant_queries_by_cursor(
+            DjangoDbNotificationBackend().get_future_notifications_by_cursor
+        )
+
+    def test_get_future_notifications_from_user_by_cursor(self):
+        send_after = timezone.now() + timedelta(days=1)
+        self.create_notifications(20, send_after=send_after)
+        self.assert_constant_queries_by_cursor(
+            DjangoDbNotificationBackend().get_future_notifications_from_user_by_cursor,
+            self.user.pk,
+        )
+
+    def test_filter_in_app_unread_notifications_by_cursor(self):
+        self.create_notifications(
+            20,
+            notification_type=NotificationTypes.IN_APP.value,
+            status=NotificationStatus.SENT.value,
+        )
+        self.assert_constant_queries_by_cursor(
+            DjangoDbNotificationBackend().filter_in_app_unread_notifications_by_cursor,
+            self.user.pk,
+        )
+
+    def test_list_queries_only_select_serialized_columns(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(2)
+        self.create_notifications(
+            2,
+            notification_type=NotificationTypes.IN_APP.value,
+            status=NotificationStatus.SENT.value,
+        )
+        list_methods = [
+            (backend.get_all_pending_notifications, ()),
+            (backend.get_pending_notifications_by_cursor, (10,)),
+            (backend.filter_all_in_app_unread_notifications, (self.user.pk,)),
+            (backend.get_user_notification_history_by_cursor, (self.user.pk,)),
+            (backend.claim_pending_notifications, (10, "worker-1")),
+        ]
+
+        for method, args in list_methods:
+            with CaptureQueriesContext(connection) as queries:
+                result = method(*args)
+                list(getattr(result, "notifications", result))
+            select_sql = " ".join(
+                q["sql"] for q in queries.captured_queries if q["sql"].startswith("SELECT")
+            )
+            assert "context_used" not in select_sql, method.__name__
+            assert "adapter_extra_parameters" not in select_sql, method.__name__
+
+    def test_get_notification(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(1, user=self.create_user)
+        notification_id = NotificationModel.objects.get().pk
+        with self.assertNumQueries(1):
+            backend.get_notification(notification_id)
+
+    def test_get_user_email_from_notification(self):
+        backend = DjangoDbNotificationBackend()
+        self.create_notifications(1, user=self.create_user)
+        notification_id = NotificationModel.objects.get().pk
+        with self.assertNumQueries(1):
+            backend.get_user_email_from_notification(notification_id)
+
+
+class DjangoDBNotificationBackendUnreadCountTestCase(VintaSendDjangoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = DjangoDbNotificationBackend()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_count_in_app_unread_notifications(self):
+        first, second, pending = self.create_notifications(
+            3, notification_type=NotificationTypes.IN_APP.value
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.mark_pending_as_sent(first.id)
+            self.backend.mark_pending_as_sent(second.id)
+
+        with self.assertNumQueries(1):
+            assert self.backend.count_in_app_unread_notifications(self.user.pk) == 2
+        with self.assertNumQueries(0):
+            assert self.backend.count_in_app_unread_notifications(str(self.user.pk)) == 2
+
+    def test_count_in_app_unread_notifications_is_invalidated_on_sent_and_read(self):
+        first, second = self.create_notifications(
+            2, notification_type=NotificationTypes.IN_APP.value
+        )
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.mark_pending_as_sent(first.id)
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 1
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.bulk_mark_pending_as_sent([second.id])
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 2
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.mark_sent_as_read(first.id)
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 1
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.bulk_mark_sent_as_read([second.id])
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+    def test_count_in_app_unread_notifications_ignores_other_types(self):
+        notification = self.backend.persist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.EMAIL.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.backend.mark_pending_as_sent(notification.id)
+
+        assert callbacks == []
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+    def test_count_in_app_unread_for_users(self):
+        other_user = self.create_user()
+        user_without_notifications = self.create_user()
+        notifications = [
+            *self.create_notifications(2, notification_type=NotificationTypes.IN_APP.value),
+            *self.create_notifications(
+                1, user=other_user, notification_type=NotificationTypes.IN_APP.value
+            ),
+        ]
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.bulk_mark_pending_as_sent([n.id for n in notifications])
+        self.backend.count_in_app_unread_notifications(self.user.pk)
+
+        user_ids = [self.user.pk, other_user.pk, user_without_notifications.pk]
+        # Only the users missing from the cache are counted, with a single query
+        with self.assertNumQueries(1):
+            counts = self.backend.count_in_app_unread_for_users(user_ids)
+        with self.assertNumQueries(0):
+            assert self.backend.count_in_app_unread_for_users(user_ids) == counts
+
+        assert counts == {self.user.pk: 2, other_user.pk: 1, user_without_notifications.pk: 0}
+
+    def test_purge_notifications_invalidates_unread_counts(self):
+        (notification,) = self.create_notifications(
+            1, notification_type=NotificationTypes.IN_APP.value
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            self.backend.mark_pending_as_sent(notification.id)
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 1
+        NotificationModel.objects.update(modified=timezone.now() - timedelta(days=60))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            list(self.backend.purge_notifications({NotificationStatus.SENT.value: timedelta(30)}))
+
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+    def test_count_racing_with_invalidation_is_not_served(self):
+        (notification,) = self.create_notifications(
+            1, notification_type=NotificationTypes.IN_APP.value
+        )
+        cache_set_many = cache.set_many
+
+        def send_then_set_many(*args, **kwargs):
+            # The notification is sent after the count was read but before it's cached
+            with self.captureOnCommitCallbacks(execute=True):
+                self.backend.mark_pending_as_sent(notification.id)
+            return cache_set_many(*args, **kwargs)
+
+        with mock.patch.object(cache, "set_many", side_effect=send_then_set_many):
+            assert self.backend.count_in_app_unread_notifications(self.user.pk) == 0
+
+        assert self.backend.count_in_app_unread_notifications(self.user.pk) == 1
+
+    async def test_acount_in_app_unread_notifications(self):
+        notification = await self.backend.apersist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.IN_APP.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+        await self.backend.amark_pending_as_sent(notification.id)
+
+        assert await self.backend.acount_in_app_unread_notifications(self.user.pk) == 1
+        assert await self.backend.acount_in_app_unread_for_users([self.user.pk]) == {
+            self.user.pk: 1
+        }
+
+
+class DjangoDBNotificationBackendUnreadCountTransactionTestCase(VintaSendDjangoTransactionTestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_purge_notifications_invalidates_unread_counts_after_delete(self):
+        backend = DjangoDbNotificationBackend()
+        notification = backend.persist_notification(
+            user_id=self.user.pk,
+            notification_type=NotificationTypes.IN_APP.value,
+            title="test",
+            body_template="test",
+            context_name="test",
+            context_kwargs={},
+            send_after=None,
+        )
+        backend.mark_pending_as_sent(notification.id)
+        NotificationModel.objects.update(modified=timezone.now() - timedelta(days=60))
+        rows_left_on_invalidation = []
+
+        def record_rows_left(version_keys):
+            rows_left_on_invalidation.append(NotificationModel.objects.count())
+
+        with mock.patch.object(
+            backend, "_bump_unread_count_versions", side_effect=record_rows_left
+        ):
+            list(backend.purge_notifications({NotificationStatus.SENT.value: timedelta(30)}))
+
+        assert rows_left_on_invalidation == [0]
+
+
+class DjangoDBNotificationBackendClaimTransactionTestCase(VintaSendDjangoTransactionTestCase):
+    def test_concurrent_claims_take_disjoint_leases(self):
+        backend = DjangoDbNotificationBackend()
+        notifications = [
+            backend.persist_notification(
+                user_id=self.user.pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title=f"test {i}",
+                body_template="test",
+                context_name="test",
+                context_kwargs={},
+                send_after=None,
+                subject_template="test",
+                preheader_template="test",
+            )
+            for i in range(40)
+        ]
+        barrier = threading.Barrier(2)
+        claimed_ids: dict[str, list] = {"worker-1": [], "worker-2": []}
+        errors = []
+
+        def claim(worker_id):
+            try:
+                barrier.wait()
+                while claimed := backend.claim_pending_notifications(
+                    batch_size=3, worker_id=worker_id
+                ):
+                    claimed_ids[worker_id] += [notification.id for notification in claimed]
+            except Exception as e:  # noqa: BLE001
+                errors.append(e)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=claim, args=(worker_id,)) for worker_id in claimed_ids]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        all_claimed_ids = claimed_ids["worker-1"] + claimed_ids["worker-2"]
+        assert sorted(all_claimed_ids) == sorted(n.id for n in notifications)
+
+
+class RetryPolicyTestCase(unittest.TestCase):
+    def test_get_delay_grows_exponentially_with_jitter(self):
+        retry_policy = RetryPolicy(base_delay=10, multiplier=3, max_delay=1000)
+
+        for failed_attempts, delay in [(1, 10), (2, 30), (3, 90)]:
+            assert (
+                timedelta(seconds=delay / 2)
+                <= retry_policy.get_delay(failed_attempts)
+                <= timedelta(seconds=delay)
+            )
+
+    def test_get_delay_is_capped(self):
+        retry_policy = RetryPolicy(base_delay=10, max_delay=100)
+
+        assert retry_policy.get_delay(1000) <= timedelta(seconds=100)
+
+
+@unittest.skipUnless(connection.vendor == "sqlite", "Query plan assertions target SQLite")
+class DjangoDBNotificationBackendQueryPlanTestCase(VintaSendDjangoTestCase):
+    """
+    Lock in that the backend's hot queries are served by the indexes declared on the model.
+    """
+
+    def assert_uses_index(self, queryset, index_name: str) -> None:
+        plan = queryset.explain()
+        assert f"USING INDEX {index_name}" in plan, plan
+        assert "TEMP B-TREE" not in plan, plan
+
+    def explain_without_index(self, queryset, index_name: str) -> str:
+        # The test transaction is rolled back afterwards, which restores the index
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP INDEX {connection.ops.quote_name(index_name)}")
+        return queryset.explain()
+
+    def test_pending_notifications_query_uses_pending_index(self):
+        queryset = DjangoDbNotificationBackend()._get_all_pending_notifications_queryset()
+
+        self.assert_uses_index(queryset, "notification_pending_idx")
+        # Without it, every notification is scanned through the `created` index
+        plan = self.explain_without_index(queryset, "notification_pending_idx")
+        assert "SCAN vintasend_django_notification USING INDEX" in plan, plan
+        assert "notification_pending_idx" not in plan, plan
+
+    def test_immediate_notifications_query_uses_immediate_index(self):
+        self.assert_uses_index(
+            DjangoDbNotificationBackend()
+            ._get_all_pending_notifications_queryset()
+            .filter(send_after__isnull=True),
+            "notification_immediate_idx",
+        )
+
+    def test_scheduled_notifications_query_uses_scheduled_index(self):
+        now = timezone.now()
+        self.assert_uses_index(
+            DjangoDbNotificationBackend()._get_scheduled_notifications_queryset(
+                until=now + timedelta(minutes=5), after=now
+            ),
+            "notification_scheduled_idx",
+        )
+
+    def test_retries_query_uses_retry_index(self):
+        self.assert_uses_index(
+            DjangoDbNotificationBackend()
+            ._get_all_pending_notifications_queryset()
+            .filter(next_attempt_at__isnull=False)
+            .order_by("next_attempt_at"),
+            "notification_retry_idx",
+        )
+
+    def test_future_notifications_query_uses_scheduled_index_range(self):
+        queryset = DjangoDbNotificationBackend()._get_all_future_notifications_queryset()
+
+        self.assert_uses_index(queryset, "notification_scheduled_idx")
+        assert "(send_after>?)" in queryset.explain()
+
+    def test_in_app_unread_notifications_query_uses_user_status_index(self):
+        queryset = DjangoDbNotificationBackend()._get_all_in_app_unread_notifications_queryset(
+            self.user.pk
+        )
+
+        self.assert_uses_index(queryset, "notification_user_status_idx")
+        # Without it, the user's notifications are sorted in a temporary B-tree
+        plan = self.explain_without_index(queryset, "notification_user_status_idx")
+        assert "USE TEMP B-TREE FOR ORDER BY" in plan, plan
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "Query plan assertions target PostgreSQL")
+class DjangoDBNotificationBackendPostgresQueryPlanTestCase(VintaSendDjangoTestCase):
+    def setUp(self):
+        super().setUp()
+        # Test tables are tiny, so keep the planner from preferring sequential scans
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+
+    def test_future_notifications_query_uses_scheduled_index_range(self):
+        plan = DjangoDbNotificationBackend()._get_all_future_notifications_queryset().explain()
+
+        assert "notification_scheduled_idx" in plan, plan
+        assert "Index Cond: (send_after >" in plan, plan
+        assert "Sort" not in plan, plan
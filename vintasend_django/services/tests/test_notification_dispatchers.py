@@ -0,0 +1,173 @@
+import threading
+import time
+from unittest import mock
+
+import pytest
+
+from django.core import mail
+
+from vintasend.constants import NotificationStatus, NotificationTypes
+from vintasend.services.notification_service import NotificationService, register_context
+from vintasend_django.models import Notification as NotificationModel
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+from vintasend_django.services.notification_dispatchers.thread_pool_dispatcher import (
+    ThreadPoolNotificationDispatcher,
+)
+from vintasend_django.test_helpers import VintaSendDjangoTransactionTestCase
+
+
+@register_context("dispatcher_test_context")
+def dispatcher_test_context(fail: bool = False):
+    if fail:
+        raise ValueError("Context failure")
+    return {
+        "test_subject": "dispatcher_subject",
+        "test_preheader": "dispatcher_preheader",
+        "test_body": "dispatcher_body",
+    }
+
+
+NOTIFICATION_KWARGS = {
+    "body_template": "vintasend_django/emails/test/test_templated_email_body.html",
+    "subject_template": "vintasend_django/emails/test/test_templated_email_subject.txt",
+    "preheader_template": "vintasend_django/emails/test/test_templated_email_preheader.html",
+    "context_name": "dispatcher_test_context",
+}
+
+
+class ThreadPoolNotificationDispatcherTestCase(VintaSendDjangoTransactionTestCase):
+    def tearDown(self) -> None:
+        mail.outbox = []
+        return super().tearDown()
+
+    def create_notification_service(self):
+        return NotificationService(
+            notification_adapters=[
+                (
+                    "vintasend_django.services.notification_adapters.django_email.DjangoEmailNotificationAdapter",
+                    "vintasend_django.services.notification_template_renderers.django_templated_email_renderer.DjangoTemplatedEmailRenderer",
+                )
+            ],
+            notification_backend=DjangoDbNotificationBackend(),
+        )
+
+    def create_notifications(self, count: int, context_kwargs: dict | None = None):
+        return [
+            DjangoDbNotificationBackend().persist_notification(
+                user_id=self.create_user(email=f"user{i}@example.com").pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title=f"test {i}",
+                body_template="vintasend_django/emails/test/test_templated_email_body.html",
+                context_name="dispatcher_test_context",
+                context_kwargs=context_kwargs or {},
+                send_after=None,
+                subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+                preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+            )
+            for i in range(count)
+        ]
+
+    def test_dispatch_pending_batch(self):
+        notifications = self.create_notifications(5, user=self.create_user, **NOTIFICATION_KWARGS)
+
+        with ThreadPoolNotificationDispatcher(
+            self.create_notification_service(), max_workers=3
+        ) as dispatcher:
+            results = dispatcher.dispatch_pending_batch(batch_size=10)
+
+        assert [r.notification.id for r in results] == [n.id for n in notifications]
+        assert all(r.sent for r in results)
+        assert sorted(email.to[0] for email in mail.outbox) == sorted(
+            f"user{i}@example.com" for i in range(5)
+        )
+        assert set(NotificationModel.objects.values_list("status", flat=True)) == {
+            NotificationStatus.SENT.value
+        }
+        notification_db_record = NotificationModel.objects.get(id=notifications[0].id)
+        assert notification_db_record.context_used["test_body"] == "dispatcher_body"
+        assert notification_db_record.adapter_used.endswith("DjangoEmailNotificationAdapter")
+
+    def test_dispatch_reports_failures(self):
+        sent = self.create_notifications(1, user=self.create_user, **NOTIFICATION_KWARGS)
+        failed = self.create_notifications(
+            1, context_kwargs={"fail": True}, user=self.create_user, **NOTIFICATION_KWARGS
+        )
+
+        with ThreadPoolNotificationDispatcher(self.create_notification_service()) as dispatcher:
+            results = dispatcher.dispatch_pending_batch(batch_size=10)
+
+        assert [r.sent for r in results] == [True, False]
+        assert NotificationModel.objects.get(id=sent[0].id).status == (
+            NotificationStatus.SENT.value
+        )
+        assert NotificationModel.objects.get(id=failed[0].id).status == (
+            NotificationStatus.FAILED.value
+        )
+
+    def test_dispatch_applies_backpressure(self):
+        notifications = self.create_notifications(6, user=self.create_user, **NOTIFICATION_KWARGS)
+        dispatcher = ThreadPoolNotificationDispatcher(
+            self.create_notification_service(), max_workers=2, max_in_flight=2
+        )
+        original_send_one = dispatcher._send_one
+        lock = threading.Lock()
+        consumed = 0
+        completed = 0
+        max_queued = 0
+
+        def slow_send_one(notification):
+            nonlocal completed
+            time.sleep(0.01)
+            result = original_send_one(notification)
+            with lock:
+                completed += 1
+            return result
+
+        def lazy_notifications():
+            nonlocal consumed, max_queued
+            for notification in notifications:
+                with lock:
+                    consumed += 1
+                    max_queued = max(max_queued, consumed - completed)
+                yield notification
+
+        with (
+            mock.patch.object(dispatcher, "_send_one", slow_send_one),
+            dispatcher,
+        ):
+            results = dispatcher.dispatch(lazy_notifications())
+
+        assert [r.notification.id for r in results] == [n.id for n in notifications]
+        assert all(r.sent for r in results)
+        # The window holds 2 notifications, plus the one pulled while waiting for a slot
+        assert max_queued <= 3
+
+    def test_dispatch_leaves_notifications_queued_by_async_adapters_pending(self):
+        notification = self.create_notifications(1, user=self.create_user, **NOTIFICATION_KWARGS)[0]
+        service = NotificationService(
+            notification_adapters=[
+                (
+                    "vintasend.services.notification_adapters.stubs.fake_adapter.FakeAsyncEmailAdapter",
+                    "vintasend_django.services.notification_template_renderers.django_templated_email_renderer.DjangoTemplatedEmailRenderer",
+                )
+            ],
+            notification_backend=DjangoDbNotificationBackend(),
+        )
+
+        with ThreadPoolNotificationDispatcher(service) as dispatcher:
+            results = dispatcher.dispatch_pending_batch(batch_size=10)
+
+        assert [r.sent for r in results] == [True]
+        notification_db_record = NotificationModel.objects.get(id=notification.id)
+        assert notification_db_record.status == NotificationStatus.PENDING_SEND.value
+        assert notification_db_record.context_used is None
+
+    def test_dispatcher_requires_django_backend(self):
+        service = NotificationService(
+            notification_adapters=[],
+            notification_backend="vintasend.services.notification_backends.stubs.fake_backend.FakeFileBackend",
+        )
+        with pytest.raises(ValueError):
+            ThreadPoolNotificationDispatcher(service)
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+from vintasend_django.services.notification_scheduler import NotificationScheduler
+from vintasend_django.test_helpers import VintaSendDjangoTestCase
+
+
+class NotificationSchedulerTestCase(VintaSendDjangoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.backend = DjangoDbNotificationBackend()
+        self.now = timezone.now()
+
+    def test_pop_due_releases_notifications_when_due(self):
+        first = self.create_notifications(1, send_after=self.now + timedelta(seconds=10))[0]
+        second = self.create_notifications(1, send_after=self.now + timedelta(seconds=20))[0]
+        scheduler = NotificationScheduler(self.backend, window_seconds=60)
+
+        scheduler.refill(self.now)
+
+        assert len(scheduler) == 2
+        assert scheduler.seconds_until_next_due(self.now) == 10
+        assert scheduler.pop_due(10, self.now) == []
+        assert scheduler.pop_due(10, self.now + timedelta(seconds=15)) == [first.id]
+        assert scheduler.pop_due(10, self.now + timedelta(seconds=30)) == [second.id]
+        assert scheduler.seconds_until_next_due(self.now) is None
+
+    def test_pop_due_respects_limit(self):
+        notifications = [
+            self.create_notifications(1, send_after=self.now - timedelta(seconds=i))[0]
+            for i in range(3)
+        ]
+        scheduler = NotificationScheduler(self.backend, window_seconds=60)
+        scheduler.refill(self.now)
+
+        assert scheduler.pop_due(2, self.now) == [notifications[2].id, notifications[1].id]
+        assert scheduler.pop_due(2, self.now) == [notifications[0].id]
+
+    def test_refill_only_loads_the_window(self):
+        self.create_notifications(1, send_after=self.now + timedelta(seconds=30))
+        later = self.create_notifications(1, send_after=self.now + timedelta(minutes=5))[0]
+        scheduler = NotificationScheduler(self.backend, window_seconds=60, resync_seconds=3600)
+
+        scheduler.refill(self.now)
+        assert len(scheduler) == 1
+
+        scheduler.refill(self.now + timedelta(minutes=4, seconds=30))
+        assert len(scheduler) == 2
+        assert scheduler.pop_due(10, self.now + timedelta(minutes=5))[-1] == later.id
+
+    def test_refill_queries_are_constant(self):
+        for i in range(50):
+            self.create_notifications(1, send_after=self.now + timedelta(days=1, seconds=i))
+        scheduler = NotificationScheduler(self.backend, window_seconds=60, resync_seconds=3600)
+        scheduler.refill(self.now)
+
+        # One query for late inserts in the loaded slice, one for the slice entering the window
+        with self.assertNumQueries(2):
+            scheduler.refill(self.now + timedelta(seconds=30))
+        assert len(scheduler) == 0
+
+    def test_refill_picks_up_late_inserts_inside_loaded_window(self):
+        scheduler = NotificationScheduler(self.backend, window_seconds=60, resync_seconds=3600)
+        scheduler.refill(self.now)
+
+        notification = self.create_notifications(1, send_after=self.now + timedelta(seconds=10))[0]
+        scheduler.refill(self.now + timedelta(seconds=1))
+
+        assert scheduler.pop_due(10, self.now + timedelta(seconds=10)) == [notification.id]
+
+    def test_refill_doesnt_queue_notifications_twice(self):
+        self.create_notifications(1, send_after=self.now + timedelta(seconds=10))
+        scheduler = NotificationScheduler(self.backend, window_seconds=60, resync_seconds=3600)
+
+        scheduler.refill(self.now)
+        scheduler.refill(self.now + timedelta(seconds=1))
+
+        assert len(scheduler) == 1
+
+    def test_refill_keeps_notifications_sharing_send_after_together(self):
+        send_after = self.now + timedelta(seconds=20)
+        early = self.create_notifications(1, send_after=self.now + timedelta(seconds=10))[0]
+        tied = [self.create_notifications(1, send_after=send_after)[0] for _ in range(3)]
+        scheduler = NotificationScheduler(
+            self.backend, window_seconds=60, max_queued=2, resync_seconds=3600
+        )
+
+        scheduler.refill(self.now)
+        assert scheduler.pop_due(10, self.now + timedelta(seconds=10)) == [early.id]
+
+        scheduler.refill(self.now + timedelta(seconds=10))
+        assert set(scheduler.pop_due(10, send_after)) == {n.id for n in tied}
+
+    def test_refill_resyncs_notifications_released_but_not_sent(self):
+        notification = self.create_notifications(1, send_after=self.now)[0]
+        scheduler = NotificationScheduler(self.backend, window_seconds=60, resync_seconds=60)
+        scheduler.refill(self.now)
+        assert scheduler.pop_due(10, self.now) == [notification.id]
+
+        scheduler.refill(self.now + timedelta(seconds=30))
+        assert len(scheduler) == 0
+
+        scheduler.refill(self.now + timedelta(seconds=61))
+        assert scheduler.pop_due(10, self.now + timedelta(seconds=61)) == [notification.id]
+
+    def test_refill_ignores_sent_notifications(self):
+        notification = self.create_notifications(1, send_after=self.now)[0]
+        self.backend.mark_pending_as_sent(notification.id)
+        scheduler = NotificationScheduler(self.backend, window_seconds=60)
+
+        scheduler.refill(self.now)
+
+        assert len(scheduler) == 0
@@ -0,0 +1,145 @@
+import threading
+import unittest
+from datetime import timedelta
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from vintasend.constants import NotificationTypes
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+from vintasend_django.services.notification_wakeups import (
+    LocalNotificationWakeup,
+    PostgresNotificationWakeup,
+    get_notification_wakeup,
+)
+from vintasend_django.test_helpers import (
+    VintaSendDjangoTestCase,
+    VintaSendDjangoTransactionTestCase,
+)
+
+
+class LocalNotificationWakeupTestCase(unittest.TestCase):
+    def test_wait_times_out_without_notify(self):
+        wakeup = LocalNotificationWakeup()
+        wakeup.listen()
+
+        assert not wakeup.wait(0.01)
+
+    def test_notify_before_wait_is_not_lost(self):
+        wakeup = LocalNotificationWakeup()
+        wakeup.listen()
+
+        wakeup.notify()
+
+        assert wakeup.wait(0.01)
+        assert not wakeup.wait(0.01)
+
+    def test_notify_wakes_every_waiting_thread(self):
+        wakeup = LocalNotificationWakeup()
+        listening = threading.Barrier(3)
+        results = []
+
+        def wait():
+            wakeup.listen()
+            listening.wait()
+            results.append(wakeup.wait(5))
+
+        threads = [threading.Thread(target=wait) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        listening.wait()
+        wakeup.notify()
+        for thread in threads:
+            thread.join(timeout=5)
+
+        assert results == [True, True]
+
+
+class DjangoDbNotificationBackendWakeupTestCase(VintaSendDjangoTestCase):
+    def setUp(self):
+        super().setUp()
+        self.wakeup = get_notification_wakeup(connection.alias)
+        self.wakeup.listen()
+        # Drop wakeups left over from other tests running in this thread
+        self.wakeup.wait(0)
+
+    def test_persist_notification_wakes_up_workers_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=False) as callbacks:
+            self.create_notifications(1)
+
+        assert not self.wakeup.wait(0.01)
+        for callback in callbacks:
+            callback()
+        assert self.wakeup.wait(0.01)
+
+    def test_persist_scheduled_notification_does_not_wake_up_workers(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            self.create_notifications(1, send_after=timezone.now() + timedelta(days=1))
+
+        assert callbacks == []
+        assert not self.wakeup.wait(0.01)
+
+    def test_persist_notifications_bulk_wakes_up_workers_once_per_chunk(self):
+        specs = [
+            {
+                "user_id": self.user.pk,
+                "notification_type": NotificationTypes.EMAIL.value,
+                "title": f"test {i}",
+                "body_template": "vintasend_django/emails/test/test_templated_email_body.html",
+                "context_name": "test_context",
+                "context_kwargs": {},
+                "send_after": None,
+            }
+            for i in range(5)
+        ]
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            list(DjangoDbNotificationBackend().persist_notifications_bulk(specs, chunk_size=2))
+
+        assert len(callbacks) == 3
+        assert self.wakeup.wait(0.01)
+
+
+@unittest.skipUnless(connection.vendor == "postgresql", "LISTEN/NOTIFY requires PostgreSQL")
+class PostgresNotificationWakeupTestCase(VintaSendDjangoTransactionTestCase):
+    def test_notify_is_received_by_listener(self):
+        wakeup = PostgresNotificationWakeup(using=connection.alias)
+        wakeup.listen()
+
+        assert not wakeup.wait(0.01)
+        wakeup.notify()
+
+        assert wakeup.wait(1)
+        assert not wakeup.wait(0.01)
+
+    def test_notify_received_during_other_queries_is_not_lost(self):
+        wakeup = PostgresNotificationWakeup(using=connection.alias)
+        wakeup.listen()
+
+        # Notifying on the listening connection delivers the notification while psycopg reads
+        # the query's result, as happens when another worker notifies while this one claims
+        wakeup.notify()
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT 1")
+
+        assert wakeup.wait(0.01)
+        assert not wakeup.wait(0.01)
+
+    def test_listen_runs_once_per_connection(self):
+        wakeup = PostgresNotificationWakeup(using=connection.alias)
+        wakeup.listen()
+
+        with CaptureQueriesContext(connection) as queries:
+            wakeup.wait(0.01)
+            wakeup.wait(0.01)
+        assert queries.captured_queries == []
+
+        connection.close()
+        with CaptureQueriesContext(connection) as queries:
+            wakeup.wait(0.01)
+        assert [q["sql"] for q in queries.captured_queries] == [
+            f"LISTEN {connection.ops.quote_name(wakeup.channel)}"
+        ]
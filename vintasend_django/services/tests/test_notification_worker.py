@@ -0,0 +1,244 @@
+import multiprocessing
+import os
+import signal
+import tempfile
+import threading
+import time
+import unittest
+from datetime import timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.core import mail
+from django.core.management import CommandError, call_command
+from django.db import connections
+from django.test import override_settings
+from django.utils import timezone
+
+import pytest
+from vintasend.constants import NotificationStatus, NotificationTypes
+from vintasend.services.notification_service import NotificationService, register_context
+
+from vintasend_django.models import Notification as NotificationModel
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
+from vintasend_django.services.notification_worker import NotificationWorker
+from vintasend_django.test_helpers import VintaSendDjangoTransactionTestCase
+
+
+@register_context("worker_test_context")
+def worker_test_context():
+    return {
+        "test_subject": "worker_subject",
+        "test_preheader": "worker_preheader",
+        "test_body": "worker_body",
+    }
+
+
+NOTIFICATION_KWARGS = {
+    "body_template": "vintasend_django/emails/test/test_templated_email_body.html",
+    "subject_template": "vintasend_django/emails/test/test_templated_email_subject.txt",
+    "preheader_template": "vintasend_django/emails/test/test_templated_email_preheader.html",
+    "context_name": "worker_test_context",
+}
+
+
+class NotificationWorkerTestCase(VintaSendDjangoTransactionTestCase):
+    def tearDown(self) -> None:
+        mail.outbox = []
+        return super().tearDown()
+
+    def create_notifications(self, count: int, send_after=None):
+        return [
+            DjangoDbNotificationBackend().persist_notification(
+                user_id=self.user.pk,
+                notification_type=NotificationTypes.EMAIL.value,
+                title=f"test {i}",
+                body_template="vintasend_django/emails/test/test_templated_email_body.html",
+                context_name="worker_test_context",
+                context_kwargs={},
+                send_after=send_after,
+                subject_template="vintasend_django/emails/test/test_templated_email_subject.txt",
+                preheader_template="vintasend_django/emails/test/test_templated_email_preheader.html",
+            )
+            for i in range(count)
+        ]
+
+    def create_worker(self, **kwargs):
+        return NotificationWorker(
+            NotificationService(
+                notification_adapters=[
+                    (
+                        "vintasend_django.services.notification_adapters.django_email.DjangoEmailNotificationAdapter",
+                        "vintasend_django.services.notification_template_renderers.django_templated_email_renderer.DjangoTemplatedEmailRenderer",
+                    )
+                ],
+                notification_backend=DjangoDbNotificationBackend(),
+            ),
+            **kwargs,
+        )
+
+    def test_run_exit_when_empty(self):
+        self.create_notifications(5, **NOTIFICATION_KWARGS)
+        worker = self.create_worker(batch_size=2)
+
+        worker.run(exit_when_empty=True)
+
+        assert len(mail.outbox) == 5
+        assert set(NotificationModel.objects.values_list("status", flat=True)) == {
+            NotificationStatus.SENT.value
+        }
+
+    def test_run_until_stopped(self):
+        worker = self.create_worker(poll_interval=0.01)
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert not thread.is_alive()
+
+    def test_run_wakes_up_on_new_notification(self):
+        worker = self.create_worker(poll_interval=30)
+        waiting = threading.Event()
+        wait_for_work = worker.wait_for_work
+
+        def signal_waiting():
+            waiting.set()
+            return wait_for_work()
+
+        worker.wait_for_work = signal_waiting
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+        assert waiting.wait(timeout=5)
+
+        self.create_notifications(1, **NOTIFICATION_KWARGS)
+        deadline = time.monotonic() + 5
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert len(mail.outbox) == 1
+        assert not thread.is_alive()
+
+    def test_run_with_scheduler_sends_notifications_when_due(self):
+        self.create_notifications(
+            1, send_after=timezone.now() + timedelta(days=1), **NOTIFICATION_KWARGS
+        )
+        self.create_notifications(
+            1, send_after=timezone.now() + timedelta(milliseconds=300), **NOTIFICATION_KWARGS
+        )
+        worker = self.create_worker(poll_interval=30, schedule_window=60)
+        thread = threading.Thread(target=worker.run)
+        thread.start()
+
+        deadline = time.monotonic() + 5
+        while not mail.outbox and time.monotonic() < deadline:
+            time.sleep(0.01)
+        worker.stop()
+        thread.join(timeout=5)
+
+        assert len(mail.outbox) == 1
+        assert not thread.is_alive()
+        assert NotificationModel.objects.filter(status=NotificationStatus.SENT.value).count() == 1
+
+    def test_vintasend_worker_command(self):
+        self.create_notifications(3, **NOTIFICATION_KWARGS)
+
+        call_command("vintasend_worker", "--exit-when-empty", "--batch-size", "2", "--threads", "2")
+
+        assert len(mail.outbox) == 3
+        assert set(NotificationModel.objects.values_list("status", flat=True)) == {
+            NotificationStatus.SENT.value
+        }
+
+    def stop_command_when(self, condition, timeout=30):
+        """
+        Send SIGTERM to this process, where the command runs, once `condition` holds.
+        """
+
+        def wait_and_stop():
+            # Give the command time to fork its workers before this thread touches the database
+            time.sleep(0.5)
+            deadline = time.monotonic() + timeout
+            try:
+                while not condition() and time.monotonic() < deadline:
+                    time.sleep(0.1)
+            finally:
+                connections.close_all()
+            os.kill(os.getpid(), signal.SIGTERM)
+
+        thread = threading.Thread(target=wait_and_stop)
+        thread.start()
+        return thread
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "Worker processes must share settings"
+    )
+    def test_vintasend_worker_command_with_processes(self):
+        notifications = self.create_notifications(10, **NOTIFICATION_KWARGS)
+        stdout, stderr = StringIO(), StringIO()
+
+        with (
+            tempfile.TemporaryDirectory() as email_dir,
+            override_settings(
+                EMAIL_BACKEND="django.core.mail.backends.filebased.EmailBackend",
+                EMAIL_FILE_PATH=email_dir,
+            ),
+        ):
+            stopper = self.stop_command_when(
+                lambda: not NotificationModel.objects.filter(
+                    status=NotificationStatus.PENDING_SEND.value
+                ).exists()
+            )
+            call_command(
+                "vintasend_worker",
+                "--processes",
+                "2",
+                "--batch-size",
+                "2",
+                "--poll-interval",
+                "0.1",
+                stdout=stdout,
+                stderr=stderr,
+            )
+            stopper.join()
+            sent_emails = "".join(path.read_text() for path in Path(email_dir).iterdir())
+
+        assert "Notification workers stopped" in stdout.getvalue()
+        assert stderr.getvalue() == ""
+        assert sent_emails.count("Message-ID:") == len(notifications)
+        assert set(NotificationModel.objects.values_list("status", flat=True)) == {
+            NotificationStatus.SENT.value
+        }
+
+    @unittest.skipUnless(
+        "fork" in multiprocessing.get_all_start_methods(), "Worker processes must share settings"
+    )
+    def test_vintasend_worker_command_backs_off_restarting_crashing_workers(self):
+        stderr = StringIO()
+        started_at = time.monotonic()
+
+        with mock.patch(
+            "vintasend_django.management.commands.vintasend_worker.run_worker",
+            side_effect=SystemExit(1),
+        ):
+            stopper = self.stop_command_when(lambda: time.monotonic() - started_at > 4)
+            with pytest.raises(CommandError):
+                call_command(
+                    "vintasend_worker", "--processes", "2", stdout=StringIO(), stderr=stderr
+                )
+            stopper.join()
+
+        restart_delays = [
+            int(line.rsplit(" ", 1)[-1].rstrip("s"))
+            for line in stderr.getvalue().splitlines()
+            if "restarting in" in line
+        ]
+        assert restart_delays[:2] == [1, 1]
+        assert 2 in restart_delays
+        assert len(restart_delays) <= 6
@@ -1,13 +1,18 @@
 import uuid
 from typing import TYPE_CHECKING 
+from unittest import mock
+
+import pytest
 
 from vintasend.constants import NotificationStatus, NotificationTypes
+from vintasend.exceptions import NotificationTemplateRenderingError
 from vintasend.services.dataclasses import Notification
 from vintasend_django.services.notification_template_renderers.django_templated_email_renderer import (
     DjangoTemplatedEmailRenderer,
 )
 from vintasend_django.test_helpers import VintaSendDjangoTestCase
 from django.contrib.auth import get_user_model
+from django.test import override_settings
 
 
 if TYPE_CHECKING:
@@ -48,3 +53,152 @@ class DjangoTemplatedEmailRendererTestCase(VintaSendDjangoTestCase):
         assert "this_is_my_test_subject_string" in email.subject
         assert "this_is_my_test_preheader_string" in email.body
         assert "this_is_my_test_body_string" in email.body
+
+    def test_render_compiles_each_template_once(self):
+        renderer = DjangoTemplatedEmailRenderer()
+        notification = self.create_notification(self.create_user())
+
+        for _ in range(3):
+            renderer.render(notification, self.create_notification_context(notification))
+
+        cache_info = renderer.get_template.cache_info()
+        assert cache_info.misses == 3
+        assert cache_info.hits == 6
+
+    def test_template_cache_is_bounded(self):
+        renderer = DjangoTemplatedEmailRenderer(template_cache_size=2)
+        notification = self.create_notification(self.create_user())
+
+        renderer.render(notification, self.create_notification_context(notification))
+
+        cache_info = renderer.get_template.cache_info()
+        assert cache_info.maxsize == 2
+        assert cache_info.currsize == 2
+
+    @override_settings(NOTIFICATION_TEMPLATE_CACHE_SIZE=5)
+    def test_template_cache_size_setting(self):
+        assert DjangoTemplatedEmailRenderer().get_template.cache_info().maxsize == 5
+
+    def test_renderer_kwargs_are_kept_for_copies(self):
+        renderer = DjangoTemplatedEmailRenderer(
+            template_cache_size=2, render_once_per_group=True, group_render_cache_size=3
+        )
+
+        copy = DjangoTemplatedEmailRenderer(**renderer.template_renderer_kwargs)
+
+        assert copy.get_template.cache_info().maxsize == 2
+        assert copy.render_once_per_group is True
+        assert copy.group_render_cache_size == 3
+
+    def test_warm_templates(self):
+        renderer = DjangoTemplatedEmailRenderer()
+        notification = self.create_notification(self.create_user())
+
+        renderer.warm_templates(
+            [
+                notification.body_template,
+                notification.subject_template,
+                notification.preheader_template,
+                "vintasend_django/emails/test/missing.html",
+            ]
+        )
+        renderer.render(notification, self.create_notification_context(notification))
+
+        cache_info = renderer.get_template.cache_info()
+        assert cache_info.currsize == 3
+        assert cache_info.hits == 3
+
+    def test_template_cache_is_cleared_when_templates_setting_changes(self):
+        renderer = DjangoTemplatedEmailRenderer()
+        renderer.warm_templates(["vintasend_django/emails/test/test_templated_email_body.html"])
+
+        with override_settings(TEMPLATES=[]):
+            assert renderer.get_template.cache_info().currsize == 0
+            notification = self.create_notification(self.create_user())
+            with pytest.raises(NotificationTemplateRenderingError):
+                renderer.render(notification, self.create_notification_context(notification))
+
+    def create_render_once_notification(self, user: "DjangoUser") -> Notification:
+        notification = self.create_notification(user)
+        notification.body_template = (
+            "vintasend_django/emails/test/test_templated_email_render_once_body.html"
+        )
+        notification.subject_template = (
+            "vintasend_django/emails/test/test_templated_email_render_once_subject.txt"
+        )
+        notification.preheader_template = (
+            "vintasend_django/emails/test/test_templated_email_render_once_preheader.html"
+        )
+        return notification
+
+    def test_render_once_per_group(self):
+        renderer = DjangoTemplatedEmailRenderer(render_once_per_group=True)
+        notifications = [self.create_render_once_notification(self.create_user()) for _ in range(3)]
+
+        with mock.patch.object(renderer, "_render", wraps=renderer._render) as render:
+            emails = [
+                renderer.render(n, self.create_notification_context(n)) for n in notifications
+            ]
+
+        render.assert_called_once()
+        assert emails[0] is emails[1] is emails[2]
+        assert "this_is_my_test_preheader_string" in emails[0].body
+        assert "this_is_my_test_body_string" in emails[0].body
+
+    def test_render_once_per_group_with_different_contexts(self):
+        renderer = DjangoTemplatedEmailRenderer(render_once_per_group=True)
+        notification = self.create_render_once_notification(self.create_user())
+        other_context = self.create_notification_context(notification)
+        other_context["test_body"] = "another_body"
+
+        first_email = renderer.render(notification, self.create_notification_context(notification))
+        second_email = renderer.render(notification, other_context)
+
+        assert "this_is_my_test_body_string" in first_email.body
+        assert "another_body" in second_email.body
+
+    def test_render_once_per_group_requires_marker(self):
+        renderer = DjangoTemplatedEmailRenderer(render_once_per_group=True)
+        notifications = [self.create_notification(self.create_user()) for _ in range(2)]
+
+        with mock.patch.object(renderer, "_render", wraps=renderer._render) as render:
+            for n in notifications:
+                renderer.render(n, self.create_notification_context(n))
+
+        assert render.call_count == 2
+
+    def test_render_once_per_group_requires_marker_on_every_template(self):
+        renderer = DjangoTemplatedEmailRenderer(render_once_per_group=True)
+        notifications = [self.create_render_once_notification(self.create_user()) for _ in range(2)]
+        for notification in notifications:
+            notification.subject_template = (
+                "vintasend_django/emails/test/test_templated_email_subject.txt"
+            )
+
+        with mock.patch.object(renderer, "_render", wraps=renderer._render) as render:
+            for n in notifications:
+                renderer.render(n, self.create_notification_context(n))
+
+        assert render.call_count == 2
+
+    def test_render_once_per_group_is_opt_in(self):
+        renderer = DjangoTemplatedEmailRenderer()
+        notifications = [self.create_render_once_notification(self.create_user()) for _ in range(2)]
+
+        with mock.patch.object(renderer, "_render", wraps=renderer._render) as render:
+            for n in notifications:
+                renderer.render(n, self.create_notification_context(n))
+
+        assert render.call_count == 2
+
+    def test_render_once_per_group_cache_is_bounded(self):
+        renderer = DjangoTemplatedEmailRenderer(
+            render_once_per_group=True, group_render_cache_size=1
+        )
+        notification = self.create_render_once_notification(self.create_user())
+        for test_body in ["first", "second"]:
+            context = self.create_notification_context(notification)
+            context["test_body"] = test_body
+            renderer.render(notification, context)
+
+        assert len(renderer._group_renders) == 1
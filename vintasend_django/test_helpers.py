@@ -1,18 +1,28 @@
-from django.test import TestCase
+from collections.abc import Callable
 from typing import TYPE_CHECKING
 
+from django.contrib.auth import get_user_model
+from django.test import TestCase, TransactionTestCase
+
 from model_bakery import baker
+from vintasend.constants import NotificationStatus, NotificationTypes
+
+from vintasend_django.models import Notification as NotificationModel
+from vintasend_django.services.notification_backends.django_db_notification_backend import (
+    DjangoDbNotificationBackend,
+)
 
-from django.contrib.auth import get_user_model
 
 if TYPE_CHECKING:
     from django.contrib.auth.models import AbstractBaseUser as DjangoUser
 
+    from vintasend.services.dataclasses import Notification
+
 
 User = get_user_model()
 
 
-class VintaSendDjangoTestCase(TestCase):
+class VintaSendDjangoTestCaseMixin:
     def setUp(self):
         self._user_password = "123456"
         self.user: DjangoUser = baker.prepare(User, email="user@example.com")
@@ -21,3 +31,50 @@ class VintaSendDjangoTestCase(TestCase):
 
     def create_user(self, **kwargs):
         return baker.make(User, **kwargs)
+
+    def create_notifications(
+        self,
+        count: int,
+        user: "DjangoUser | Callable[[], DjangoUser] | None" = None,
+        status: str = NotificationStatus.PENDING_SEND.value,
+        **kwargs,
+    ) -> list["Notification"]:
+        """
+        Persist `count` email notifications titled "test 0", "test 1", ... for `user`, which
+        defaults to `self.user`; a callable `user` is called once per notification. `kwargs`
+        override the other fields passed to `persist_notification`, and notifications are moved
+        to `status` after they're persisted.
+        """
+        backend = DjangoDbNotificationBackend()
+        notifications = [
+            backend.persist_notification(
+                **{
+                    "user_id": (user() if callable(user) else user or self.user).pk,
+                    "notification_type": NotificationTypes.EMAIL.value,
+                    "title": f"test {i}",
+                    "body_template": "test",
+                    "context_name": "test",
+                    "context_kwargs": {},
+                    "send_after": None,
+                    "subject_template": "test",
+                    "preheader_template": "test",
+                    **kwargs,
+                }
+            )
+            for i in range(count)
+        ]
+        if status != NotificationStatus.PENDING_SEND.value:
+            NotificationModel.objects.filter(id__in=[n.id for n in notifications]).update(
+                status=status
+            )
+        return notifications
+
+
+class VintaSendDjangoTestCase(VintaSendDjangoTestCaseMixin, TestCase):
+    pass
+
+
+class VintaSendDjangoTransactionTestCase(VintaSendDjangoTestCaseMixin, TransactionTestCase):
+    """
+    For tests where other threads or processes must see the test data.
+    """